@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark cohort gap analysis: one call per (user, target) vs one batch
+
+Usage:
+    python benchmark_cohort_gaps.py [--nodes 10000] [--users 10000] [--known 50] [--targets 10] [--seed 7]
+
+Uses the synthetic graph from benchmark_learning_path.py, gives every user
+--known random concepts and analyzes the whole cohort against --targets
+targets. The per-pair baseline calls find_missing_prerequisites on a sample of
+users and is extrapolated to the full cohort.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from benchmark_learning_path import synthetic_graph_data
+from real_graph_analyzer import RealGraphLearningAnalyzer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cohort gap analysis")
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--known", type=int, default=50, help="Known concepts per user")
+    parser.add_argument("--targets", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        graph_file = Path(tmp) / "graph_data.json"
+        graph_file.write_text(json.dumps(synthetic_graph_data(args.nodes, args.seed)))
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer = RealGraphLearningAnalyzer(str(graph_file))
+
+    # Users know concepts from the first half of the graph; targets come from the second half
+    users = {f"user{u}": [f"n{i}" for i in rng.sample(range(args.nodes // 2), args.known)] for u in range(args.users)}
+    targets = [f"n{rng.randrange(args.nodes // 2, args.nodes)}" for _ in range(args.targets)]
+
+    print("👥 COHORT GAP ANALYSIS BENCHMARK")
+    print("=" * 60)
+    print(f"📊 {len(analyzer.csr)} nodes, {analyzer.csr.edge_count} edges, {args.users} users, "
+          f"{args.known} known concepts, {args.targets} targets")
+
+    sample = list(users.items())[:max(1, args.users // 100)]
+    start = time.perf_counter()
+    for _, known in sample:
+        for target in targets:
+            analyzer.find_missing_prerequisites(known, target)
+    per_pair_s = (time.perf_counter() - start) * args.users / len(sample)
+
+    start = time.perf_counter()
+    report = analyzer.analyze_cohort_gaps(users, targets)
+    batch_s = time.perf_counter() - start
+
+    print(f"   One call per pair (extrapolated): {per_pair_s:9.2f} s")
+    print(f"   Batch (incl. closure matrix):     {batch_s:9.2f} s")
+    start = time.perf_counter()
+    analyzer.analyze_cohort_gaps(users, targets)
+    print(f"   Batch (warm):                     {time.perf_counter() - start:9.2f} s")
+    print(f"   Average readiness:                {sum(t['average_readiness'] for t in report['targets']) / len(report['targets']):9.1f} %")
+
+
+if __name__ == "__main__":
+    main()
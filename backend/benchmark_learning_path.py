@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark find_optimal_learning_path: one Dijkstra per known concept vs one multi-source Dijkstra
+
+Usage:
+    python benchmark_learning_path.py [--nodes 10000] [--known 100] [--queries 20] [--seed 7]
+
+Builds a synthetic prerequisite graph in the graph_data.json format (every node
+depends on a few earlier ones, with the real edge types) and times path queries
+for students who already know --known random concepts. Also reports the memory
+each edge costs in the NetworkX DiGraph vs the analyzer's CSR arrays.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import networkx as nx
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from real_graph_analyzer import RealGraphLearningAnalyzer
+
+EDGE_TYPES = ['prerequisite', 'sequence', 'contains', 'leads_to', 'related']
+
+
+def synthetic_graph_data(node_count: int, seed: int) -> dict:
+    """A layered graph: node i gets 1-4 edges from earlier nodes."""
+    rng = random.Random(seed)
+    nodes = [{'id': f"n{i}", 'name': f"Concept {i}", 'type': 'topic' if i % 10 == 0 else 'subtopic'}
+             for i in range(node_count)]
+    edges = []
+    for i in range(1, node_count):
+        for source in rng.sample(range(max(0, i - 200), i), min(i, rng.randint(1, 4))):
+            edges.append({'source': f"n{source}", 'target': f"n{i}", 'type': rng.choice(EDGE_TYPES)})
+    return {'nodes': nodes, 'edges': edges}
+
+
+def legacy_best_path(graph, completed_topics, target_topic):
+    """The original implementation: shortest_path + shortest_path_length per completed topic."""
+    best_path, best_distance = None, float('inf')
+    for completed_topic in completed_topics:
+        try:
+            path = nx.shortest_path(graph, completed_topic, target_topic, weight='weight')
+            distance = nx.shortest_path_length(graph, completed_topic, target_topic, weight='weight')
+            if distance < best_distance:
+                best_distance, best_path = distance, path[1:]
+        except nx.NetworkXNoPath:
+            continue
+    return best_path, best_distance
+
+
+def networkx_edge_bytes(analyzer) -> int:
+    """Bytes allocated for the edges when build_real_graph() adds them to a DiGraph."""
+    graph = nx.DiGraph()
+    for node in analyzer.graph_data['nodes']:
+        graph.add_node(node['id'], **node)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for edge in analyzer.graph_data['edges']:
+        graph.add_edge(edge['source'], edge['target'], weight=analyzer.get_edge_weight(edge.get('type', 'default')), **edge)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark learning path search")
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--known", type=int, default=100, help="Known concepts per student")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        graph_file = Path(tmp) / "graph_data.json"
+        graph_file.write_text(json.dumps(synthetic_graph_data(args.nodes, args.seed)))
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer = RealGraphLearningAnalyzer(str(graph_file))
+
+    # Known concepts from the first half of the graph, targets from the second half
+    cases = []
+    for _ in range(args.queries):
+        completed = [f"n{i}" for i in rng.sample(range(args.nodes // 2), args.known)]
+        target = f"n{rng.randrange(args.nodes // 2, args.nodes)}"
+        cases.append((completed, target))
+
+    print("🧭 LEARNING PATH BENCHMARK")
+    print("=" * 60)
+    print(f"📊 {analyzer.graph.number_of_nodes()} nodes, {analyzer.graph.number_of_edges()} edges, "
+          f"{args.known} known concepts, {args.queries} queries")
+
+    start = time.perf_counter()
+    legacy_results = [legacy_best_path(analyzer.graph, completed, target) for completed, target in cases]
+    legacy_ms = (time.perf_counter() - start) / len(cases) * 1000
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = [analyzer.find_optimal_learning_path(completed, target) for completed, target in cases]
+    multi_source_ms = (time.perf_counter() - start) / len(cases) * 1000
+
+    mismatches = sum(
+        1 for (_, legacy_distance), result in zip(legacy_results, results)
+        if legacy_distance != float('inf') and abs(result.get('distance', float('inf')) - legacy_distance) > 1e-9
+    )
+
+    print(f"   Dijkstra per known concept: {legacy_ms:9.2f} ms/query")
+    print(f"   Multi-source Dijkstra:      {multi_source_ms:9.2f} ms/query")
+    print(f"   Speedup:                    {legacy_ms / multi_source_ms:9.2f}x")
+    print(f"   Distance mismatches:        {mismatches}")
+
+    csr = analyzer.csr
+    edge_arrays = (csr.out_indices, csr.out_types, csr.out_weights, csr.in_indices, csr.in_types, csr.in_weights)
+    edge_count = max(csr.edge_count, 1)
+    print(f"   NetworkX bytes/edge:        {networkx_edge_bytes(analyzer) / edge_count:9.1f}")
+    print(f"   CSR bytes/edge:             {sum(a.nbytes for a in edge_arrays) / edge_count:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Load-test an LLM provider
+
+Usage:
+    python benchmark_llm.py [--backend groq|ollama|stub-server] [--requests 200] [--concurrency 16] [--latency 0.2]
+
+With the default --backend stub-server, a local stub of the Groq API is started
+in-process (with --latency seconds per reply) and the Groq provider is pointed
+at it, so the pooled HTTP path is exercised with no network or API key.
+Reports throughput and latency percentiles for generate_batch.
+"""
+
+import argparse
+import time
+
+from clients.llm_backends import GroqBackend, LLMBackend, get_backend
+from clients.llm_stub_server import start_stub_server
+
+
+class _TimedBackend(LLMBackend):
+    """Records per-call latency of the wrapped provider."""
+
+    def __init__(self, backend: LLMBackend):
+        self.backend = backend
+        self.name = backend.name
+        self.latencies = []
+
+    def generate(self, prompt, system_prompt=None, timeout=None):
+        start = time.perf_counter()
+        try:
+            return self.backend.generate(prompt, system_prompt, timeout)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test an LLM provider")
+    parser.add_argument("--backend", choices=["stub-server", "groq", "ollama"], default="stub-server")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub server reply delay in seconds")
+    args = parser.parse_args()
+
+    server = None
+    if args.backend == "stub-server":
+        server, base_url = start_stub_server(latency=args.latency)
+        backend = GroqBackend(api_key="stub", base_url=f"{base_url}/openai/v1")
+    else:
+        backend = get_backend(args.backend)
+
+    timed = _TimedBackend(backend)
+    prompts = [f"Explain topic {i % 50} in detail" for i in range(args.requests)]
+
+    print("⚡ LLM PROVIDER BENCHMARK")
+    print("=" * 60)
+    print(f"📊 {args.requests} requests to {args.backend}, concurrency {args.concurrency}")
+
+    start = time.perf_counter()
+    results = timed.generate_batch(prompts, max_workers=args.concurrency)
+    elapsed = time.perf_counter() - start
+
+    errors = sum(1 for result in results if isinstance(result, Exception))
+    print(f"⏱️  {elapsed:.2f}s total, {args.requests / elapsed:.1f} req/s, {errors} errors")
+    print(f"   p50 {percentile(timed.latencies, 0.5) * 1000:.1f}ms, "
+          f"p95 {percentile(timed.latencies, 0.95) * 1000:.1f}ms, "
+          f"p99 {percentile(timed.latencies, 0.99) * 1000:.1f}ms")
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark partial name lookups: scanning every name vs the trigram name index
+
+Usage:
+    python benchmark_name_lookup.py [--names 100000] [--queries 500] [--seed 7]
+
+Builds --names synthetic multi-word topic names and looks up prefixes, inner
+fragments and longer phrases containing a name, comparing the original scan
+of all_name_to_id with NameIndex.lookup, plus the time and memory it costs
+to build the index.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from name_index import NameIndex
+
+SYLLABLES = ['ar', 'ray', 'bi', 'na', 'ry', 'sea', 'rch', 'tre', 'e', 'gra', 'ph', 'so', 'rt', 'he', 'ap',
+             'ha', 'sh', 'li', 'nk', 'ed', 'sta', 'ck', 'que', 'ue', 'dy', 'nam', 'ic', 'pro', 'gram', 'ming']
+
+
+def legacy_find(name_to_id, name_lower):
+    """The original fallback: two substring checks per name, shortest match wins."""
+    matches = [(stored, node_id) for stored, node_id in name_to_id.items()
+               if name_lower in stored or stored in name_lower]
+    return min(matches, key=lambda x: len(x[0]))[1] if matches else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark partial name lookups")
+    parser.add_argument("--names", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words = list({"".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(5000)})
+    name_to_id = {}
+    while len(name_to_id) < args.names:
+        name = " ".join(rng.choice(words) for _ in range(rng.randint(1, 4)))
+        name_to_id.setdefault(name, f"n{len(name_to_id)}")
+
+    start = time.perf_counter()
+    index = NameIndex.build(name_to_id)
+    build_ms = (time.perf_counter() - start) * 1000
+    index_bytes = sum(array.nbytes for array in index.arrays().values())
+
+    names = list(name_to_id)
+    queries = []
+    for _ in range(args.queries):
+        name = rng.choice(names)
+        cut = rng.randint(3, max(3, len(name)))
+        queries.append(rng.choice([name[:cut], name[len(name) - cut:], f"intro to {name} basics"]))
+
+    print("🔤 NAME LOOKUP BENCHMARK")
+    print("=" * 60)
+    print(f"📊 {len(names)} names, {args.queries} partial queries")
+
+    sample = queries[:max(1, args.queries // 10)]
+    start = time.perf_counter()
+    for query in sample:
+        legacy_find(name_to_id, query)
+    legacy_us = (time.perf_counter() - start) / len(sample) * 1e6
+
+    start = time.perf_counter()
+    for query in queries:
+        index.lookup(query, limit=5)
+    index_us = (time.perf_counter() - start) / len(queries) * 1e6
+
+    start = time.perf_counter()
+    for query in queries:
+        index.lookup(query, limit=5, fuzzy=True)
+    fuzzy_us = (time.perf_counter() - start) / len(queries) * 1e6
+
+    print(f"   Scan per lookup:        {legacy_us:12.1f} µs/query")
+    print(f"   Index, top 5:           {index_us:12.1f} µs/query")
+    print(f"   Index, top 5 + fuzzy:   {fuzzy_us:12.1f} µs/query")
+    print(f"   Speedup:                {legacy_us / index_us:12.1f}x")
+    print(f"   Index build:            {build_ms:12.1f} ms")
+    print(f"   Index size:             {index_bytes / 1024 / 1024:12.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
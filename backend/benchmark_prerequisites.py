@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark find_missing_prerequisites: per-call BFS vs precomputed closure bitsets
+
+Usage:
+    python benchmark_prerequisites.py [--nodes 100000] [--known 100] [--queries 200] [--seed 7]
+
+Uses the synthetic graph from benchmark_learning_path.py and compares the
+original breadth-first walk over predecessors with one bitwise expression over
+the PrerequisiteClosure index, plus the time and memory it costs to build.
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from benchmark_learning_path import synthetic_graph_data
+from csr_graph import CSRGraph
+from prerequisite_closure import PrerequisiteClosure
+
+
+def legacy_missing_prerequisites(csr, completed_topics, target_topic):
+    """The original implementation: BFS over predecessors with list membership checks."""
+    missing = []
+    visited = set(completed_topics)
+    queue = deque([target_topic])
+    while queue:
+        current = queue.popleft()
+        if current in visited:
+            continue
+        visited.add(current)
+        for predecessor in csr.predecessors(current, edge_types=('prerequisite', 'sequence')):
+            if predecessor not in completed_topics:
+                if predecessor not in missing:
+                    missing.append(predecessor)
+                queue.append(predecessor)
+    return missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark missing-prerequisite queries")
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--known", type=int, default=100, help="Known concepts per student")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    csr = CSRGraph.from_graph_data(synthetic_graph_data(args.nodes, args.seed), lambda edge_type: 1.0)
+
+    start = time.perf_counter()
+    closure = PrerequisiteClosure.build(csr)
+    build_ms = (time.perf_counter() - start) * 1000
+    closure_bytes = sum(array.nbytes for array in closure.arrays().values())
+
+    cases = []
+    for _ in range(args.queries):
+        completed = [f"n{i}" for i in rng.sample(range(args.nodes // 2), args.known)]
+        cases.append((completed, f"n{rng.randrange(args.nodes // 2, args.nodes)}"))
+
+    print("🧱 PREREQUISITE CLOSURE BENCHMARK")
+    print("=" * 60)
+    print(f"📊 {len(csr)} nodes, {csr.edge_count} edges, {args.known} known concepts, {args.queries} queries")
+
+    start = time.perf_counter()
+    legacy = [legacy_missing_prerequisites(csr, completed, target) for completed, target in cases]
+    legacy_us = (time.perf_counter() - start) / len(cases) * 1e6
+
+    start = time.perf_counter()
+    results = [closure.missing(completed, target) for completed, target in cases]
+    closure_us = (time.perf_counter() - start) / len(cases) * 1e6
+
+    # The closure also treats prerequisites of known concepts as known, so it may only return fewer nodes
+    extra = sum(1 for old, new in zip(legacy, results) if not set(new) <= set(old))
+
+    print(f"   BFS per call:         {legacy_us:12.1f} µs/query")
+    print(f"   Closure bitsets:      {closure_us:12.1f} µs/query")
+    print(f"   Speedup:              {legacy_us / closure_us:12.1f}x")
+    print(f"   Results outside BFS:  {extra:12d}")
+    print(f"   Index build:          {build_ms:12.1f} ms")
+    print(f"   Index size:           {closure_bytes / 1024 / 1024:12.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
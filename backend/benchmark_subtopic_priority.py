@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark subtopic gap ranking: per-pair edge lookups vs one sparse product
+
+Usage:
+    python benchmark_subtopic_priority.py [--nodes 20000] [--subtopics 200] [--completed 500] [--queries 3] [--seed 7]
+
+Uses the synthetic graph from benchmark_learning_path.py and scores --subtopics
+missing subtopics against --completed completed ones, and finds the
+prerequisite subtopics of a topic given --subtopics of its own, comparing the
+original nested loops with the typed adjacency matrices of the analyzer.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from benchmark_learning_path import synthetic_graph_data
+from real_graph_analyzer import RealGraphLearningAnalyzer
+from test_subtopic_priority import legacy_priority
+
+
+def legacy_prerequisite_subtopics(csr, subtopic_ids, target_subtopics, completed_subtopics):
+    """The original implementation: every subtopic against every target subtopic."""
+    return [s for s in subtopic_ids
+            if s not in completed_subtopics and s not in target_subtopics
+            and any(csr.edge_type(s, t) in ('prerequisite', 'sequence') for t in target_subtopics)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark subtopic priorities")
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--subtopics", type=int, default=200, help="Subtopics in the target topic")
+    parser.add_argument("--completed", type=int, default=500, help="Completed subtopics per student")
+    parser.add_argument("--queries", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    graph_data = synthetic_graph_data(args.nodes, args.seed)
+    # One large target topic that contains a run of consecutive subtopics
+    target_subtopics = [f"n{i}" for i in range(args.nodes // 2, args.nodes) if i % 10][:args.subtopics]
+    graph_data['edges'] += [{'source': "n0", 'target': s, 'type': 'contains'} for s in target_subtopics]
+    with tempfile.TemporaryDirectory() as tmp:
+        graph_file = Path(tmp) / "graph_data.json"
+        graph_file.write_text(json.dumps(graph_data))
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer = RealGraphLearningAnalyzer(str(graph_file))
+    target_subtopics = analyzer.get_all_subtopics_for_topic("n0")
+    subtopic_ids = [s['id'] for s in analyzer.subtopics]
+    cases = [rng.sample(subtopic_ids, args.completed) for _ in range(args.queries)]
+
+    print("🎯 SUBTOPIC PRIORITY BENCHMARK")
+    print("=" * 60)
+    print(f"📊 {len(analyzer.csr)} nodes, {analyzer.csr.edge_count} edges, {len(target_subtopics)} target subtopics, "
+          f"{args.completed} completed, {args.queries} queries")
+
+    start = time.perf_counter()
+    analyzer.subtopic_matrices()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for completed in cases:
+        [legacy_priority(analyzer.csr, s, completed) for s in target_subtopics if s not in completed]
+    legacy_priority_ms = (time.perf_counter() - start) / len(cases) * 1000
+
+    start = time.perf_counter()
+    for completed in cases:
+        analyzer.calculate_subtopic_priorities([s for s in target_subtopics if s not in completed], completed)
+    matrix_priority_ms = (time.perf_counter() - start) / len(cases) * 1000
+
+    start = time.perf_counter()
+    for completed in cases:
+        legacy_prerequisite_subtopics(analyzer.csr, subtopic_ids, target_subtopics, completed)
+    legacy_prerequisites_ms = (time.perf_counter() - start) / len(cases) * 1000
+
+    start = time.perf_counter()
+    for completed in cases:
+        analyzer.find_prerequisite_subtopics("n0", completed)
+    matrix_prerequisites_ms = (time.perf_counter() - start) / len(cases) * 1000
+
+    print(f"   Priorities, loops:          {legacy_priority_ms:10.2f} ms/query")
+    print(f"   Priorities, sparse product: {matrix_priority_ms:10.2f} ms/query")
+    print(f"   Prerequisites, loops:       {legacy_prerequisites_ms:10.2f} ms/query")
+    print(f"   Prerequisites, sparse:      {matrix_prerequisites_ms:10.2f} ms/query")
+    print(f"   Matrix build (once):        {build_ms:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Precompute the all-pairs distance / next-hop tables for graph_data.json
+
+Usage:
+    python build_distance_table.py [--graph path/to/graph_data.json]
+
+Writes <graph>_distances.npz next to the graph file, keyed by the graph's
+content hash. Run it at deploy time (and after editing the graph): servers only
+load the artifact and fall back to on-demand path searches while it is missing
+or stale, or when the graph has more than GRAPH_DISTANCE_TABLE_MAX_NODES nodes.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from distance_table import artifact_path_for, build_distance_table, distance_table_max_nodes
+from real_graph_analyzer import RealGraphLearningAnalyzer
+
+GRAPH_DATA_PATH = Path(__file__).parent / "queryHandling" / "static" / "graph" / "graph_data.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute all-pairs learning graph distances")
+    parser.add_argument("--graph", default=str(GRAPH_DATA_PATH))
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = RealGraphLearningAnalyzer(args.graph)
+
+    print("📐 DISTANCE TABLE BUILD")
+    print("=" * 60)
+    if len(analyzer.csr) > distance_table_max_nodes():
+        print(f"⚠️ {len(analyzer.csr)} nodes exceeds GRAPH_DISTANCE_TABLE_MAX_NODES={distance_table_max_nodes()}; "
+              "servers will not load this table")
+    start = time.perf_counter()
+    table = build_distance_table(analyzer.graph, analyzer.graph_version)
+    elapsed = time.perf_counter() - start
+
+    path = artifact_path_for(args.graph)
+    table.save(path)
+    print(f"✅ {len(table)} nodes in {elapsed:.2f}s (graph version {analyzer.graph_version}) → {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Pre-generate tutor explanations for every graph node
+
+Usage:
+    python build_explanations.py [--backend groq|ollama|stub] [--model NAME] [--concurrency 1] [--min-interval 1.0] [--limit N] [--force]
+
+Only nodes that are missing from the store or whose name/description changed
+since they were generated are sent to the LLM, so the job can be re-run after
+graph_data.json is updated. Nodes are sent --concurrency at a time and the
+store is saved after every batch, so an interrupted run keeps the explanations
+generated so far.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from clients.llm_backends import get_backend
+from explanation_store import DEFAULT_STORE_PATH, ExplanationStore
+
+GRAPH_DATA_PATH = Path(__file__).parent / "queryHandling" / "static" / "graph" / "graph_data.json"
+
+
+def load_graph(graph_path: Path):
+    """Topic/subtopic nodes from graph_data.json, plus a node ID -> name map."""
+    with open(graph_path, 'r', encoding='utf-8') as f:
+        graph_data = json.load(f)
+    all_nodes = graph_data.get('nodes', [])
+    names = {node['id']: node['name'] for node in all_nodes}
+    return [node for node in all_nodes if node.get('type') in ('topic', 'subtopic')], names
+
+
+def build_prompt(node, names) -> str:
+    """The same kind of request the chat handler sends for a learning-path step."""
+    prompt = f"Explain {node['name']} in detail"
+    details = []
+    parent = names.get(node.get('parent_topic'))
+    if parent:
+        details.append(f"- It is a subtopic of {parent}")
+    if node.get('description'):
+        details.append(f"- Description: {node['description']}")
+    if details:
+        prompt += "\n\nContext:\n" + "\n".join(details)
+    prompt += "\n\nCover the key idea, a short code example, time/space complexity and common pitfalls."
+    return prompt
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate tutor explanations for every graph node")
+    parser.add_argument("--graph", default=str(GRAPH_DATA_PATH))
+    parser.add_argument("--store", default=str(DEFAULT_STORE_PATH))
+    parser.add_argument("--backend", choices=["groq", "ollama", "stub"], default="groq")
+    parser.add_argument("--model", default=None, help="Override the backend's default model")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Nodes generated in parallel per batch")
+    parser.add_argument("--min-interval", type=float, default=1.0,
+                        help="Seconds to wait between batches")
+    parser.add_argument("--limit", type=int, default=None, help="Generate at most this many nodes")
+    parser.add_argument("--force", action="store_true", help="Regenerate every node")
+    args = parser.parse_args()
+
+    nodes, names = load_graph(Path(args.graph))
+    store = ExplanationStore(args.store)
+    pending = nodes if args.force else [node for node in nodes if store.needs_update(node)]
+    if args.limit is not None:
+        pending = pending[:args.limit]
+
+    backend = get_backend(args.backend, **({'model': args.model} if args.model else {}))
+
+    print("📝 NODE EXPLANATION BUILD")
+    print("=" * 60)
+    print(f"📊 {len(nodes)} graph nodes, {len(store)} stored, {len(pending)} to generate with {backend.name}")
+
+    generated = failed = 0
+    for start in range(0, len(pending), args.concurrency):
+        batch = pending[start:start + args.concurrency]
+        batch_start = time.monotonic()
+        results = backend.generate_batch([build_prompt(node, names) for node in batch], max_workers=args.concurrency)
+
+        for node, result in zip(batch, results):
+            if isinstance(result, Exception):
+                failed += 1
+                print(f"   ❌ {node['name']} ({node['id']}): {result}")
+                continue
+            store.put(node, result, backend.name, backend.model)
+            generated += 1
+            print(f"   ✅ {node['name']} ({node['id']}): {len(result)} chars")
+        store.save()
+
+        elapsed = time.monotonic() - batch_start
+        if start + args.concurrency < len(pending) and elapsed < args.min_interval:
+            time.sleep(args.min_interval - elapsed)
+
+    print(f"\n✅ Explanations updated: {generated} generated, {failed} failed, {len(store)} total")
+
+
+if __name__ == "__main__":
+    main()
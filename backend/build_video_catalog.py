@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Build or refresh the precomputed video catalog for every graph node
+
+Usage:
+    python build_video_catalog.py [--max-age-days 7] [--batch-size 5] [--min-interval 2.0] [--limit N] [--force]
+
+Only nodes that are missing or older than --max-age-days are fetched, so the
+job can be re-run (e.g. nightly) as an incremental refresh. Nodes are fetched
+in batches with YouTubeResourceFinder (one search per node plus one videos.list
+call per batch, same ranking as live search), pausing --min-interval seconds
+between batches to stay under API rate limits, and stopping when the day's
+YouTube quota budget is nearly spent.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "dynamic"))
+
+from dataclasses import asdict
+
+from groq_dsa_yt import YouTubeResourceFinder
+from video_catalog import DEFAULT_CATALOG_PATH, VideoCatalog
+
+GRAPH_DATA_PATH = Path(__file__).parent / "queryHandling" / "static" / "graph" / "graph_data.json"
+
+
+def load_graph_nodes(graph_path: Path):
+    """Topic and subtopic nodes from graph_data.json."""
+    with open(graph_path, 'r', encoding='utf-8') as f:
+        graph_data = json.load(f)
+    return [node for node in graph_data.get('nodes', []) if node.get('type') in ('topic', 'subtopic')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute YouTube videos for every graph node")
+    parser.add_argument("--graph", default=str(GRAPH_DATA_PATH))
+    parser.add_argument("--catalog", default=str(DEFAULT_CATALOG_PATH))
+    parser.add_argument("--max-age-days", type=float, default=7.0,
+                        help="Refresh nodes fetched longer ago than this")
+    parser.add_argument("--batch-size", type=int, default=5,
+                        help="Nodes per batch (one videos.list call of up to 50 IDs)")
+    parser.add_argument("--min-interval", type=float, default=2.0,
+                        help="Seconds to wait between batches")
+    parser.add_argument("--limit", type=int, default=None, help="Fetch at most this many nodes")
+    parser.add_argument("--force", action="store_true", help="Refetch every node")
+    args = parser.parse_args()
+
+    nodes = load_graph_nodes(Path(args.graph))
+    catalog = VideoCatalog(args.catalog)
+    pending = nodes if args.force else catalog.stale_nodes(nodes, args.max_age_days * 86400)
+    if args.limit is not None:
+        pending = pending[:args.limit]
+
+    print("🎬 VIDEO CATALOG BUILD")
+    print("=" * 60)
+    print(f"📊 {len(nodes)} graph nodes, {len(catalog)} in catalog, {len(pending)} to fetch")
+
+    # Offline runs may use the whole remaining budget rather than the paced share
+    finder = YouTubeResourceFinder(quota_pacing=False)
+    fetched = empty = 0
+    for start in range(0, len(pending), args.batch_size):
+        batch = pending[start:start + args.batch_size]
+        batch_start = time.monotonic()
+
+        if finder.quota.remaining < 100 * len(batch) + 1:
+            print(f"🪫 YouTube quota nearly exhausted ({finder.quota.remaining} units left), stopping; re-run tomorrow")
+            break
+
+        # Nodes that share a name are searched once
+        names = list(dict.fromkeys(node['name'] for node in batch))
+        videos_by_name = finder.fetch_videos_batch(names)
+
+        for node in batch:
+            videos = [asdict(video) for video in videos_by_name.get(node['name'], [])]
+            if not videos:
+                # Leave the node stale so the next run retries it
+                empty += 1
+                print(f"   ⚠️ No videos for {node['name']} ({node['id']})")
+                continue
+            catalog.upsert(node['id'], node['name'], videos)
+            fetched += 1
+            print(f"   ✅ {node['name']} ({node['id']}): {len(videos)} videos")
+
+        elapsed = time.monotonic() - batch_start
+        if start + args.batch_size < len(pending) and elapsed < args.min_interval:
+            time.sleep(args.min_interval - elapsed)
+
+    print(f"\n✅ Catalog updated: {fetched} nodes fetched, {empty} without results, {len(catalog)} total")
+
+
+if __name__ == "__main__":
+    main()
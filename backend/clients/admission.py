@@ -0,0 +1,226 @@
+"""
+Admission control for outbound provider calls
+
+Each provider gets an AdmissionController with a fixed number of concurrent
+slots and a bounded wait queue. Callers that cannot get a slot within the
+queue timeout, or that arrive while the queue is full, are rejected with
+AdmissionRejected so the caller can shed load (fallback response, no videos,
+or HTTP 503 with Retry-After) instead of piling more requests onto a provider
+that is already rate limiting.
+
+AsyncAdmissionController applies the same limits on the event loop, so
+requests waiting for a slot hold no worker thread (used for /api/chat before
+the blocking handler is dispatched to the threadpool).
+
+Limits are read from the environment per provider, e.g. GROQ_MAX_CONCURRENCY,
+GROQ_MAX_QUEUE and GROQ_QUEUE_TIMEOUT_SECONDS.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from monitoring.metrics import Counter, Gauge, Histogram
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight",
+    "Calls currently holding an admission slot",
+    ["name"]
+)
+ADMISSION_WAITING = Gauge(
+    "admission_waiting",
+    "Calls waiting in the admission queue",
+    ["name"]
+)
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejections_total",
+    "Calls shed by admission control (queue_full, timeout)",
+    ["name", "reason"]
+)
+ADMISSION_WAIT_DURATION = Histogram(
+    "admission_wait_duration_seconds",
+    "Time spent waiting for an admission slot",
+    ["name"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+# (max_concurrency, max_queue, queue_timeout_seconds) per provider
+DEFAULT_LIMITS = {
+    'chat': (32, 64, 5.0),
+    'groq': (8, 32, 2.0),
+    'youtube': (4, 16, 2.0),
+}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a call is shed; retry_after is a hint in whole seconds."""
+
+    def __init__(self, name: str, reason: str, retry_after: int):
+        super().__init__(f"{name} admission rejected ({reason})")
+        self.name = name
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Concurrency limiter with a bounded, time-limited wait queue."""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = max(1, math.ceil(queue_timeout))
+
+        self._in_flight = 0
+        self._waiting = 0
+        self._condition = threading.Condition()
+
+        ADMISSION_IN_FLIGHT.set_function(lambda: self._in_flight, name=name)
+        ADMISSION_WAITING.set_function(lambda: self._waiting, name=name)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    def acquire(self):
+        """Take a slot, waiting up to queue_timeout. Raises AdmissionRejected."""
+        start = time.perf_counter()
+        with self._condition:
+            if self._in_flight < self.max_concurrency and self._waiting == 0:
+                self._in_flight += 1
+                ADMISSION_WAIT_DURATION.observe(0.0, name=self.name)
+                return
+
+            if self._waiting >= self.max_queue:
+                ADMISSION_REJECTIONS.inc(name=self.name, reason='queue_full')
+                raise AdmissionRejected(self.name, 'queue_full', self.retry_after)
+
+            self._waiting += 1
+            try:
+                admitted = self._condition.wait_for(lambda: self._in_flight < self.max_concurrency,
+                                                    timeout=self.queue_timeout)
+            finally:
+                self._waiting -= 1
+
+            if not admitted:
+                ADMISSION_REJECTIONS.inc(name=self.name, reason='timeout')
+                raise AdmissionRejected(self.name, 'timeout', self.retry_after)
+            self._in_flight += 1
+        ADMISSION_WAIT_DURATION.observe(time.perf_counter() - start, name=self.name)
+
+    def release(self):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def slot(self):
+        """Hold a slot for the duration of the block."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class AsyncAdmissionController:
+    """Event-loop admission control: an asyncio.Semaphore with a bounded waiter count."""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = max(1, math.ceil(queue_timeout))
+
+        self._in_flight = 0
+        self._waiting = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        ADMISSION_IN_FLIGHT.set_function(lambda: self._in_flight, name=name)
+        ADMISSION_WAITING.set_function(lambda: self._waiting, name=name)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    async def acquire(self):
+        """Take a slot, waiting up to queue_timeout. Raises AdmissionRejected."""
+        start = time.perf_counter()
+        if not self._semaphore.locked() and self._waiting == 0:
+            await self._semaphore.acquire()
+        else:
+            if self._waiting >= self.max_queue:
+                ADMISSION_REJECTIONS.inc(name=self.name, reason='queue_full')
+                raise AdmissionRejected(self.name, 'queue_full', self.retry_after)
+
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                ADMISSION_REJECTIONS.inc(name=self.name, reason='timeout')
+                raise AdmissionRejected(self.name, 'timeout', self.retry_after) from None
+            finally:
+                self._waiting -= 1
+        self._in_flight += 1
+        ADMISSION_WAIT_DURATION.observe(time.perf_counter() - start, name=self.name)
+
+    def release(self):
+        self._in_flight -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a slot for the duration of the block."""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+# Keyed by (controller class, name): a thread-pool caller and an event-loop
+# caller of the same provider each get the kind of controller they expect
+_controllers = {}
+_controllers_lock = threading.Lock()
+
+
+def _create_controller(cls, name: str):
+    max_concurrency, max_queue, queue_timeout = DEFAULT_LIMITS.get(name, (8, 32, 2.0))
+    prefix = name.upper()
+    return cls(
+        name,
+        max_concurrency=int(os.getenv(f"{prefix}_MAX_CONCURRENCY", max_concurrency)),
+        max_queue=int(os.getenv(f"{prefix}_MAX_QUEUE", max_queue)),
+        queue_timeout=float(os.getenv(f"{prefix}_QUEUE_TIMEOUT_SECONDS", queue_timeout))
+    )
+
+
+def _get_controller(cls, name: str):
+    with _controllers_lock:
+        controller = _controllers.get((cls, name))
+        if controller is None:
+            controller = _controllers[(cls, name)] = _create_controller(cls, name)
+        return controller
+
+
+def get_admission_controller(name: str) -> AdmissionController:
+    """Return the process-wide controller for a provider, creating it from env limits."""
+    return _get_controller(AdmissionController, name)
+
+
+def get_async_admission_controller(name: str) -> AsyncAdmissionController:
+    """Return the process-wide event-loop controller for name, creating it from env limits."""
+    return _get_controller(AsyncAdmissionController, name)
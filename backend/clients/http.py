@@ -0,0 +1,117 @@
+"""
+Process-wide pooled HTTP sessions for outbound providers
+
+One requests.Session per service keeps TCP/TLS connections alive between
+calls instead of paying a new handshake on every request. Each session mounts
+an adapter with a sized connection pool, a default timeout and a small
+retry/backoff policy for connection errors. 429/5xx responses are only retried
+where SERVICE_DEFAULTS allows it: a retried Groq POST would stretch the bounded
+LLM timeout and stack with hedging, and a retried YouTube search spends quota
+the daily budget never sees.
+
+Per-service settings can be overridden with <SERVICE>_POOL_SIZE,
+<SERVICE>_HTTP_TIMEOUT_SECONDS and <SERVICE>_HTTP_RETRIES.
+"""
+
+import os
+import threading
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# pool_size, timeout (seconds), retries, retry 429/5xx responses
+SERVICE_DEFAULTS = {
+    'groq': (16, 30.0, 2, False),
+    'youtube': (8, 10.0, 2, False),
+    'ollama': (4, 120.0, 1, True),
+}
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout when the caller gives none."""
+
+    def __init__(self, timeout: float, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.timeout
+        return super().send(request, timeout=timeout, **kwargs)
+
+
+def is_transient_error(exc: Exception) -> bool:
+    """True for errors that say the provider is unhealthy: timeouts, connection errors, 429 and 5xx.
+
+    Other 4xx responses are about the request itself and should not trip a circuit breaker.
+    """
+    if isinstance(exc, (TimeoutError, requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    if isinstance(exc, requests.exceptions.HTTPError):
+        status = exc.response.status_code if exc.response is not None else None
+        return status is None or status == 429 or status >= 500
+    return False
+
+
+def create_session(pool_size: int, timeout: float, retries: int, retry_status: bool = True) -> requests.Session:
+    """Build a keep-alive session with a sized pool and retry/backoff.
+
+    Connection errors (the request never reached the server) are always retried;
+    429/5xx responses only when retry_status is set.
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=0,
+        status=retries if retry_status else 0,
+        backoff_factor=0.25,
+        status_forcelist=RETRY_STATUS_CODES if retry_status else (),
+        allowed_methods=frozenset({'GET', 'POST'}),
+        # Provider Retry-After values can be many seconds; the circuit breaker
+        # and admission control handle sustained throttling instead
+        respect_retry_after_header=False,
+        raise_on_status=False
+    )
+    adapter = _PooledAdapter(timeout, pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(service: str) -> requests.Session:
+    """Return the shared session for a service, creating it on first use."""
+    session = _sessions.get(service)
+    if session is not None:
+        return session
+
+    with _sessions_lock:
+        session = _sessions.get(service)
+        if session is None:
+            pool_size, timeout, retries, retry_status = SERVICE_DEFAULTS.get(service, (8, 30.0, 1, False))
+            prefix = service.upper()
+            session = create_session(
+                pool_size=int(os.getenv(f"{prefix}_POOL_SIZE", pool_size)),
+                timeout=float(os.getenv(f"{prefix}_HTTP_TIMEOUT_SECONDS", timeout)),
+                retries=int(os.getenv(f"{prefix}_HTTP_RETRIES", retries)),
+                retry_status=retry_status
+            )
+            _sessions[service] = session
+        return session
+
+
+def close_sessions():
+    """Close every pooled session (on application shutdown)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
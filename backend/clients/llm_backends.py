@@ -0,0 +1,263 @@
+"""
+Pluggable LLM providers
+
+One interface for every place that talks to an LLM (the chat handler, the
+explanation build job, the CLI assistants and the load-test tool):
+
+- generate(prompt, system_prompt, timeout) -> str
+- stream(prompt, system_prompt, timeout) -> iterator of text chunks
+- agenerate / astream: asyncio versions (run on the default executor)
+- generate_batch(prompts, ...) -> results in order, failures as exceptions
+
+Providers:
+
+- GroqBackend: Groq chat completions (GROQ_BASE_URL may point elsewhere,
+  e.g. at the stub server)
+- OllamaBackend: a local Ollama server, as used by ollama_dsa_yt.py
+- StubBackend: deterministic in-process text, for tests and dry runs
+
+HTTP providers share the pooled sessions from clients.http and raise
+requests.exceptions.HTTPError on non-200 responses. For load tests without
+network, run clients/llm_stub_server.py and point GROQ_BASE_URL or
+OLLAMA_BASE_URL at it. Use get_backend(name) to build a provider by name.
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterator, List, Optional, Sequence, Union
+
+import requests
+
+from clients.http import get_session
+from monitoring.metrics import OUTBOUND_REQUEST_DURATION, OUTBOUND_RESPONSES
+
+TUTOR_SYSTEM_PROMPT = """You are an expert DSA (Data Structures and Algorithms) tutor.
+            Provide clear, concise explanations of concepts, include code examples when helpful,
+            and give practical learning advice. Keep responses focused and educational.
+            Always be encouraging and supportive."""
+
+_END_OF_STREAM = object()
+
+
+def stub_completion(prompt: str) -> str:
+    """Deterministic reply used by StubBackend and the stub server."""
+    first_line = prompt.strip().splitlines()[0] if prompt.strip() else ""
+    return f"[stub explanation] {first_line}"
+
+
+class LLMBackend:
+    """Base class: a named text-generation provider."""
+
+    name = "base"
+    model = ""
+    timeout = 30.0
+
+    @property
+    def configured(self) -> bool:
+        """False when the provider is missing required settings (e.g. an API key)."""
+        return True
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, timeout: Optional[float] = None) -> str:
+        raise NotImplementedError
+
+    def stream(self, prompt: str, system_prompt: Optional[str] = None,
+               timeout: Optional[float] = None) -> Iterator[str]:
+        # Providers without streaming yield the whole completion at once
+        yield self.generate(prompt, system_prompt, timeout)
+
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None,
+                        timeout: Optional[float] = None) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.generate(prompt, system_prompt, timeout))
+
+    async def astream(self, prompt: str, system_prompt: Optional[str] = None,
+                      timeout: Optional[float] = None) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        chunks = self.stream(prompt, system_prompt, timeout)
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, _END_OF_STREAM)
+            if chunk is _END_OF_STREAM:
+                break
+            yield chunk
+
+    def generate_batch(self, prompts: Sequence[str], system_prompt: Optional[str] = None,
+                       timeout: Optional[float] = None, max_workers: int = 4) -> List[Union[str, Exception]]:
+        """Run prompts concurrently; results keep the input order, failed prompts hold their exception."""
+        def run(prompt):
+            try:
+                return self.generate(prompt, system_prompt, timeout)
+            except Exception as e:
+                return e
+
+        if not prompts:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(prompts))),
+                                thread_name_prefix=f"llm-{self.name}") as executor:
+            return list(executor.map(run, prompts))
+
+
+class _HTTPBackend(LLMBackend):
+    """Shared request/metrics handling for HTTP providers."""
+
+    service = ""
+    operation = ""
+
+    def _post(self, url: str, payload: dict, timeout: Optional[float], stream: bool = False,
+              headers: Optional[dict] = None) -> requests.Response:
+        operation = f"{self.operation}_stream" if stream else self.operation
+        # For streams the timer covers the time to the response headers
+        with OUTBOUND_REQUEST_DURATION.time(service=self.service, operation=operation) as timer:
+            response = get_session(self.service).post(url, headers=headers, json=payload,
+                                                      timeout=timeout or self.timeout, stream=stream)
+            OUTBOUND_RESPONSES.inc(service=self.service, status_code=response.status_code)
+            if response.status_code != 200:
+                timer.outcome = 'http_error'
+
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(
+                f"{self.name.capitalize()} API error: {response.status_code} - {response.text}", response=response
+            )
+        return response
+
+
+class GroqBackend(_HTTPBackend):
+    name = "groq"
+    service = "groq"
+    operation = "chat_completions"
+
+    def __init__(self, model: str = "mistral-saba-24b", temperature: float = 0.3, max_tokens: int = 4096,
+                 top_p: float = 0.9, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 timeout: float = 30.0):
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.top_p = top_p
+        self.api_key = api_key or os.getenv("GROQ_API_KEY")
+        self.base_url = (base_url or os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")).rstrip("/")
+        self.timeout = timeout
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, timeout: Optional[float] = None) -> str:
+        response = self._post(f"{self.base_url}/chat/completions", self._payload(prompt, system_prompt),
+                              timeout, headers=self._headers())
+        return response.json()["choices"][0]["message"]["content"].strip()
+
+    def stream(self, prompt: str, system_prompt: Optional[str] = None,
+               timeout: Optional[float] = None) -> Iterator[str]:
+        response = self._post(f"{self.base_url}/chat/completions", self._payload(prompt, system_prompt, stream=True),
+                              timeout, stream=True, headers=self._headers())
+        with response:
+            # Server-sent events: "data: {json}" lines, terminated by "data: [DONE]"
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                content = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                if content:
+                    yield content
+
+    def _headers(self) -> dict:
+        if not self.api_key:
+            raise ValueError("Please set GROQ_API_KEY in your .env file")
+        return {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+
+    def _payload(self, prompt: str, system_prompt: Optional[str], stream: bool = False) -> dict:
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt or TUTOR_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "top_p": self.top_p
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
+
+
+class OllamaBackend(_HTTPBackend):
+    name = "ollama"
+    service = "ollama"
+    operation = "generate"
+
+    def __init__(self, model: str = "mistral", temperature: float = 0.7, top_p: float = 0.9, top_k: int = 40,
+                 num_ctx: int = 4096, base_url: Optional[str] = None, timeout: float = 120.0):
+        self.model = model
+        self.options = {"temperature": temperature, "top_p": top_p, "top_k": top_k, "num_ctx": num_ctx}
+        self.base_url = (base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")).rstrip("/")
+        self.timeout = timeout
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, timeout: Optional[float] = None) -> str:
+        response = self._post(f"{self.base_url}/api/generate", self._payload(prompt, system_prompt, False), timeout)
+        return response.json()["response"].strip()
+
+    def stream(self, prompt: str, system_prompt: Optional[str] = None,
+               timeout: Optional[float] = None) -> Iterator[str]:
+        response = self._post(f"{self.base_url}/api/generate", self._payload(prompt, system_prompt, True),
+                              timeout, stream=True)
+        with response:
+            # One JSON object per line until "done": true
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
+
+    def _payload(self, prompt: str, system_prompt: Optional[str], stream: bool) -> dict:
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "system": system_prompt or TUTOR_SYSTEM_PROMPT,
+            "stream": stream,
+            "options": dict(self.options)
+        }
+
+
+class StubBackend(LLMBackend):
+    """Deterministic in-process provider; latency simulates a slow model."""
+
+    name = "stub"
+    model = "stub"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, timeout: Optional[float] = None) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return stub_completion(prompt)
+
+    def stream(self, prompt: str, system_prompt: Optional[str] = None,
+               timeout: Optional[float] = None) -> Iterator[str]:
+        words = self.generate(prompt, system_prompt, timeout).split(" ")
+        for index, word in enumerate(words):
+            yield word if index == 0 else " " + word
+
+
+BACKENDS = {
+    'groq': GroqBackend,
+    'ollama': OllamaBackend,
+    'stub': StubBackend,
+}
+
+
+def get_backend(name: str, **kwargs) -> LLMBackend:
+    """Build a provider by name ('groq', 'ollama' or 'stub')."""
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown LLM backend '{name}', expected one of {sorted(BACKENDS)}") from None
+    return backend_class(**kwargs)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Deterministic local stand-in for the Groq and Ollama HTTP APIs
+
+Serves the endpoints the LLM providers use, with fixed replies and an optional
+artificial latency, so load tests and end-to-end runs need no network or
+model:
+
+- POST /openai/v1/chat/completions  (Groq / OpenAI format, incl. "stream": true SSE)
+- POST /api/generate                (Ollama format, incl. NDJSON streaming)
+- GET  /api/tags                    (Ollama model list)
+
+Usage:
+    python -m clients.llm_stub_server [--port 8089] [--latency 0.5]
+
+then start the server with GROQ_BASE_URL=http://127.0.0.1:8089/openai/v1 (or
+OLLAMA_BASE_URL=http://127.0.0.1:8089).
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+from clients.llm_backends import stub_completion
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/api/tags":
+            self._send_json({"models": [{"name": "mistral:latest"}]})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json({"error": "invalid JSON"}, status=400)
+            return
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        path = self.path.rstrip("/")
+        if path in ("/openai/v1/chat/completions", "/v1/chat/completions"):
+            self._chat_completions(body)
+        elif path == "/api/generate":
+            self._ollama_generate(body)
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def _chat_completions(self, body: dict):
+        user_messages = [m.get("content", "") for m in body.get("messages", []) if m.get("role") == "user"]
+        text = stub_completion(user_messages[-1] if user_messages else "")
+        model = body.get("model", "stub")
+
+        if not body.get("stream"):
+            self._send_json({
+                "object": "chat.completion",
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                             "finish_reason": "stop"}]
+            })
+            return
+
+        events = [{"choices": [{"index": 0, "delta": {"content": word}}]} for word in _chunks(text)]
+        lines = [f"data: {json.dumps(event)}\n\n" for event in events] + ["data: [DONE]\n\n"]
+        self._send_lines(lines, "text/event-stream")
+
+    def _ollama_generate(self, body: dict):
+        text = stub_completion(body.get("prompt", ""))
+        model = body.get("model", "stub")
+
+        if not body.get("stream", True):
+            self._send_json({"model": model, "response": text, "done": True})
+            return
+
+        lines = [json.dumps({"model": model, "response": word, "done": False}) + "\n" for word in _chunks(text)]
+        lines.append(json.dumps({"model": model, "response": "", "done": True}) + "\n")
+        self._send_lines(lines, "application/x-ndjson")
+
+    def _send_json(self, payload: dict, status: int = 200):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_lines(self, lines, content_type: str):
+        data = "".join(lines).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Load tests open many connections at once; the default backlog of 5 stalls them
+    request_queue_size = 256
+
+
+def _make_server(host: str, port: int, latency: float) -> StubLLMServer:
+    handler = type("ConfiguredStubLLMHandler", (StubLLMHandler,), {"latency": latency})
+    return StubLLMServer((host, port), handler)
+
+
+def _chunks(text: str):
+    words = text.split(" ")
+    return [word if index == 0 else " " + word for index, word in enumerate(words)]
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, latency: float = 0.0) -> Tuple[StubLLMServer, str]:
+    """Serve in a daemon thread; returns the server and its base URL (call server.shutdown() to stop)."""
+    server = _make_server(host, port, latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministic local Groq/Ollama stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each reply")
+    args = parser.parse_args()
+
+    server = _make_server(args.host, args.port, args.latency)
+    base_url = f"http://{args.host}:{args.port}"
+    print("🧪 Stub LLM server running")
+    print(f"   GROQ_BASE_URL={base_url}/openai/v1")
+    print(f"   OLLAMA_BASE_URL={base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Resilience helpers for outbound provider calls
+
+- CircuitBreaker: after N consecutive failures (errors accepted by is_failure,
+  or calls slower than a threshold) the breaker opens and callers fail fast for reset_timeout seconds,
+  then a limited number of half-open probes decide whether to close it again.
+- LatencyTracker: rolling window of successful call latencies for percentiles.
+- hedged_call: start a second identical request if the first has not finished
+  within a delay (usually the tracked p95), returning whichever succeeds first,
+  on a HedgeExecutor that never queues work behind busy threads.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from typing import Callable, Optional
+
+from monitoring.metrics import Counter, Gauge
+
+CIRCUIT_BREAKER_STATE = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state per provider (0 closed, 1 half-open, 2 open)",
+    ["name"]
+)
+CIRCUIT_BREAKER_REJECTIONS = Counter(
+    "circuit_breaker_rejections_total",
+    "Calls short-circuited because the breaker was open",
+    ["name"]
+)
+HEDGED_REQUESTS = Counter(
+    "hedged_requests_total",
+    "Hedge requests started because the first attempt exceeded the hedge delay",
+    ["name"]
+)
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected by an open circuit breaker."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with half-open probing."""
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name: str, failure_threshold: int = 5, slow_call_threshold: Optional[float] = None,
+                 reset_timeout: float = 30.0, half_open_max_calls: int = 1,
+                 clock: Callable[[], float] = time.monotonic,
+                 is_failure: Callable[[Exception], bool] = lambda exc: True):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self.is_failure = is_failure
+
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._lock = threading.Lock()
+
+        CIRCUIT_BREAKER_STATE.set_function(lambda: self._STATE_VALUES[self.state], name=name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a call may proceed. Half-open probes are counted here."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return True
+        CIRCUIT_BREAKER_REJECTIONS.inc(name=self.name)
+        return False
+
+    def record_success(self, duration: Optional[float] = None):
+        """Record a completed call; calls over slow_call_threshold count as failures."""
+        if self.slow_call_threshold is not None and duration is not None and duration >= self.slow_call_threshold:
+            self.record_failure()
+            return
+        with self._lock:
+            if self._state != self.CLOSED:
+                print(f"✅ Circuit breaker '{self.name}' closed after successful probe")
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._half_open_in_flight = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    print(f"⚡ Circuit breaker '{self.name}' opened after {self._consecutive_failures} consecutive failures")
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._half_open_in_flight = 0
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """Run fn through the breaker, raising CircuitOpenError when open.
+
+        Exceptions that is_failure rejects (e.g. a 400 for one bad request) are
+        re-raised but count as a call the provider answered.
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit breaker '{self.name}' is open")
+
+        start = self._clock()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if self.is_failure(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        self.record_success(self._clock() - start)
+        return result
+
+    def _maybe_half_open(self):
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_in_flight = 0
+
+
+class LatencyTracker:
+    """Rolling window of call latencies."""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, quantile: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(quantile * len(samples)))
+        return samples[index]
+
+
+class HedgeExecutor:
+    """Bounded thread pool for hedged calls.
+
+    try_submit never queues: when every worker is busy it returns None, so a
+    saturated pool degrades to unhedged calls instead of delaying them.
+    """
+
+    def __init__(self, max_workers: int = 8, name: str = "hedge"):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    def try_submit(self, fn: Callable) -> Optional[Future]:
+        if not self._slots.acquire(blocking=False):
+            return None
+        try:
+            future = self._pool.submit(fn)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+
+# Used by hedged calls that do not bring their own executor
+_DEFAULT_HEDGE_EXECUTOR = HedgeExecutor(max_workers=16)
+
+
+def hedged_call(fn: Callable, hedge_delay: float, name: str = "default",
+                executor: Optional[HedgeExecutor] = None, timeout: Optional[float] = None):
+    """Call fn; if it has not returned after hedge_delay, race a second attempt.
+
+    A fast failure of the first attempt is raised without hedging. The slower
+    attempt is left to finish in the background. With a timeout, TimeoutError
+    is raised once that many seconds pass without a successful attempt. When
+    the executor has no free worker, fn runs unhedged in the calling thread.
+    """
+    executor = executor or _DEFAULT_HEDGE_EXECUTOR
+    deadline = None if timeout is None else time.monotonic() + timeout
+    first = executor.try_submit(fn)
+    if first is None:
+        return fn()
+    try:
+        return first.result(timeout=hedge_delay if timeout is None else min(hedge_delay, timeout))
+    except FutureTimeout:
+        pass
+
+    pending = {first}
+    second = executor.try_submit(fn)
+    if second is not None:
+        HEDGED_REQUESTS.inc(name=name)
+        pending.add(second)
+    last_error = None
+    while pending:
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        if not done:
+            raise TimeoutError(f"{name} call did not complete within {timeout:.2f}s")
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            last_error = future.exception()
+    raise last_error
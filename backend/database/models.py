@@ -14,6 +14,7 @@ from bson import ObjectId
 import json
 
 from database.db_utils import get_mongodb_client, get_async_mongodb_client
+from monitoring.metrics import DB_OPERATION_DURATION, set_current_outcome
 
 class DatabaseConfig:
     """Database configuration class"""
@@ -105,12 +106,14 @@ class UserModel:
                     print(f"❌ Failed to initialize user collection")
         return self.collection is not None
     
+    @DB_OPERATION_DURATION.timed(collection="users", operation="create_user")
     def create_user(self, user_data: Dict) -> str:
         """Create a new user"""
         try:
             # Ensure collection is available
             if not self.ensure_collection():
                 print("❌ Cannot create user: collection not available")
+                set_current_outcome("error")
                 return None
             
             # Hash password if provided
@@ -143,15 +146,18 @@ class UserModel:
             return str(result.inserted_id)
         
         except Exception as e:
+            set_current_outcome("error")
             print(f"❌ Error creating user: {e}")
             return None
     
+    @DB_OPERATION_DURATION.timed(collection="users", operation="get_user_by_id")
     def get_user_by_id(self, user_id: str) -> Optional[Dict]:
         """Get user by ID"""
         try:
             # Ensure collection is available
             if not self.ensure_collection():
                 print(f"❌ Cannot get user by ID: collection not available")
+                set_current_outcome("error")
                 return None
                 
             # Try ObjectId first, then string user_id
@@ -182,6 +188,7 @@ class UserModel:
             return user
         
         except Exception as e:
+            set_current_outcome("error")
             print(f"❌ Error getting user: {e}")
             # Try to reconnect and try again
             if self.db_config.check_and_reconnect():
@@ -189,12 +196,14 @@ class UserModel:
                 return self.get_user_by_id(user_id)
             return None
     
+    @DB_OPERATION_DURATION.timed(collection="users", operation="get_user_by_email")
     def get_user_by_email(self, email: str) -> Optional[Dict]:
         """Get user by email"""
         try:
             # Ensure collection is available
             if not self.ensure_collection():
                 print(f"❌ Cannot get user by email: collection not available")
+                set_current_outcome("error")
                 return None
             
             # Attempt to find the user with more detailed logging
@@ -210,6 +219,7 @@ class UserModel:
             return user
         
         except Exception as e:
+            set_current_outcome("error")
             print(f"❌ Error getting user by email: {e}")
             print(f"Database status: Connected: {self.db_config.client is not None}, DB: {self.db_config.db is not None}, Collection: {self.collection is not None}")
             # Try to reconnect and try again
@@ -218,6 +228,7 @@ class UserModel:
                 return self.get_user_by_email(email)
             return None
     
+    @DB_OPERATION_DURATION.timed(collection="users", operation="update_user")
     def update_user(self, user_id: str, update_data: Dict) -> bool:
         """Update user information"""
         try:
@@ -237,9 +248,27 @@ class UserModel:
             return result.modified_count > 0
         
         except Exception as e:
+            set_current_outcome("error")
             print(f"❌ Error updating user: {e}")
             return False
-    
+
+    @DB_OPERATION_DURATION.timed(collection="users", operation="record_user_query")
+    def record_user_query(self, user_id: str, last_active: datetime) -> bool:
+        """Count one query for the user; False if no user matched.
+
+        Database errors are raised rather than swallowed so background callers can retry.
+        """
+        if not self.ensure_collection():
+            raise ConnectionError("users collection not available")
+
+        user_filter = {"_id": ObjectId(user_id)} if ObjectId.is_valid(user_id) else {"user_id": user_id}
+        result = self.collection.update_one(user_filter, {
+            '$inc': {'statistics.total_queries': 1},
+            '$set': {'statistics.last_active': last_active, 'updated_at': datetime.now(timezone.utc)}
+        })
+        return result.matched_count > 0
+
+    @DB_OPERATION_DURATION.timed(collection="users", operation="update_user_progress")
     def update_user_progress(self, user_id: str, completed_topic: str, known_concepts: List[str] = None) -> bool:
         """Update user's learning progress"""
         try:
@@ -271,9 +300,42 @@ class UserModel:
             return result.modified_count > 0
         
         except Exception as e:
+            set_current_outcome("error")
             print(f"❌ Error updating user progress: {e}")
             return False
     
+    @DB_OPERATION_DURATION.timed(collection="users", operation="get_cohort_progress")
+    def get_cohort_progress(self, user_ids: Optional[List[str]] = None, limit: int = 10000) -> Optional[List[Dict]]:
+        """Completed topics and known concepts of many users (all active users when user_ids is None)"""
+        try:
+            if not self.ensure_collection():
+                print("❌ Cannot load cohort progress: collection not available")
+                set_current_outcome("error")
+                return None
+            
+            if user_ids:
+                # Same identifiers get_user_by_id accepts: ObjectId, user_id or email
+                object_ids = [ObjectId(user_id) for user_id in user_ids if ObjectId.is_valid(user_id)]
+                query = {'$or': [{'_id': {'$in': object_ids}}, {'user_id': {'$in': user_ids}}, {'email': {'$in': user_ids}}]}
+            else:
+                query = {'is_active': {'$ne': False}}
+            
+            projection = {'user_id': 1, 'email': 1, 'completed_topics': 1, 'known_concepts': 1}
+            users = []
+            for user in self.collection.find(query, projection).limit(limit):
+                users.append({
+                    'user_id': user.get('user_id') or str(user['_id']),
+                    'email': user.get('email'),
+                    'completed_topics': user.get('completed_topics', []),
+                    'known_concepts': user.get('known_concepts', [])
+                })
+            return users
+        
+        except Exception as e:
+            set_current_outcome("error")
+            print(f"❌ Error loading cohort progress: {e}")
+            return None
+    
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify password"""
         try:
@@ -334,12 +396,14 @@ class ChatHistoryModel:
                     print(f"❌ Failed to initialize chat history collection")
         return self.collection is not None
     
+    @DB_OPERATION_DURATION.timed(collection="chat_history", operation="save_chat_message")
     def save_chat_message(self, user_id: str, message: str, response: str, analysis: Dict = None) -> str:
         """Save a chat message and response"""
         try:
             # Ensure collection is available
             if not self.ensure_collection():
                 print(f"❌ Cannot save chat message: collection not available")
+                set_current_outcome("error")
                 return None
                 
             print(f"🔄 Saving chat message for user_id: {user_id}")
@@ -373,15 +437,18 @@ class ChatHistoryModel:
             return str(result.inserted_id)
         
         except Exception as e:
+            set_current_outcome("error")
             print(f"❌ Error saving chat message: {e}")
             return None
     
+    @DB_OPERATION_DURATION.timed(collection="chat_history", operation="get_chat_history")
     def get_chat_history(self, user_id: str, limit: int = 50) -> List[Dict]:
         """Get chat history for a user"""
         try:
             # Ensure collection is available
             if not self.ensure_collection():
                 print(f"❌ Cannot get chat history: collection not available")
+                set_current_outcome("error")
                 return []
                 
             print(f"🔄 Getting chat history for user_id: {user_id}, limit: {limit}")
@@ -417,9 +484,11 @@ class ChatHistoryModel:
             return list(reversed(history))  # Return in chronological order
         
         except Exception as e:
+            set_current_outcome("error")
             print(f"❌ Error getting chat history: {e}")
             return []
     
+    @DB_OPERATION_DURATION.timed(collection="chat_history", operation="get_recent_context")
     def get_recent_context(self, user_id: str, limit: int = 5) -> List[Dict]:
         """Get recent chat context for continuity"""
         try:
@@ -441,6 +510,7 @@ class ChatHistoryModel:
             return context
         
         except Exception as e:
+            set_current_outcome("error")
             print(f"❌ Error getting recent context: {e}")
             return []
     
@@ -473,12 +543,14 @@ class LearningSessionModel:
                     print(f"❌ Failed to initialize learning session collection")
         return self.collection is not None
     
+    @DB_OPERATION_DURATION.timed(collection="learning_sessions", operation="create_learning_session")
     def create_learning_session(self, user_id: str, session_data: Dict) -> str:
         """Create a new learning session"""
         try:
             # Ensure collection is available
             if not self.ensure_collection():
                 print(f"❌ Cannot create learning session: collection not available")
+                set_current_outcome("error")
                 return None
             
             session_data.update({
@@ -493,9 +565,11 @@ class LearningSessionModel:
             return str(result.inserted_id)
         
         except Exception as e:
+            set_current_outcome("error")
             print(f"❌ Error creating learning session: {e}")
             return None
     
+    @DB_OPERATION_DURATION.timed(collection="learning_sessions", operation="get_active_session")
     def get_active_session(self, user_id: str) -> Optional[Dict]:
         """Get active learning session for user"""
         try:
@@ -509,9 +583,11 @@ class LearningSessionModel:
             return session
         
         except Exception as e:
+            set_current_outcome("error")
             print(f"❌ Error getting active session: {e}")
             return None
     
+    @DB_OPERATION_DURATION.timed(collection="learning_sessions", operation="update_session_progress")
     def update_session_progress(self, session_id: str, progress_data: Dict) -> bool:
         """Update learning session progress"""
         try:
@@ -525,6 +601,7 @@ class LearningSessionModel:
             return result.modified_count > 0
         
         except Exception as e:
+            set_current_outcome("error")
             print(f"❌ Error updating session progress: {e}")
             return False
 
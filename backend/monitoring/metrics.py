@@ -0,0 +1,297 @@
+"""
+Lightweight Prometheus-style metrics
+
+Counters, gauges and histograms with labels, rendered in the Prometheus text
+exposition format by the /metrics endpoint. Each observation is a dict lookup,
+a bisect and an add under a per-metric lock, so instrumentation is cheap enough
+to leave on in production.
+"""
+
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Latency buckets (seconds) covering in-memory stages up to slow LLM calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames: Iterable[str], labelvalues: Iterable[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Shared label handling for all metric types."""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _label_key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError as e:
+            raise ValueError(f"Metric {self.name} missing label {e}") from None
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    metric_type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        self._values: Dict[Tuple[str, ...], float] = {}
+        super().__init__(*args, **kwargs)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._label_key(labels), 0.0)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, optionally read from a callback."""
+
+    metric_type = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._callbacks: Dict[Tuple[str, ...], Callable[[], float]] = {}
+        super().__init__(*args, **kwargs)
+
+    def set(self, value: float, **labels):
+        key = self._label_key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn: Callable[[], float], **labels):
+        """Read the gauge from a callback at scrape time."""
+        key = self._label_key(labels)
+        with self._lock:
+            self._callbacks[key] = fn
+
+    def get(self, **labels) -> float:
+        key = self._label_key(labels)
+        if key in self._callbacks:
+            return float(self._callbacks[key]())
+        return self._values.get(key, 0.0)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = dict(self._values)
+            callbacks = list(self._callbacks.items())
+        for key, fn in callbacks:
+            try:
+                items[key] = float(fn())
+            except Exception:
+                continue
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items.items()]
+
+
+# Timer of the innermost Histogram.timed call, so the decorated function can label its outcome
+_current_timer: contextvars.ContextVar = contextvars.ContextVar("current_histogram_timer", default=None)
+
+
+def set_current_outcome(outcome: str):
+    """Set the outcome label of the enclosing ``Histogram.timed`` call.
+
+    For decorated functions that catch their own exceptions and return a
+    fallback value, which the timer would otherwise record as a success.
+    """
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.outcome = outcome
+
+
+class _HistogramTimer:
+    """Context manager that observes elapsed time, labelling the outcome."""
+
+    def __init__(self, histogram: "Histogram", labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+        self.outcome = "success"
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        labels = dict(self.labels)
+        if 'outcome' in self.histogram.labelnames and 'outcome' not in labels:
+            labels['outcome'] = "error" if exc_type else self.outcome
+        self.histogram.observe(time.perf_counter() - self.start, **labels)
+        return False
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket latency histogram."""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value: float, **labels):
+        key = self._label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                # One slot per bucket plus +Inf
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    def time(self, **labels) -> _HistogramTimer:
+        """Time a block; an ``outcome`` label is filled in if not given.
+
+        The outcome is "error" when the block raises, otherwise the timer's
+        ``outcome`` attribute (default "success"), which the block may change.
+        """
+        return _HistogramTimer(self, labels)
+
+    def timed(self, **labels):
+        """Decorator form of :meth:`time`; the function may call :func:`set_current_outcome`."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.time(**labels) as timer:
+                    token = _current_timer.set(timer)
+                    try:
+                        return fn(*args, **kwargs)
+                    finally:
+                        _current_timer.reset(token)
+            return wrapper
+        return decorator
+
+    def get_count(self, **labels) -> int:
+        return sum(self._counts.get(self._label_key(labels), []))
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Prometheus text exposition format content type
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Application metrics shared by the server, chat handler, DB models and clients
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"]
+)
+CHAT_REQUEST_DURATION = Histogram(
+    "chat_request_duration_seconds",
+    "End-to-end IntegratedChatHandler.handle_chat_message latency",
+    ["outcome"]
+)
+CHAT_STAGE_DURATION = Histogram(
+    "chat_stage_duration_seconds",
+    "Latency of chat handling stages (profile load, analysis, graph path, llm, youtube, persistence)",
+    ["stage", "outcome"]
+)
+DB_OPERATION_DURATION = Histogram(
+    "db_operation_duration_seconds",
+    "MongoDB model operation latency",
+    ["collection", "operation", "outcome"]
+)
+OUTBOUND_REQUEST_DURATION = Histogram(
+    "outbound_request_duration_seconds",
+    "Latency of outbound HTTP calls to external providers",
+    ["service", "operation", "outcome"]
+)
+OUTBOUND_RESPONSES = Counter(
+    "outbound_responses_total",
+    "Outbound HTTP responses by provider and status code",
+    ["service", "status_code"]
+)
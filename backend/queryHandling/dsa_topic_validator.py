@@ -14,10 +14,11 @@ import nltk
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
-from sentence_transformers import SentenceTransformer
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 
+from sentence_model import get_sentence_model
+
 # Download required NLTK data
 try:
     nltk.download('punkt', quiet=True)
@@ -33,12 +34,8 @@ class DSATopicValidator:
         self.lemmatizer = WordNetLemmatizer()
         self.stop_words = set(stopwords.words('english'))
         
-        # Initialize sentence transformer for semantic similarity
-        try:
-            self.sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
-        except:
-            print("Warning: Could not load sentence transformer. Semantic similarity disabled.")
-            self.sentence_model = None
+        # Sentence transformer for semantic similarity (shared with the semantic response cache)
+        self.sentence_model = get_sentence_model()
         
         # DSA-related keywords organized by categories
         self.dsa_keywords = {
@@ -1,12 +1,21 @@
-import requests
 import json
 import os
+import sys
+from pathlib import Path
 from typing import List, Dict, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
-import time
 from dotenv import load_dotenv
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # Add backend directory
+from monitoring.metrics import OUTBOUND_REQUEST_DURATION, OUTBOUND_RESPONSES
+from clients.admission import AdmissionRejected, get_admission_controller
+from clients.http import get_session
+from clients.llm_backends import GroqBackend
+from video_cache import VideoCache
+from youtube_quota import get_quota_budget
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -21,6 +30,9 @@ if not SERP_API_KEY or not YOUTUBE_API_KEY:
 if not GROQ_API_KEY:
     raise ValueError("Please set GROQ_API_KEY in your .env file")
 
+# videos.list accepts at most this many comma-separated IDs
+VIDEOS_LIST_MAX_IDS = 50
+
 @dataclass
 class VideoResource:
     title: str
@@ -31,7 +43,7 @@ class VideoResource:
     description: str = ""
 
 class YouTubeResourceFinder:
-    def __init__(self):
+    def __init__(self, quota_pacing: bool = True):
         self.youtube_api_key = YOUTUBE_API_KEY
         if not self.youtube_api_key:
             raise ValueError("YouTube API key not found")
@@ -59,116 +71,210 @@ class YouTubeResourceFinder:
             "stack": ["stack implementation", "stack applications"],
             "queue": ["queue implementation", "priority queue", "circular queue"]
         }
+        
+        # Shared limit on concurrent YouTube searches across the process
+        self.admission = get_admission_controller('youtube')
+        
+        # Daily API unit budget; request-time calls are paced across the day
+        self.quota = get_quota_budget()
+        self.quota_pacing = quota_pacing
+        
+        # Runs the search.list calls for several topics concurrently
+        self._search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="yt-search")
+        
+        # Topic-keyed results cache; YOUTUBE_CACHE_DB="" keeps it in memory only
+        self.video_cache = VideoCache(
+            ttl=float(os.getenv("YOUTUBE_CACHE_TTL_SECONDS", 86400)),
+            stale_ttl=float(os.getenv("YOUTUBE_CACHE_STALE_SECONDS", 6 * 86400)),
+            db_path=os.getenv("YOUTUBE_CACHE_DB", str(Path(__file__).parent / "video_cache.sqlite3"))
+        )
 
     def get_videos(self, topic: str) -> List[VideoResource]:
-        """Get relevant YouTube videos for a DSA topic"""
+        """Get relevant YouTube videos for a DSA topic, served from the cache when possible"""
+        return self.get_videos_for_topics([topic]).get(topic, [])
+    
+    def get_videos_for_topics(self, topics: List[str]) -> Dict[str, List[VideoResource]]:
+        """Get videos for several topics with at most one search per uncached topic
+        and a single videos.list call for all of them"""
+        def fetch_many(missing: List[str]) -> Dict[str, List[Dict]]:
+            fetched = self.fetch_videos_batch(missing)
+            return {topic: [asdict(video) for video in videos] for topic, videos in fetched.items()}
+        
+        cached = self.video_cache.get_many_or_fetch(topics, fetch_many)
+        return {topic: [VideoResource(**video) for video in videos] for topic, videos in cached.items()}
+    
+    def fetch_videos_batch(self, topics: List[str]) -> Dict[str, List[VideoResource]]:
+        """Search all topics concurrently, then fetch details for the merged IDs in as few calls as possible.
+        Bypasses the results cache (the catalog build job uses this for fresh results)."""
         try:
-            # Construct search query
-            search_terms = [topic]
+            searches = {topic: self._search_executor.submit(self._search_video_ids, topic) for topic in topics}
+            ids_by_topic = {topic: future.result() for topic, future in searches.items()}
             
-            # Add related keywords if topic matches known patterns
-            for key, keywords in self.topic_keywords.items():
-                if key.lower() in topic.lower():
-                    search_terms.extend(keywords[:2])  # Add top 2 related terms
-                    break
+            # Merge and dedupe candidate IDs, keeping search order; videos.list takes up to 50 per call
+            unique_ids = list(dict.fromkeys(video_id for ids in ids_by_topic.values() for video_id in ids))
+            details = {}
+            for start in range(0, len(unique_ids), VIDEOS_LIST_MAX_IDS):
+                details.update(self._fetch_video_details(unique_ids[start:start + VIDEOS_LIST_MAX_IDS]))
             
-            query = f"{' '.join(search_terms)} programming tutorial"
-            print(f"🔍 Searching for: {query}")
-            
-            # YouTube API search endpoint
-            search_url = "https://www.googleapis.com/youtube/v3/search"
-            search_params = {
-                'part': 'snippet',
-                'q': query,
-                'key': self.youtube_api_key,
-                'type': 'video',
-                'order': 'relevance',
-                'maxResults': 10,
-                'videoDefinition': 'any',
-                'videoDuration': 'medium'  # Prefer medium-length videos
+            return {
+                topic: self._build_resources(topic, [details[video_id] for video_id in ids if video_id in details])
+                for topic, ids in ids_by_topic.items()
             }
             
-            response = requests.get(search_url, params=search_params)
+        except Exception as e:
+            print(f"❌ Error getting YouTube videos: {str(e)}")
+            return {topic: [] for topic in topics}
+    
+    def _search_video_ids(self, topic: str) -> List[str]:
+        """Run one search.list call for a topic and return candidate video IDs"""
+        # Construct search query
+        search_terms = [topic]
+        
+        # Add related keywords if topic matches known patterns
+        for key, keywords in self.topic_keywords.items():
+            if key.lower() in topic.lower():
+                search_terms.extend(keywords[:2])  # Add top 2 related terms
+                break
+        
+        query = f"{' '.join(search_terms)} programming tutorial"
+        print(f"🔍 Searching for: {query}")
+        
+        # YouTube API search endpoint
+        search_url = "https://www.googleapis.com/youtube/v3/search"
+        search_params = {
+            'part': 'snippet',
+            'q': query,
+            'key': self.youtube_api_key,
+            'type': 'video',
+            'order': 'relevance',
+            'maxResults': 10,
+            'videoDefinition': 'any',
+            'videoDuration': 'medium'  # Prefer medium-length videos
+        }
+        
+        if not self.quota.try_spend('search', paced=self.quota_pacing):
+            print(f"🪫 YouTube quota budget low, skipping live search for '{topic}'")
+            return []
+        
+        try:
+            with self.admission.slot(), \
+                    OUTBOUND_REQUEST_DURATION.time(service='youtube', operation='search') as search_timer:
+                response = get_session('youtube').get(search_url, params=search_params)
+                OUTBOUND_RESPONSES.inc(service='youtube', status_code=response.status_code)
+                if response.status_code != 200:
+                    search_timer.outcome = 'http_error'
+        except AdmissionRejected as e:
+            self.quota.refund('search')
+            print(f"⏳ YouTube search for '{topic}' shed by admission control ({e.reason})")
+            return []
+        except Exception as e:
+            print(f"❌ Error searching YouTube for '{topic}': {str(e)}")
+            return []
+        
+        if response.status_code != 200:
+            print(f"❌ YouTube API error: {response.status_code}")
+            return []
+        
+        return [item['id']['videoId'] for item in response.json().get('items', [])]
+    
+    def _fetch_video_details(self, video_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch snippet, statistics and duration for up to 50 videos in one videos.list call"""
+        if not video_ids:
+            return {}
+        
+        details_url = "https://www.googleapis.com/youtube/v3/videos"
+        details_params = {
+            'part': 'snippet,statistics,contentDetails',
+            'id': ','.join(video_ids),
+            'key': self.youtube_api_key
+        }
+        
+        if not self.quota.try_spend('videos', paced=self.quota_pacing):
+            print("🪫 YouTube quota budget exhausted, skipping video details")
+            return {}
+        
+        try:
+            with self.admission.slot(), \
+                    OUTBOUND_REQUEST_DURATION.time(service='youtube', operation='videos') as details_timer:
+                details_response = get_session('youtube').get(details_url, params=details_params)
+                OUTBOUND_RESPONSES.inc(service='youtube', status_code=details_response.status_code)
+                if details_response.status_code != 200:
+                    details_timer.outcome = 'http_error'
+        except AdmissionRejected as e:
+            self.quota.refund('videos')
+            print(f"⏳ YouTube video details shed by admission control ({e.reason})")
+            return {}
+        except Exception as e:
+            # Only this chunk loses its details; other chunks and the searches still count
+            print(f"❌ Error fetching YouTube video details: {str(e)}")
+            return {}
+        
+        if details_response.status_code != 200:
+            print(f"❌ YouTube API error: {details_response.status_code}")
+            return {}
+        
+        try:
+            return {item['id']: item for item in details_response.json().get('items', [])}
+        except ValueError as e:
+            print(f"❌ Invalid YouTube video details response: {str(e)}")
+            return {}
+    
+    def _build_resources(self, topic: str, items: List[Dict]) -> List[VideoResource]:
+        """Format video details for a topic and rank them"""
+        resources = []
+        
+        for item in items:
+            video_id = item['id']
+            snippet = item['snippet']
+            statistics = item.get('statistics', {})
+            content_details = item.get('contentDetails', {})
             
-            if response.status_code != 200:
-                print(f"❌ YouTube API error: {response.status_code}")
-                return []
+            # Format view count
+            view_count = statistics.get('viewCount', '0')
+            if view_count.isdigit():
+                views = int(view_count)
+                if views >= 1000000:
+                    view_text = f"{views/1000000:.1f}M views"
+                elif views >= 1000:
+                    view_text = f"{views/1000:.1f}K views"
+                else:
+                    view_text = f"{views} views"
+            else:
+                view_text = "N/A views"
             
-            data = response.json()
-            resources = []
+            # Format duration
+            duration = content_details.get('duration', '')
+            duration_text = self.parse_duration(duration)
             
-            video_ids = [item['id']['videoId'] for item in data.get('items', [])]
+            # Check if from trusted channel
+            channel_id = snippet.get('channelId', '')
+            channel_name = snippet.get('channelTitle', '')
+            is_trusted = channel_id in self.trusted_channels
             
-            if video_ids:
-                # Get additional video details
-                details_url = "https://www.googleapis.com/youtube/v3/videos"
-                details_params = {
-                    'part': 'snippet,statistics,contentDetails',
-                    'id': ','.join(video_ids),
-                    'key': self.youtube_api_key
-                }
-                
-                details_response = requests.get(details_url, params=details_params)
-                
-                if details_response.status_code == 200:
-                    details_data = details_response.json()
-                    
-                    for item in details_data.get('items', []):
-                        video_id = item['id']
-                        snippet = item['snippet']
-                        statistics = item.get('statistics', {})
-                        content_details = item.get('contentDetails', {})
-                        
-                        # Format view count
-                        view_count = statistics.get('viewCount', '0')
-                        if view_count.isdigit():
-                            views = int(view_count)
-                            if views >= 1000000:
-                                view_text = f"{views/1000000:.1f}M views"
-                            elif views >= 1000:
-                                view_text = f"{views/1000:.1f}K views"
-                            else:
-                                view_text = f"{views} views"
-                        else:
-                            view_text = "N/A views"
-                        
-                        # Format duration
-                        duration = content_details.get('duration', '')
-                        duration_text = self.parse_duration(duration)
-                        
-                        # Check if from trusted channel
-                        channel_id = snippet.get('channelId', '')
-                        channel_name = snippet.get('channelTitle', '')
-                        is_trusted = channel_id in self.trusted_channels
-                        
-                        description = f"Video tutorial on {topic}"
-                        if is_trusted:
-                            description += f" ✅ Trusted educator: {channel_name}"
-                        description += f" | {view_text}"
-                        if duration_text:
-                            description += f" | Duration: {duration_text}"
-                        
-                        resources.append(VideoResource(
-                            title=snippet.get('title', ''),
-                            url=f"https://www.youtube.com/watch?v={video_id}",
-                            channel_name=channel_name,
-                            view_count=view_text,
-                            duration=duration_text,
-                            description=description
-                        ))
+            description = f"Video tutorial on {topic}"
+            if is_trusted:
+                description += f" ✅ Trusted educator: {channel_name}"
+            description += f" | {view_text}"
+            if duration_text:
+                description += f" | Duration: {duration_text}"
             
-            # Sort: trusted channels first, then by view count
-            resources.sort(key=lambda x: (
-                x.channel_name not in self.trusted_channels.values(),
-                -int(''.join(filter(str.isdigit, x.view_count.split()[0])) or '0')
+            resources.append(VideoResource(
+                title=snippet.get('title', ''),
+                url=f"https://www.youtube.com/watch?v={video_id}",
+                channel_name=channel_name,
+                view_count=view_text,
+                duration=duration_text,
+                description=description
             ))
-            
-            return resources[:5]  # Return top 5
-            
-        except Exception as e:
-            print(f"❌ Error getting YouTube videos: {str(e)}")
-            return []
-
+        
+        # Sort: trusted channels first, then by view count
+        resources.sort(key=lambda x: (
+            x.channel_name not in self.trusted_channels.values(),
+            -int(''.join(filter(str.isdigit, x.view_count.split()[0])) or '0')
+        ))
+        
+        return resources[:5]  # Return top 5
+    
     def parse_duration(self, duration: str) -> str:
         """Parse YouTube API duration format (PT4M13S) to readable format"""
         if not duration:
@@ -191,6 +297,8 @@ class YouTubeResourceFinder:
         
         return " ".join(parts)
 
+_groq = GroqBackend(temperature=0.7, api_key=GROQ_API_KEY)
+
 def generate_response(prompt: str, system_prompt: str = None) -> str:
     """Generate a response using Groq's mistral-saba-24b model"""
     if system_prompt is None:
@@ -199,40 +307,7 @@ def generate_response(prompt: str, system_prompt: str = None) -> str:
         Focus on accuracy and educational value."""
     
     try:
-        headers = {
-            "Authorization": f"Bearer {GROQ_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": "mistral-saba-24b",
-            "messages": [
-                {
-                    "role": "system",
-                    "content": system_prompt
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0.7,
-            "max_tokens": 4096,
-            "top_p": 0.9
-        }
-        
-        response = requests.post(
-            "https://api.groq.com/openai/v1/chat/completions",
-            headers=headers,
-            json=payload
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
-        else:
-            return f"Error: {response.status_code} - {response.text}"
-            
+        return _groq.generate(prompt, system_prompt)
     except Exception as e:
         return f"Error generating response: {str(e)}"
 
@@ -1,12 +1,18 @@
 import requests
 import json
 import os
+import sys
+from pathlib import Path
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 from urllib.parse import quote
 import time
 from dotenv import load_dotenv
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # Add backend directory
+from clients.http import get_session
+from clients.llm_backends import OllamaBackend
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -84,7 +90,7 @@ class YouTubeResourceFinder:
                 'videoDuration': 'medium'  # Prefer medium-length videos
             }
             
-            response = requests.get(search_url, params=search_params)
+            response = get_session('youtube').get(search_url, params=search_params)
             
             if response.status_code != 200:
                 print(f"❌ YouTube API error: {response.status_code}")
@@ -104,7 +110,7 @@ class YouTubeResourceFinder:
                     'key': self.youtube_api_key
                 }
                 
-                details_response = requests.get(details_url, params=details_params)
+                details_response = get_session('youtube').get(details_url, params=details_params)
                 
                 if details_response.status_code == 200:
                     details_data = details_response.json()
@@ -210,6 +216,8 @@ def setup_ollama():
         print(f"Error pulling model: {str(e)}")
         return None
 
+_ollama = OllamaBackend()
+
 def generate_response(prompt: str, system_prompt: str = None) -> str:
     """Generate a response using Ollama's Mistral model"""
     if system_prompt is None:
@@ -218,25 +226,7 @@ def generate_response(prompt: str, system_prompt: str = None) -> str:
         Focus on accuracy and educational value."""
     
     try:
-        response = requests.post("http://localhost:11434/api/generate",
-                               json={
-                                   "model": "mistral",
-                                   "prompt": prompt,
-                                   "system": system_prompt,
-                                   "stream": False,
-                                   "options": {
-                                       "temperature": 0.7,
-                                       "top_p": 0.9,
-                                       "top_k": 40,
-                                       "num_ctx": 4096,
-                                   }
-                               })
-        
-        if response.status_code == 200:
-            return response.json()["response"]
-        else:
-            return f"Error: {response.status_code} - {response.text}"
-            
+        return _ollama.generate(prompt, system_prompt)
     except Exception as e:
         return f"Error generating response: {str(e)}"
 
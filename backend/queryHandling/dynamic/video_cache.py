@@ -0,0 +1,255 @@
+"""
+Topic-keyed cache for YouTube video lookups
+
+Video results for a topic barely change within a day, while every uncached
+lookup costs a search (100 quota units) plus a videos call. VideoCache keeps
+results per normalized topic with:
+
+- an in-memory LRU tier and an optional SQLite tier that survives restarts
+- TTL expiry, with a stale window during which the old result is served
+  immediately while one background refresh fetches a new one
+- single-flight coalescing, so concurrent misses for the same topic share a
+  single upstream call
+
+Empty results are not cached since they usually mean an API error, shed load
+or an exhausted quota; in that case an expired entry is returned if there is one.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from monitoring.metrics import Counter
+
+VIDEO_CACHE_REQUESTS = Counter(
+    "video_cache_requests_total",
+    "Video cache lookups by result (hit, stale, miss, coalesced, expired_fallback)",
+    ["result"]
+)
+
+
+def normalize_topic(topic: str) -> str:
+    """Cache key for a topic: lowercase with collapsed whitespace."""
+    return re.sub(r"\s+", " ", topic.strip().lower())
+
+
+class _Flight:
+    """An in-progress upstream fetch that other callers can wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class VideoCache:
+    """TTL + stale-while-revalidate cache with request coalescing."""
+
+    def __init__(self, ttl: float = 86400.0, stale_ttl: float = 6 * 86400.0, max_entries: int = 1024,
+                 db_path: Optional[str] = None, clock: Callable[[], float] = time.time):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.db_path = Path(db_path) if db_path else None
+        self._clock = clock
+
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._flights: Dict[str, _Flight] = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+        if self.db_path:
+            try:
+                self._init_db()
+            except (sqlite3.Error, OSError) as e:
+                print(f"⚠️ Video cache disk tier disabled: {e}")
+                self.db_path = None
+
+    def get_or_fetch(self, topic: str, fetch: Callable[[], Any]):
+        """Return cached videos for topic, calling fetch() at most once per miss."""
+        return self.get_many_or_fetch([topic], lambda missing: {missing[0]: fetch()})[topic]
+
+    def get_many_or_fetch(self, topics: List[str], fetch_many: Callable[[List[str]], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return cached videos for each topic.
+
+        fetch_many is called once with every topic that is missing (and not
+        already being fetched by another caller) and must return a dict keyed by
+        those topics. Stale topics are returned as-is and refreshed in the
+        background.
+        """
+        results: Dict[str, Any] = {}
+        leading: List[Tuple[str, str, _Flight]] = []
+        waiting: List[Tuple[str, _Flight]] = []
+        keys_seen: Dict[str, str] = {}
+        expired: Dict[str, Any] = {}
+
+        for topic in topics:
+            key = normalize_topic(topic)
+            if key in keys_seen:
+                continue
+            keys_seen[key] = topic
+
+            entry = self._lookup(key)
+            if entry is not None:
+                value, fetched_at = entry
+                age = self._clock() - fetched_at
+                if age < self.ttl:
+                    VIDEO_CACHE_REQUESTS.inc(result='hit')
+                    results[topic] = value
+                    continue
+                if age < self.ttl + self.stale_ttl:
+                    VIDEO_CACHE_REQUESTS.inc(result='stale')
+                    self._refresh_in_background(key, topic, fetch_many)
+                    results[topic] = value
+                    continue
+                expired[topic] = value
+
+            with self._lock:
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = _Flight()
+                    leading.append((topic, key, flight))
+                else:
+                    waiting.append((topic, flight))
+
+        if leading:
+            VIDEO_CACHE_REQUESTS.inc(len(leading), result='miss')
+            try:
+                fetched = fetch_many([topic for topic, _, _ in leading])
+                for topic, key, flight in leading:
+                    flight.value = fetched.get(topic, [])
+                    if flight.value:
+                        self._store(key, flight.value)
+                        results[topic] = flight.value
+                    elif topic in expired:
+                        # Upstream gave nothing (quota, errors): an old result beats none
+                        VIDEO_CACHE_REQUESTS.inc(result='expired_fallback')
+                        results[topic] = expired[topic]
+                    else:
+                        results[topic] = flight.value
+            except BaseException as e:
+                for _, _, flight in leading:
+                    flight.error = e
+                raise
+            finally:
+                with self._lock:
+                    for _, key, flight in leading:
+                        self._flights.pop(key, None)
+                for _, _, flight in leading:
+                    flight.event.set()
+
+        for topic, flight in waiting:
+            VIDEO_CACHE_REQUESTS.inc(result='coalesced')
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            results[topic] = flight.value
+
+        # Duplicate spellings of the same topic share one result
+        for topic in topics:
+            if topic not in results:
+                results[topic] = results[keys_seen[normalize_topic(topic)]]
+        return results
+
+    def invalidate(self, topic: Optional[str] = None):
+        """Drop one topic, or everything when topic is None."""
+        with self._lock:
+            if topic is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(normalize_topic(topic), None)
+        if self.db_path:
+            with self._connect() as conn:
+                if topic is None:
+                    conn.execute("DELETE FROM video_cache")
+                else:
+                    conn.execute("DELETE FROM video_cache WHERE topic = ?", (normalize_topic(topic),))
+
+    def _refresh_in_background(self, key: str, topic: str, fetch_many: Callable[[List[str]], Dict[str, Any]]):
+        with self._lock:
+            if key in self._refreshing or key in self._flights:
+                return
+            self._refreshing.add(key)
+            flight = self._flights[key] = _Flight()
+
+        def refresh():
+            try:
+                flight.value = fetch_many([topic]).get(topic, [])
+                if flight.value:
+                    self._store(key, flight.value)
+            except Exception as e:
+                flight.error = e
+                print(f"⚠️ Background video refresh for '{key}' failed: {e}")
+            finally:
+                with self._lock:
+                    self._flights.pop(key, None)
+                    self._refreshing.discard(key)
+                flight.event.set()
+
+        threading.Thread(target=refresh, name=f"video-refresh-{key[:20]}", daemon=True).start()
+
+    def _lookup(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        if not self.db_path:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT videos, fetched_at FROM video_cache WHERE topic = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ Video cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+
+        entry = (json.loads(row[0]), row[1])
+        self._remember(key, entry)
+        return entry
+
+    def _store(self, key: str, value):
+        entry = (value, self._clock())
+        self._remember(key, entry)
+        if self.db_path:
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO video_cache (topic, videos, fetched_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value, ensure_ascii=False), entry[1])
+                    )
+            except sqlite3.Error as e:
+                print(f"⚠️ Video cache write failed: {e}")
+
+    def _remember(self, key: str, entry: Tuple[Any, float]):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection that commits on success and always closes."""
+        conn = sqlite3.connect(str(self.db_path), timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS video_cache ("
+                "topic TEXT PRIMARY KEY, videos TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
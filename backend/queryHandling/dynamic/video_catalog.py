@@ -0,0 +1,131 @@
+"""
+Precomputed video catalog for graph topics
+
+Every topic and subtopic in graph_data.json is a known learning step, so their
+videos are fetched ahead of time by build_video_catalog.py and stored in a
+SQLite file. At request time the chat handler reads the catalog from memory
+with no network calls; live YouTube search is only used for dynamic queries
+and for nodes the catalog does not cover yet.
+
+The catalog reloads itself when the file changes on disk (checked at most
+every check_interval seconds), so a refresh run is picked up without a restart.
+Readers open the file read-only; a missing file means "no catalog yet" and is
+only created by the build job's first upsert.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from video_cache import normalize_topic
+
+DEFAULT_CATALOG_PATH = Path(__file__).parent / "video_catalog.sqlite3"
+
+
+class VideoCatalog:
+    """Read/write access to the node -> videos catalog."""
+
+    def __init__(self, db_path=DEFAULT_CATALOG_PATH, check_interval: float = 30.0):
+        self.db_path = Path(db_path)
+        self.check_interval = check_interval
+
+        self._by_name: Dict[str, List[Dict]] = {}
+        self._fetched_at: Dict[str, float] = {}
+        self._file_signature = None
+        self._last_check = 0.0
+        self._schema_ready = False
+        self._lock = threading.Lock()
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._fetched_at)
+
+    def get_videos(self, name: str) -> Optional[List[Dict]]:
+        """Videos for a node name, or None when the node is not in the catalog."""
+        self._maybe_reload()
+        videos = self._by_name.get(normalize_topic(name))
+        return [dict(video) for video in videos] if videos is not None else None
+
+    def fetched_at(self, node_id: str) -> Optional[float]:
+        return self._fetched_at.get(node_id)
+
+    def upsert(self, node_id: str, name: str, videos: List[Dict], fetched_at: Optional[float] = None):
+        """Store videos for a node (used by the build job)."""
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        with self._connect() as conn:
+            if not self._schema_ready:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS video_catalog ("
+                    "node_id TEXT PRIMARY KEY, name TEXT NOT NULL, videos TEXT NOT NULL, fetched_at REAL NOT NULL)"
+                )
+                self._schema_ready = True
+            conn.execute(
+                "INSERT OR REPLACE INTO video_catalog (node_id, name, videos, fetched_at) VALUES (?, ?, ?, ?)",
+                (node_id, name, json.dumps(videos, ensure_ascii=False), fetched_at)
+            )
+        with self._lock:
+            self._by_name[normalize_topic(name)] = videos
+            self._fetched_at[node_id] = fetched_at
+
+    def stale_nodes(self, nodes: Iterable[Dict], max_age: float) -> List[Dict]:
+        """Nodes that are missing from the catalog or older than max_age seconds."""
+        cutoff = time.time() - max_age
+        return [node for node in nodes if self._fetched_at.get(node['id'], 0.0) < cutoff]
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        if self._signature() != self._file_signature:
+            self._load()
+
+    def _signature(self):
+        try:
+            stat = os.stat(self.db_path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def _load(self):
+        by_name: Dict[str, List[Dict]] = {}
+        fetched_at: Dict[str, float] = {}
+        rows = []
+        if self.db_path.exists():
+            try:
+                with self._connect(read_only=True) as conn:
+                    rows = conn.execute("SELECT node_id, name, videos, fetched_at FROM video_catalog").fetchall()
+            except (sqlite3.Error, OSError) as e:
+                print(f"⚠️ Could not load video catalog {self.db_path}: {e}")
+
+        for node_id, name, videos, node_fetched_at in rows:
+            key = normalize_topic(name)
+            videos = json.loads(videos)
+            # Several subtopics share a name; keep the first non-empty entry
+            if key not in by_name or (videos and not by_name[key]):
+                by_name[key] = videos
+            fetched_at[node_id] = node_fetched_at
+
+        with self._lock:
+            self._by_name = by_name
+            self._fetched_at = fetched_at
+            self._file_signature = self._signature()
+
+    @contextmanager
+    def _connect(self, read_only: bool = False):
+        if read_only:
+            conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True, timeout=5)
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
@@ -0,0 +1,190 @@
+"""
+YouTube Data API quota budget
+
+The API allows 10,000 units per day (reset at midnight Pacific time); a
+search.list call costs 100 units and a videos.list call costs 1. QuotaBudget
+tracks units spent per call type, persists them to a small JSON file so a
+restart does not forget the day's usage, and paces spending: at any point of
+the day only the pro-rata share of the budget plus a burst allowance may be
+used. Calls over budget are refused, and the finder falls back to cached or
+precomputed videos instead of exhausting the quota before the evening.
+
+Server workers and the catalog build job share the state file: every spend or
+refund re-reads and rewrites it under an exclusive fcntl lock, so concurrent
+processes never lose each other's units.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, spends are only serialized within a process
+    fcntl = None
+
+from monitoring.metrics import Counter, Gauge
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+except Exception:
+    # No tz database available: Pacific standard time is close enough
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+UNIT_COSTS = {'search': 100, 'videos': 1}
+
+YOUTUBE_QUOTA_USED = Gauge(
+    "youtube_quota_used_units",
+    "YouTube Data API units spent today by call type",
+    ["operation"]
+)
+YOUTUBE_QUOTA_REMAINING = Gauge(
+    "youtube_quota_remaining_units",
+    "YouTube Data API units left in today's budget"
+)
+YOUTUBE_QUOTA_DENIED = Counter(
+    "youtube_quota_denied_total",
+    "YouTube calls refused by the quota budget",
+    ["operation", "reason"]
+)
+
+
+class QuotaBudget:
+    """Daily unit budget with persistence and pro-rata pacing."""
+
+    def __init__(self, daily_limit: int = 10000, state_path=None, burst_fraction: float = 0.1,
+                 now: Callable[[], datetime] = None):
+        self.daily_limit = daily_limit
+        self.state_path = Path(state_path) if state_path else None
+        self.burst_fraction = burst_fraction
+        self._now = now or (lambda: datetime.now(QUOTA_TIMEZONE))
+
+        self._day = self._today()
+        self._used: Dict[str, int] = {operation: 0 for operation in UNIT_COSTS}
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def used(self) -> int:
+        self._roll_day()
+        return sum(self._used.values())
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.daily_limit - self.used)
+
+    def used_by(self, operation: str) -> int:
+        self._roll_day()
+        return self._used.get(operation, 0)
+
+    def paced_allowance(self) -> float:
+        """Units that may have been spent by now: the elapsed share of the day plus a burst."""
+        now = self._now()
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        elapsed = (now - midnight).total_seconds() / 86400.0
+        return min(self.daily_limit, self.daily_limit * (elapsed + self.burst_fraction))
+
+    def try_spend(self, operation: str, paced: bool = True) -> bool:
+        """Reserve the units for one call; False if it would overrun the budget."""
+        cost = UNIT_COSTS[operation]
+        with self._lock, self._state_file_lock():
+            self._roll_day_locked()
+            self._load_locked()
+            used = sum(self._used.values())
+            if used + cost > self.daily_limit:
+                YOUTUBE_QUOTA_DENIED.inc(operation=operation, reason='exhausted')
+                return False
+            if paced and used + cost > self.paced_allowance():
+                YOUTUBE_QUOTA_DENIED.inc(operation=operation, reason='paced')
+                return False
+            self._used[operation] = self._used.get(operation, 0) + cost
+            self._save()
+        return True
+
+    def refund(self, operation: str):
+        """Give back units reserved for a call that was never sent."""
+        with self._lock, self._state_file_lock():
+            self._roll_day_locked()
+            self._load_locked()
+            self._used[operation] = max(0, self._used.get(operation, 0) - UNIT_COSTS[operation])
+            self._save()
+
+    def _today(self) -> str:
+        return self._now().date().isoformat()
+
+    def _roll_day(self):
+        with self._lock:
+            self._roll_day_locked()
+
+    def _roll_day_locked(self):
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._used = {operation: 0 for operation in UNIT_COSTS}
+
+    @contextmanager
+    def _state_file_lock(self):
+        """Hold the cross-process lock on the state file for a read-modify-write."""
+        if not self.state_path or fcntl is None:
+            yield
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path.with_name(self.state_path.name + ".lock"), 'a') as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _load(self):
+        with self._lock:
+            self._load_locked()
+
+    def _load_locked(self):
+        if not self.state_path or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('day') == self._day:
+                self._used.update({operation: int(units) for operation, units in state.get('used', {}).items()})
+        except Exception as e:
+            print(f"⚠️ Could not load YouTube quota state: {e}")
+
+    def _save(self):
+        if not self.state_path:
+            return
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'day': self._day, 'used': self._used}, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            print(f"⚠️ Could not save YouTube quota state: {e}")
+
+
+_budget: Optional[QuotaBudget] = None
+_budget_lock = threading.Lock()
+
+
+def get_quota_budget() -> QuotaBudget:
+    """Process-wide budget configured from YOUTUBE_DAILY_QUOTA, YOUTUBE_QUOTA_BURST and YOUTUBE_QUOTA_STATE."""
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            _budget = QuotaBudget(
+                daily_limit=int(os.getenv("YOUTUBE_DAILY_QUOTA", 10000)),
+                state_path=os.getenv("YOUTUBE_QUOTA_STATE", str(Path(__file__).parent / "youtube_quota.json")) or None,
+                burst_fraction=float(os.getenv("YOUTUBE_QUOTA_BURST", 0.1))
+            )
+            for operation in UNIT_COSTS:
+                YOUTUBE_QUOTA_USED.set_function(lambda operation=operation: _budget.used_by(operation),
+                                                operation=operation)
+            YOUTUBE_QUOTA_REMAINING.set_function(lambda: _budget.remaining)
+        return _budget
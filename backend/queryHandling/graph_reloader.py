@@ -0,0 +1,181 @@
+"""
+Hot reload of the learning graph
+
+The chat handler used to build one RealGraphLearningAnalyzer at startup, so a
+new graph_data.json (e.g. after a scraper run) needed a server restart.
+GraphReloader owns the current analyzer and replaces it without downtime:
+
+- reload() builds a complete new analyzer off to the side (which maps or
+  compiles the graph snapshot) and then swaps a single reference, so readers
+  see either the old graph or the new one, never a mix
+- a request that pins the analyzer (pinned()) keeps using the one it started
+  with even if a swap happens mid-request; the old analyzer is freed once the
+  last such request finishes
+- a watcher thread polls the graph file's size/mtime and reloads in the
+  background; reload_async() does the same on demand (admin endpoint)
+- listeners run after each swap with (old_version, new_version), which is
+  where caches keyed by graph version are dropped
+
+A build that fails or yields an empty graph leaves the current analyzer in place.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from monitoring.metrics import Counter, Gauge
+
+GRAPH_RELOADS = Counter(
+    "graph_reloads_total",
+    "Graph hot reload attempts (swapped, unchanged, failed)",
+    ["outcome"]
+)
+GRAPH_LAST_SWAP = Gauge(
+    "graph_last_swap_timestamp_seconds",
+    "Unix time the current graph analyzer was swapped in"
+)
+
+
+class GraphReloader:
+    """Holds the current graph analyzer and swaps in rebuilt ones atomically."""
+
+    def __init__(self, graph_file: str, build: Callable[[str], Any], check_interval: float = 5.0,
+                 stamp: Optional[Callable[[str], Dict[str, int]]] = None):
+        """
+        Args:
+            graph_file: Path to graph_data.json.
+            build: Creates an analyzer for a graph file (RealGraphLearningAnalyzer).
+            check_interval: Seconds between stat() checks of graph_file by the watcher.
+            stamp: Returns the file's current {'size', 'mtime_ns'}; compared with the loaded analyzer's graph_source.
+        """
+        self.graph_file = graph_file
+        self.build = build
+        self.check_interval = check_interval
+        self.stamp = stamp
+
+        self._current = build(graph_file)
+        # Stamp of the file content currently loaded, and of the last content that failed to build
+        self._loaded_stamp = getattr(self._current, 'graph_source', None)
+        self._failed_stamp = None
+        self._local = threading.local()
+        self._listeners: List[Callable[[Optional[str], Optional[str]], None]] = []
+        self._reload_lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._reload_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+        self.swapped_at = time.time()
+        self.last_error: Optional[str] = None
+        GRAPH_LAST_SWAP.set_function(lambda: self.swapped_at)
+
+    @property
+    def analyzer(self):
+        """The analyzer pinned by the current request, else the latest one."""
+        pinned = getattr(self._local, 'analyzer', None)
+        return pinned if pinned is not None else self._current
+
+    @property
+    def version(self) -> Optional[str]:
+        return getattr(self._current, 'graph_version', None)
+
+    @contextmanager
+    def pinned(self):
+        """Use one analyzer for the whole block, even if a reload swaps in a new one meanwhile."""
+        outer = getattr(self._local, 'analyzer', None)
+        self._local.analyzer = outer if outer is not None else self._current
+        try:
+            yield self._local.analyzer
+        finally:
+            self._local.analyzer = outer
+
+    def add_listener(self, listener: Callable[[Optional[str], Optional[str]], None]):
+        """Call listener(old_version, new_version) after every swap."""
+        self._listeners.append(listener)
+
+    def reload(self) -> bool:
+        """Build a new analyzer from graph_file and swap it in. Returns True if the graph changed."""
+        with self._reload_lock:
+            attempted = self._read_stamp()
+            try:
+                candidate = self.build(self.graph_file)
+            except Exception as e:
+                return self._failed(attempted, f"build failed: {e}")
+
+            new_version = getattr(candidate, 'graph_version', None)
+            if new_version is None or not getattr(candidate, 'all_id_to_data', None):
+                return self._failed(attempted, "new graph is missing or empty")
+
+            old_version = self.version
+            self._loaded_stamp = getattr(candidate, 'graph_source', None) or attempted
+            if new_version == old_version:
+                # Same content (e.g. the file was only touched)
+                GRAPH_RELOADS.inc(outcome='unchanged')
+                return False
+
+            self._current = candidate
+            self.swapped_at = time.time()
+            self.last_error = None
+            GRAPH_RELOADS.inc(outcome='swapped')
+            print(f"🔄 Graph reloaded: {old_version} → {new_version}")
+
+        for listener in self._listeners:
+            try:
+                listener(old_version, new_version)
+            except Exception as e:
+                print(f"⚠️ Graph reload listener failed: {e}")
+        return True
+
+    def reload_async(self) -> bool:
+        """Start reload() in a background thread. Returns False if one is already running."""
+        with self._thread_lock:
+            if self._reload_thread is not None and self._reload_thread.is_alive():
+                return False
+            self._reload_thread = threading.Thread(target=self.reload, name="graph-reload", daemon=True)
+            self._reload_thread.start()
+            return True
+
+    def changed_on_disk(self) -> bool:
+        """True if graph_file differs from the loaded graph and from the last version that failed to build."""
+        stamp = self._read_stamp()
+        return stamp is not None and stamp != self._loaded_stamp and stamp != self._failed_stamp
+
+    def start_watcher(self):
+        """Poll graph_file every check_interval seconds and reload when it changes."""
+        if self._watcher is not None or self.stamp is None or self.check_interval <= 0:
+            return
+        self._watcher = threading.Thread(target=self._watch, name="graph-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self) -> Dict:
+        running = self._reload_thread is not None and self._reload_thread.is_alive()
+        return {
+            'graph_version': self.version,
+            'swapped_at': self.swapped_at,
+            'reloading': running,
+            'last_error': self.last_error
+        }
+
+    def _watch(self):
+        while not self._stop.wait(self.check_interval):
+            if self.changed_on_disk():
+                self.reload()
+
+    def _read_stamp(self) -> Optional[Dict[str, int]]:
+        if self.stamp is None:
+            return None
+        try:
+            return self.stamp(self.graph_file)
+        except OSError:
+            return None
+
+    def _failed(self, stamp: Optional[Dict[str, int]], reason: str) -> bool:
+        self._failed_stamp = stamp
+        self.last_error = reason
+        GRAPH_RELOADS.inc(outcome='failed')
+        print(f"⚠️ Graph reload skipped, keeping version {self.version}: {reason}")
+        return False
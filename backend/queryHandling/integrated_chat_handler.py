@@ -11,12 +11,16 @@ This system:
 6. Tracks user progress and learning sessions in MongoDB
 """
 
+import contextlib
 import json
 import os
 import sys
 import requests
+import tempfile
+import threading
 import time
 import traceback
+from dataclasses import asdict
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime, timezone
@@ -28,9 +32,27 @@ sys.path.append(str(current_dir / "static" / "graph"))
 sys.path.append(str(current_dir / "dynamic"))
 sys.path.append(str(current_dir.parent))  # Add backend directory
 
+from intent_matcher import IntentMatcher
+from speculative_prefetch import SpeculativePrefetcher
+from graph_reloader import GraphReloader
+from semantic_cache import SemanticResponseCache, load_minilm_embedder
+from monitoring.metrics import (
+    CHAT_REQUEST_DURATION,
+    CHAT_STAGE_DURATION
+)
+from workers.persistence_queue import PersistenceQueue
+from clients.admission import AdmissionRejected, get_admission_controller
+from clients.http import is_transient_error
+from clients.llm_backends import TUTOR_SYSTEM_PROMPT, get_backend
+from clients.resilience import CircuitBreaker, CircuitOpenError, HedgeExecutor, LatencyTracker, hedged_call
+
 try:
     from real_graph_analyzer import RealGraphLearningAnalyzer
+    from graph_snapshot import source_stamp
+    from gap_analysis_cache import GapAnalysisCache
+    from explanation_store import ExplanationStore
     from groq_dsa_yt import YouTubeResourceFinder
+    from video_catalog import VideoCatalog
     from database.models import user_model, chat_history_model, learning_session_model
 except ImportError as e:
     print(f"Import error: {e}")
@@ -41,13 +63,21 @@ except ImportError as e:
         sys.path.append(str(current_dir / "dynamic"))
         sys.path.append(str(current_dir.parent))
         from real_graph_analyzer import RealGraphLearningAnalyzer
+        from graph_snapshot import source_stamp
+        from gap_analysis_cache import GapAnalysisCache
+        from explanation_store import ExplanationStore
         from groq_dsa_yt import YouTubeResourceFinder
+        from video_catalog import VideoCatalog
         from database.models import user_model, chat_history_model, learning_session_model
     except ImportError as e2:
         print(f"Alternative import error: {e2}")
         print("Please ensure real_graph_analyzer.py, groq_dsa_yt.py, and database models are in the correct locations")
         RealGraphLearningAnalyzer = None
+        source_stamp = None
+        GapAnalysisCache = None
+        ExplanationStore = None
         YouTubeResourceFinder = None
+        VideoCatalog = None
         user_model = None
         chat_history_model = None
         learning_session_model = None
@@ -62,20 +92,52 @@ class IntegratedChatHandler:
         self.learning_sessions_path = current_dir / "learning_sessions.json"
         self.frontend_public_path = current_dir / "frontend" / "public"
         
-        # Initialize learning sessions storage
+        # Initialize learning sessions storage (shared by request threads)
         self.learning_sessions = self.load_learning_sessions()
+        self.learning_sessions_lock = threading.RLock()
+        
+        # Compiled matcher for learning-flow intents (phrases in learning_intents.json)
+        self.intent_matcher = IntentMatcher.from_file(current_dir / "learning_intents.json")
         
         # Initialize components
         try:
+            # The analyzer is swapped without a restart when graph_data.json changes (see graph_reloader.py)
             if RealGraphLearningAnalyzer is not None:
-                self.graph_analyzer = RealGraphLearningAnalyzer(str(self.graph_data_path))
+                self.graph_reloader = GraphReloader(
+                    str(self.graph_data_path),
+                    RealGraphLearningAnalyzer,
+                    check_interval=float(os.getenv('GRAPH_RELOAD_INTERVAL_SECONDS', '5')),
+                    stamp=source_stamp
+                )
+            else:
+                self.graph_reloader = None
+            
+            # Memoized path/gap results shared by students with the same known concepts
+            if GapAnalysisCache is not None:
+                self.gap_cache = GapAnalysisCache()
             else:
-                self.graph_analyzer = None
+                self.gap_cache = None
+            
+            # Pre-generated node explanations (filled by build_explanations.py)
+            if ExplanationStore is not None:
+                self.explanation_store = ExplanationStore(
+                    os.getenv('NODE_EXPLANATIONS_PATH', str(current_dir / "static" / "graph" / "node_explanations.json"))
+                )
+            else:
+                self.explanation_store = None
             
             if YouTubeResourceFinder is not None:
                 self.youtube_finder = YouTubeResourceFinder()
             else:
                 self.youtube_finder = None
+            
+            # Precomputed videos for graph nodes (filled by build_video_catalog.py)
+            if VideoCatalog is not None:
+                self.video_catalog = VideoCatalog(
+                    os.getenv('VIDEO_CATALOG_DB', str(current_dir / "dynamic" / "video_catalog.sqlite3"))
+                )
+            else:
+                self.video_catalog = None
                 
             # MongoDB models
             self.user_model = user_model
@@ -84,12 +146,83 @@ class IntegratedChatHandler:
             
         except Exception as e:
             print(f"Error initializing components: {e}")
-            self.graph_analyzer = None
+            self.graph_reloader = None
+            self.gap_cache = None
+            self.explanation_store = None
             self.youtube_finder = None
+            self.video_catalog = None
             self.user_model = None
             self.chat_history_model = None
             self.learning_session_model = None
         
+        # LLM provider (groq by default; 'stub' or GROQ_BASE_URL pointing at the stub server for load tests)
+        self.llm = get_backend(os.getenv('LLM_PROVIDER', 'groq'))
+
+        # Fail fast to the fallback response while Groq is erroring or slow; a 4xx for
+        # one bad prompt says nothing about Groq's health, so it does not count
+        self.groq_breaker = CircuitBreaker(
+            'groq',
+            failure_threshold=int(os.getenv('GROQ_BREAKER_FAILURES', '3')),
+            slow_call_threshold=float(os.getenv('GROQ_SLOW_CALL_SECONDS', '3')),
+            reset_timeout=float(os.getenv('GROQ_BREAKER_RESET_SECONDS', '30')),
+            is_failure=is_transient_error
+        )
+        # Per-call timeout follows the observed p95, between these bounds
+        self.groq_timeout = float(os.getenv('GROQ_TIMEOUT_SECONDS', '5'))
+        self.groq_min_timeout = float(os.getenv('GROQ_MIN_TIMEOUT_SECONDS', '1'))
+        self.groq_latency = LatencyTracker()
+        self.groq_hedging = os.getenv('GROQ_HEDGE_REQUESTS', 'false').lower() in ('1', 'true', 'yes')
+        self.groq_max_hedge_delay = float(os.getenv('GROQ_HEDGE_MAX_DELAY_SECONDS', '0.3'))
+        self.groq_hedge_executor = HedgeExecutor(int(os.getenv('GROQ_HEDGE_WORKERS', '8')), name='groq-hedge')
+        self.groq_admission = get_admission_controller('groq')
+        
+        # Answer paraphrased questions asked in the same context without calling Groq
+        cache_enabled = os.getenv('SEMANTIC_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+        self.response_cache = SemanticResponseCache(
+            load_minilm_embedder() if cache_enabled else None,
+            threshold=float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.92')),
+            ttl=float(os.getenv('SEMANTIC_CACHE_TTL_SECONDS', '3600')),
+            max_entries=int(os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', '5000'))
+        )
+        
+        # Precompute the next learning-path steps while the student reads the current one
+        self.prefetcher = SpeculativePrefetcher(
+            self._build_step_content,
+            depth=int(os.getenv('PREFETCH_DEPTH', '2')),
+            max_per_hour=int(os.getenv('PREFETCH_MAX_PER_HOUR', '120')),
+            skip=lambda: self.groq_breaker.state != CircuitBreaker.CLOSED or self.groq_admission.waiting > 0
+        )
+        
+        # Post-response writes run off the request path, spooled so they survive a crash
+        spool_path = os.getenv('PERSISTENCE_SPOOL_PATH', str(current_dir / "persistence_spool.jsonl"))
+        self.persistence_queue = PersistenceQueue(spool_path)
+        self.persistence_queue.register('save_chat_turn', self._persist_chat_turn)
+        self.persistence_queue.register('update_user_statistics', self._persist_user_statistics)
+        self.persistence_queue.register('log_unknown_query', self.log_unknown_query)
+        # Learning-session updates are written synchronously now; this drains jobs spooled before that
+        self.persistence_queue.register('update_learning_session', self.update_learning_session)
+        self.persistence_queue.start()
+        
+        # Caches built from the old graph are dropped whenever a new one is swapped in
+        if self.graph_reloader is not None:
+            self.graph_reloader.add_listener(self._on_graph_swapped)
+            self.graph_reloader.start_watcher()
+        
+    @property
+    def graph_analyzer(self):
+        """Graph analyzer for the current request (pinned for its whole duration by handle_chat_message)."""
+        return self.graph_reloader.analyzer if self.graph_reloader is not None else None
+    
+    def _graph_version(self) -> Optional[str]:
+        """Version of the graph this request is pinned to (keys prefetched steps)."""
+        return getattr(self.graph_analyzer, 'graph_version', None)
+    
+    def _on_graph_swapped(self, old_version: Optional[str], new_version: Optional[str]):
+        """Invalidate everything derived from the previous graph version."""
+        if self.gap_cache is not None:
+            self.gap_cache.invalidate()
+        self.prefetcher.clear()
+    
     def load_user_profile(self, user_id: str) -> Optional[Dict]:
         """Load user profile from MongoDB. Returns None if user doesn't exist."""
         try:
@@ -334,18 +467,13 @@ class IntegratedChatHandler:
                 user_subtopics = set([sub['name'].lower() for sub in topic_data.get('subtopics', [])])
                 
                 # Find this topic in the graph
-                topic_node = None
-                for node in self.graph_analyzer.graph_data.get('nodes', []):
-                    if node['type'] == 'topic' and node['name'].lower() == topic_name.lower():
-                        topic_node = node
-                        break
+                topic_node = self._find_graph_topic(topic_name)
                 
                 if topic_node:
                     # Get all subtopics for this topic from the graph
                     required_subtopics = set()
-                    for node in self.graph_analyzer.graph_data.get('nodes', []):
-                        if (node['type'] == 'subtopic' and 
-                            node.get('parent_topic') == topic_node['id']):
+                    for node in self.graph_analyzer.subtopics:
+                        if node.get('parent_topic') == topic_node['id']:
                             required_subtopics.add(node['name'].lower())
                     
                     # Check if user knows all required subtopics
@@ -392,92 +520,18 @@ class IntegratedChatHandler:
             'is_graph_topic': len(mentioned_topics) > 0 or len(mentioned_subtopics) > 0
         }
     
+    def _find_graph_topic(self, topic_name: str) -> Optional[Dict]:
+        """Graph topic node with this name (case-insensitive), via the analyzer's name index."""
+        topic_id = self.graph_analyzer.topic_name_to_id.get(topic_name.lower())
+        return self.graph_analyzer.all_id_to_data.get(topic_id) if topic_id is not None else None
+    
     def detect_learning_intents(self, query: str, chat_history: List[Dict]) -> Dict:
-        """Detect user intents related to learning flow progression."""
-        intents = {
-            'wants_next_topic': False,
-            'confirms_understanding': False,
-            'needs_more_explanation': False,
-            'wants_to_complete_topic': False,
-            'satisfied_with_topic': False,
-            'wants_confirmation': False,
-            'says_no_need_help': False
-        }
-        
-        # Intent patterns
-        next_topic_patterns = [
-            'next topic', 'next step', 'what\'s next', 'continue', 'move on', 'proceed',
-            'go to next', 'advance', 'ready for next', 'next lesson'
-        ]
-        
-        understanding_patterns = [
-            'yes', 'got it', 'understand', 'clear', 'makes sense', 'i know', 'learned',
-            'understood', 'ok', 'okay', 'right', 'correct', 'good', 'thanks',
-            'i understand this topic', 'i get it'
-        ]
-        
-        more_explanation_patterns = [
-            'no', 'don\'t understand', 'confused', 'explain more', 'not clear', 
-            'can you explain', 'i don\'t get it', 'more details', 'elaborate',
-            'need help', 'still confused', 'more examples', 'i need more explanation'
-        ]
+        """Detect user intents related to learning flow progression.
         
-        completion_patterns = [
-            'i\'m done', 'completed', 'finished', 'mastered', 'ready to move on',
-            'i know this now', 'learned this', 'understand this topic'
-        ]
-        
-        satisfaction_patterns = [
-            'satisfied', 'good enough', 'ready', 'confident', 'comfortable',
-            'i am satisfied', 'add to profile', 'add to my profile',
-            'i am satisfied with this topic', 'ready to add it to my profile'
-        ]
-        
-        confirmation_patterns = [
-            'yes', 'yeah', 'yep', 'sure', 'of course', 'definitely', 'absolutely'
-        ]
-        
-        no_help_patterns = [
-            'no', 'nope', 'not really', 'i\'m good', 'no thanks', 'no need'
-        ]
-        
-        # Check patterns
-        for pattern in next_topic_patterns:
-            if pattern in query:
-                intents['wants_next_topic'] = True
-                break
-                
-        for pattern in understanding_patterns:
-            if pattern in query:
-                intents['confirms_understanding'] = True
-                break
-                
-        for pattern in more_explanation_patterns:
-            if pattern in query:
-                intents['needs_more_explanation'] = True
-                break
-                
-        for pattern in completion_patterns:
-            if pattern in query:
-                intents['wants_to_complete_topic'] = True
-                break
-                
-        for pattern in satisfaction_patterns:
-            if pattern in query:
-                intents['satisfied_with_topic'] = True
-                break
-        
-        for pattern in confirmation_patterns:
-            if pattern in query:
-                intents['wants_confirmation'] = True
-                break
-        
-        for pattern in no_help_patterns:
-            if pattern in query:
-                intents['says_no_need_help'] = True
-                break
-        
-        return intents
+        All intents are found in one scan by the compiled intent matcher;
+        phrases live in learning_intents.json and only match whole words.
+        """
+        return self.intent_matcher.detect(query)
     
     def find_learning_gaps(self, query_analysis: Dict, user_profile: Dict) -> Dict:
         """Use graph analyzer to find learning gaps and suggest learning paths."""
@@ -515,30 +569,20 @@ class IntegratedChatHandler:
                 
                 # Use the real graph analyzer methods
                 try:
-                    # Find optimal learning path using the graph analyzer
-                    if hasattr(self.graph_analyzer, 'find_optimal_learning_path'):
-                        learning_path_result = self.graph_analyzer.find_optimal_learning_path(
-                            completed_topics=known_concept_ids,
-                            target_topic=target_id
-                        )
-                        # Extract path from result
-                        learning_path = learning_path_result.get('path', []) if isinstance(learning_path_result, dict) else []
-                    else:
-                        learning_path = []
-                    
-                    # Find gaps using subtopic analysis
-                    if hasattr(self.graph_analyzer, 'analyze_subtopic_learning_gaps'):
-                        gaps_result = self.graph_analyzer.analyze_subtopic_learning_gaps(
-                            completed_subtopics=known_concept_ids,
-                            target_topic_id=target_id
-                        )
-                        # Extract gaps from result
-                        if isinstance(gaps_result, dict):
-                            gaps = gaps_result.get('missing_prerequisites', []) + gaps_result.get('recommended_subtopics', [])
+                    # Popular targets are answered from the gap cache when possible
+                    with CHAT_STAGE_DURATION.time(stage='graph_path'):
+                        if self.gap_cache is not None:
+                            graph_result = self.gap_cache.get_or_compute(
+                                known_concept_ids,
+                                target_id,
+                                self._graph_version(),
+                                lambda: self._compute_graph_gap_analysis(known_concept_ids, target_id)
+                            )
                         else:
-                            gaps = []
-                    else:
-                        gaps = []
+                            graph_result = self._compute_graph_gap_analysis(known_concept_ids, target_id)
+                    
+                    learning_path = graph_result['learning_path']
+                    gaps = graph_result['gaps']
                     
                     # Convert IDs back to names for frontend display
                     gap_names = []
@@ -607,19 +651,42 @@ class IntegratedChatHandler:
             print(f"Error in gap analysis: {e}")
             return {'gaps': [], 'suggestions': [], 'learning_path': []}
     
+    def _compute_graph_gap_analysis(self, known_concept_ids: List[str], target_id: str) -> Dict:
+        """Run the graph searches for one (known concepts, target) pair."""
+        # Find optimal learning path using the graph analyzer
+        if hasattr(self.graph_analyzer, 'find_optimal_learning_path'):
+            learning_path_result = self.graph_analyzer.find_optimal_learning_path(
+                completed_topics=known_concept_ids,
+                target_topic=target_id
+            )
+            # Extract path from result
+            learning_path = learning_path_result.get('path', []) if isinstance(learning_path_result, dict) else []
+        else:
+            learning_path = []
+        
+        # Find gaps using subtopic analysis
+        if hasattr(self.graph_analyzer, 'analyze_subtopic_learning_gaps'):
+            gaps_result = self.graph_analyzer.analyze_subtopic_learning_gaps(
+                completed_subtopics=known_concept_ids,
+                target_topic_id=target_id
+            )
+            # Extract gaps from result
+            if isinstance(gaps_result, dict):
+                gaps = gaps_result.get('missing_prerequisites', []) + gaps_result.get('recommended_subtopics', [])
+            else:
+                gaps = []
+        else:
+            gaps = []
+        
+        return {'learning_path': learning_path, 'gaps': gaps}
+    
     def generate_mistral_response(self, query: str, context: Dict) -> str:
-        """Generate response using Groq AI API instead of local Ollama."""
+        """Generate response through the configured LLM provider (Groq by default)."""
         try:
             # Handle small talk with direct responses
             if context.get('is_small_talk'):
                 return self.generate_fallback_response(query, context)
             
-            # Prepare context for Groq for DSA queries
-            system_prompt = """You are an expert DSA (Data Structures and Algorithms) tutor. 
-            Provide clear, concise explanations of concepts, include code examples when helpful, 
-            and give practical learning advice. Keep responses focused and educational.
-            Always be encouraging and supportive."""
-            
             user_context = ""
             if context.get('target_topic'):
                 topic = context['target_topic']
@@ -641,48 +708,40 @@ class IntegratedChatHandler:
             
             prompt = f"{query}\n\nContext:{user_context}"
             
-            # Get Groq API key from environment
-            groq_api_key = os.getenv("GROQ_API_KEY")
-            if not groq_api_key:
-                print("❌ GROQ_API_KEY not found in environment variables")
+            # The prompt lists only the first few gaps and known concepts; key the cache on all of
+            # them so students with different progress never get each other's tailored answers
+            cache_context = "\n".join([
+                user_context,
+                "gaps: " + " | ".join(sorted(set(context.get('gaps') or []))),
+                "known: " + " | ".join(sorted(set(context.get('known_concepts') or [])))
+            ])
+            cached_response = self.response_cache.get(query, cache_context)
+            if cached_response is not None:
+                return cached_response
+            
+            if not self.llm.configured:
+                print(f"❌ LLM provider '{self.llm.name}' is not configured (is GROQ_API_KEY set?)")
                 return self.generate_fallback_response(query, context)
             
-            # Use Groq API
-            headers = {
-                "Authorization": f"Bearer {groq_api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": "mistral-saba-24b",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.3,
-                "max_tokens": 4096,
-                "top_p": 0.9
-            }
-            
-            response = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"].strip()
-            else:
-                print(f"Groq API error: {response.status_code} - {response.text}")
-                return self.generate_fallback_response(query, context)
+            with CHAT_STAGE_DURATION.time(stage='llm') as llm_timer:
+                try:
+                    with self.groq_admission.slot():
+                        response_text = self.groq_breaker.call(self._call_llm, prompt)
+                except AdmissionRejected as e:
+                    llm_timer.outcome = 'shed'
+                    print(f"⏳ LLM call shed by admission control ({e.reason}), using fallback response")
+                    return self.generate_fallback_response(query, context)
+                except CircuitOpenError:
+                    llm_timer.outcome = 'circuit_open'
+                    print("⚡ LLM circuit open, using fallback response")
+                    return self.generate_fallback_response(query, context)
+                except requests.exceptions.HTTPError as e:
+                    llm_timer.outcome = 'http_error'
+                    print(e)
+                    return self.generate_fallback_response(query, context)
+            
+            self.response_cache.put(query, cache_context, response_text)
+            return response_text
                 
         except requests.exceptions.ConnectionError:
             print("Error: Could not connect to Groq API server.")
@@ -692,6 +751,23 @@ class IntegratedChatHandler:
             traceback.print_exc()
             return self.generate_fallback_response(query, context)
     
+    def _call_llm(self, prompt: str) -> str:
+        """Call the LLM provider with a p95-derived timeout, hedging after the p95 if enabled."""
+        p95 = self.groq_latency.percentile(0.95) if len(self.groq_latency) >= 20 else None
+        timeout = self.groq_timeout if p95 is None else min(self.groq_timeout, max(self.groq_min_timeout, 2 * p95))
+        
+        def call():
+            start = time.perf_counter()
+            text = self.llm.generate(prompt, TUTOR_SYSTEM_PROMPT, timeout=timeout)
+            self.groq_latency.record(time.perf_counter() - start)
+            return text
+        
+        if self.groq_hedging and p95 is not None:
+            hedge_delay = min(max(p95, 0.05), self.groq_max_hedge_delay)
+            return hedged_call(call, hedge_delay, name=self.llm.name,
+                               executor=self.groq_hedge_executor, timeout=timeout)
+        return call()
+    
     def generate_fallback_response(self, query: str, context: Dict) -> str:
         """Generate a comprehensive fallback response when Mistral API is not available."""
         response_parts = []
@@ -787,8 +863,9 @@ class IntegratedChatHandler:
         return "\n\n".join(response_parts)
     
     def get_video_recommendations(self, query: str, context: Dict) -> List[Dict]:
-        """Get YouTube video recommendations using the existing YouTube finder."""
-        if not self.youtube_finder:
+        """Get video recommendations: graph topics from the precomputed catalog,
+        everything else from live YouTube search."""
+        if not self.youtube_finder and not self.video_catalog:
             return []
         
         try:
@@ -815,22 +892,41 @@ class IntegratedChatHandler:
                 if not search_terms:
                     search_terms = [query]
             
-            # Get videos for each search term
+            terms = search_terms[:2]
+            videos_by_term = {}
+            
+            # Graph topics are served from the catalog with no network calls
+            if self.video_catalog and not context.get('dynamic_query'):
+                for term in terms:
+                    catalog_videos = self.video_catalog.get_videos(term)
+                    if catalog_videos:
+                        videos_by_term[term] = catalog_videos
+            
+            # Remaining terms: concurrent searches, one batched details call
+            live_terms = [term for term in terms if term not in videos_by_term]
+            if live_terms and self.youtube_finder:
+                with CHAT_STAGE_DURATION.time(stage='youtube'):
+                    for term, videos in self.youtube_finder.get_videos_for_topics(live_terms).items():
+                        videos_by_term[term] = [asdict(video) for video in videos]
+            
             all_videos = []
-            for term in search_terms[:2]:  # Limit to 2 terms to avoid too many API calls
-                videos = self.youtube_finder.get_videos(term)
-                all_videos.extend(videos)
+            seen_urls = set()
+            for term in terms:
+                for video in videos_by_term.get(term, []):
+                    if video['url'] not in seen_urls:
+                        seen_urls.add(video['url'])
+                        all_videos.append(video)
             
             # Convert to the format expected by the frontend
             formatted_videos = []
             for video in all_videos[:5]:  # Limit to 5 videos total
                 formatted_videos.append({
-                    'title': video.title,
-                    'url': video.url,
-                    'description': video.description or f"Learn about {video.title}",
-                    'channel': video.channel_name,
-                    'duration': video.duration,
-                    'views': video.view_count
+                    'title': video['title'],
+                    'url': video['url'],
+                    'description': video['description'] or f"Learn about {video['title']}",
+                    'channel': video['channel_name'],
+                    'duration': video['duration'],
+                    'views': video['view_count']
                 })
             
             return formatted_videos
@@ -840,28 +936,44 @@ class IntegratedChatHandler:
             return []
     
     def log_unknown_query(self, query: str, timestamp: str):
-        """Log queries that don't match anything in the graph for future analysis."""
-        try:
-            # Load existing log or create new one
-            if self.unknown_queries_log.exists():
-                with open(self.unknown_queries_log, 'r', encoding='utf-8') as f:
-                    log_data = json.load(f)
-            else:
-                log_data = {'queries': []}
-            
-            # Add new query
-            log_data['queries'].append({
-                'query': query,
-                'timestamp': timestamp,
-                'processed': False
-            })
-            
-            # Save updated log
-            with open(self.unknown_queries_log, 'w', encoding='utf-8') as f:
-                json.dump(log_data, f, indent=2, ensure_ascii=False)
-                
-        except Exception as e:
-            print(f"Error logging unknown query: {e}")
+        """Background task: log a query that matched nothing in the graph, raising so the queue retries."""
+        # Load existing log or create new one
+        if self.unknown_queries_log.exists():
+            with open(self.unknown_queries_log, 'r', encoding='utf-8') as f:
+                log_data = json.load(f)
+        else:
+            log_data = {'queries': []}
+        
+        # Add new query
+        log_data['queries'].append({
+            'query': query,
+            'timestamp': timestamp,
+            'processed': False
+        })
+        
+        # Save updated log
+        with open(self.unknown_queries_log, 'w', encoding='utf-8') as f:
+            json.dump(log_data, f, indent=2, ensure_ascii=False)
+    
+    def _persist_chat_turn(self, user_id: str, message: str, response: str, analysis: Dict):
+        """Background task: save a chat turn to MongoDB, raising so the queue retries."""
+        if not self.chat_history_model:
+            return
+        if not self.chat_history_model.save_chat_message(user_id=user_id, message=message,
+                                                          response=response, analysis=analysis):
+            raise RuntimeError(f"chat message for user {user_id} was not saved")
+    
+    def _persist_user_statistics(self, user_id: str, last_active: str, total_queries: Optional[int] = None):
+        """Background task: count a chat turn in the user's statistics.
+
+        Database errors propagate so the queue retries; a user MongoDB does not know
+        (e.g. a local default profile) is skipped. total_queries only appears in jobs
+        spooled by older versions and is ignored in favour of an increment.
+        """
+        if not self.user_model:
+            return
+        if not self.user_model.record_user_query(user_id, datetime.fromisoformat(last_active)):
+            print(f"⚠️ No stored user {user_id}; statistics not updated")
     
     def load_learning_sessions(self) -> Dict:
         """Load learning sessions from file."""
@@ -875,26 +987,35 @@ class IntegratedChatHandler:
             return {}
     
     def save_learning_sessions(self):
-        """Save learning sessions to file."""
+        """Save learning sessions to file, atomically so a crash never leaves it half-written."""
         try:
-            with open(self.learning_sessions_path, 'w', encoding='utf-8') as f:
-                json.dump(self.learning_sessions, f, indent=2, ensure_ascii=False)
+            with self.learning_sessions_lock:
+                fd, tmp_name = tempfile.mkstemp(dir=self.learning_sessions_path.parent,
+                                                prefix=self.learning_sessions_path.name + ".", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(self.learning_sessions, f, indent=2, ensure_ascii=False)
+                    os.replace(tmp_name, self.learning_sessions_path)
+                except BaseException:
+                    os.unlink(tmp_name)
+                    raise
         except Exception as e:
             print(f"Error saving learning sessions: {e}")
     
     def get_learning_session(self, user_id: str) -> Dict:
         """Get or create learning session for user."""
-        if user_id not in self.learning_sessions:
-            self.learning_sessions[user_id] = {
-                'current_path': [],
-                'completed_topics': [],
-                'current_step_index': 0,
-                'target_topic': None,
-                'session_started': datetime.now().isoformat(),
-                'last_updated': datetime.now().isoformat()
-            }
-            self.save_learning_sessions()
-        return self.learning_sessions[user_id]
+        with self.learning_sessions_lock:
+            if user_id not in self.learning_sessions:
+                self.learning_sessions[user_id] = {
+                    'current_path': [],
+                    'completed_topics': [],
+                    'current_step_index': 0,
+                    'target_topic': None,
+                    'session_started': datetime.now().isoformat(),
+                    'last_updated': datetime.now().isoformat()
+                }
+                self.save_learning_sessions()
+            return self.learning_sessions[user_id]
     
     def update_learning_session(self, user_id: str, updates: Dict):
         """Update learning session for user with MongoDB integration."""
@@ -903,19 +1024,14 @@ class IntegratedChatHandler:
                 # Update in MongoDB
                 session = self.learning_session_model.get_active_session(user_id)
                 if session:
-                    updates['updated_at'] = datetime.now()
-                    self.learning_session_model.update_session_progress(session['_id'], updates)
+                    self.learning_session_model.update_session_progress(
+                        session['_id'], {**updates, 'updated_at': datetime.now()})
                     return
-            
-            # Fallback to local storage
-            session = self.get_learning_session(user_id)
-            session.update(updates)
-            session['last_updated'] = datetime.now().isoformat()
-            self.save_learning_sessions()
-            
         except Exception as e:
             print(f"Error updating learning session: {e}")
-            # Fallback to local storage
+        
+        # Fallback to local storage
+        with self.learning_sessions_lock:
             session = self.get_learning_session(user_id)
             session.update(updates)
             session['last_updated'] = datetime.now().isoformat()
@@ -927,7 +1043,10 @@ class IntegratedChatHandler:
             if self.learning_session_model:
                 # Get session from MongoDB
                 session = self.learning_session_model.get_active_session(user_id)
-                if session and session.get('current_path') and session.get('current_step_index', 0) < len(session['current_path']):
+                if session is None:
+                    # No MongoDB session: update_learning_session kept the path locally
+                    return self._complete_local_topic(user_id)
+                if session.get('current_path') and session.get('current_step_index', 0) < len(session['current_path']):
                     completed_topic = session['current_path'][session['current_step_index']]
                     
                     # Update session in MongoDB
@@ -946,21 +1065,16 @@ class IntegratedChatHandler:
                 return False
             
             # Fallback to local storage
-            session = self.get_learning_session(user_id)
-            if session['current_path'] and session['current_step_index'] < len(session['current_path']):
-                completed_topic = session['current_path'][session['current_step_index']]
-                session['completed_topics'].append({
-                    'topic': completed_topic,
-                    'completed_at': datetime.now().isoformat()
-                })
-                session['current_step_index'] += 1
-                self.save_learning_sessions()
-                return True
-            return False
+            return self._complete_local_topic(user_id)
             
         except Exception as e:
             print(f"Error completing current topic: {e}")
             # Fallback to local storage
+            return self._complete_local_topic(user_id)
+    
+    def _complete_local_topic(self, user_id: str) -> bool:
+        """Advance the locally stored learning session past its current topic."""
+        with self.learning_sessions_lock:
             session = self.get_learning_session(user_id)
             if session['current_path'] and session['current_step_index'] < len(session['current_path']):
                 completed_topic = session['current_path'][session['current_step_index']]
@@ -1019,16 +1133,14 @@ class IntegratedChatHandler:
             if topic_name.lower() not in existing_topics:
                 # Find topic details from graph
                 topic_data = None
-                if self.graph_analyzer:
-                    for node in self.graph_analyzer.graph_data.get('nodes', []):
-                        if node['type'] == 'topic' and node['name'].lower() == topic_name.lower():
-                            topic_data = {
-                                'id': node['id'],
-                                'name': node['name'],
-                                'type': 'topic',
-                                'subtopics': []  # Start with empty subtopics
-                            }
-                            break
+                node = self._find_graph_topic(topic_name) if self.graph_analyzer else None
+                if node:
+                    topic_data = {
+                        'id': node['id'],
+                        'name': node['name'],
+                        'type': 'topic',
+                        'subtopics': []  # Start with empty subtopics
+                    }
                 
                 if topic_data:
                     user_profile['knownConcepts']['topics'].append(topic_data)
@@ -1117,49 +1229,67 @@ class IntegratedChatHandler:
     
     def handle_chat_message(self, message: str, chat_history: List[Dict] = None, user_id: str = "default") -> Dict:
         """Main handler for chat messages with learning flow support and MongoDB integration."""
+        with CHAT_REQUEST_DURATION.time() as request_timer, self._pin_graph():
+            response_data = self._handle_chat_message(message, chat_history, user_id)
+            if response_data.get('analysis', {}).get('error'):
+                request_timer.outcome = 'error'
+            return response_data
+    
+    def _pin_graph(self):
+        """Keep one graph version for a whole request, even if a reload lands mid-request."""
+        return self.graph_reloader.pinned() if self.graph_reloader is not None else contextlib.nullcontext()
+    
+    def _handle_chat_message(self, message: str, chat_history: List[Dict], user_id: str) -> Dict:
+        """Run the chat pipeline, timing each stage for the metrics endpoint."""
         timestamp = datetime.now().isoformat()
         
         try:
             # Load user profile from MongoDB
-            user_profile = self.load_user_profile(user_id)
-            if not user_profile:
-                # Create a default user profile if none exists
-                user_profile = self.create_default_user_profile(user_id)
+            with CHAT_STAGE_DURATION.time(stage='profile_load'):
+                user_profile = self.load_user_profile(user_id)
                 if not user_profile:
-                    return {
-                        'response': "I couldn't create your user profile. Please try again later.",
-                        'videos': [],
-                        'analysis': {'error': 'Failed to create user profile'}
-                    }
+                    # Create a default user profile if none exists
+                    user_profile = self.create_default_user_profile(user_id)
+            if not user_profile:
+                return {
+                    'response': "I couldn't create your user profile. Please try again later.",
+                    'videos': [],
+                    'analysis': {'error': 'Failed to create user profile'}
+                }
             
             # Get or create learning session
-            learning_session = self.get_or_create_learning_session(user_id)
+            with CHAT_STAGE_DURATION.time(stage='session_load'):
+                learning_session = self.get_or_create_learning_session(user_id)
             
             # Get recent chat context from MongoDB if chat_history is not provided
             if not chat_history and self.chat_history_model:
-                chat_history = self.chat_history_model.get_recent_context(user_id, limit=5)
+                with CHAT_STAGE_DURATION.time(stage='history_load'):
+                    chat_history = self.chat_history_model.get_recent_context(user_id, limit=5)
             
             # Analyze the query with chat history context
-            query_analysis = self.analyze_user_query(message, user_profile, chat_history or [])
+            with CHAT_STAGE_DURATION.time(stage='analysis'):
+                query_analysis = self.analyze_user_query(message, user_profile, chat_history or [])
             
             # Generate response
-            response_data = self._process_query_analysis(message, user_id, user_profile, learning_session, query_analysis, chat_history or [])
-            
-            # Save chat message to MongoDB
-            if self.chat_history_model:
-                self.chat_history_model.save_chat_message(
+            with CHAT_STAGE_DURATION.time(stage='respond'):
+                response_data = self._process_query_analysis(message, user_id, user_profile, learning_session, query_analysis, chat_history or [])
+            
+            with CHAT_STAGE_DURATION.time(stage='persistence'):
+                # Queue the chat turn and user statistics; written after the response is sent
+                self.persistence_queue.enqueue(
+                    'save_chat_turn',
+                    ordering_key=user_id,
                     user_id=user_id,
                     message=message,
                     response=response_data['response'],
                     analysis=response_data.get('analysis', {})
                 )
-            
-            # Update user statistics
-            if self.user_model:
-                self.user_model.update_user(user_id, {
-                    'statistics.total_queries': user_profile['statistics']['total_queries'] + 1,
-                    'statistics.last_active': datetime.now()
-                })
+                self.persistence_queue.enqueue(
+                    'update_user_statistics',
+                    ordering_key=user_id,
+                    user_id=user_id,
+                    last_active=datetime.now().isoformat()
+                )
             
             return response_data
             
@@ -1211,11 +1341,14 @@ class IntegratedChatHandler:
             # Update learning session with new path
             learning_path = gap_analysis.get('learning_path', [])
             if learning_path:
+                # Written before replying: the user's next "next topic" turn reads it back
                 self.update_learning_session(user_id, {
                     'current_path': learning_path,
                     'current_step_index': 0,
                     'target_topic': gap_analysis.get('target_topic', {}).get('name')
                 })
+                # "Next topic" is the most likely reply; get its content ready
+                self.prefetcher.schedule(user_id, learning_path, 0, self._graph_version())
 
             # Identify the next step (first not-yet-known node in the path)
             known_concepts = set(gap_analysis.get('known_concepts', []))
@@ -1235,7 +1368,7 @@ class IntegratedChatHandler:
             }
 
             # Generate explanation and videos for the next step
-            next_step_explanation = self.generate_mistral_response(next_step or message, next_step_context) if next_step else None
+            next_step_explanation = self.explain_graph_topic(next_step, next_step_context) if next_step else None
             next_step_videos = self.get_video_recommendations(next_step or message, next_step_context) if next_step else []
 
             # Generate concise overall response - focus on the topic and path
@@ -1269,7 +1402,7 @@ class IntegratedChatHandler:
         
         else:
             # Dynamic handling for topics not in our graph
-            self.log_unknown_query(message, datetime.now().isoformat())
+            self.persistence_queue.enqueue('log_unknown_query', query=message, timestamp=datetime.now().isoformat())
             
             # Use Mistral to generate response without graph context
             context = {
@@ -1314,16 +1447,13 @@ class IntegratedChatHandler:
             if new_index < len(current_path):
                 next_topic = current_path[new_index]
                 
-                # Generate explanation for next topic
-                context = {
-                    'target_topic': {'name': next_topic},
-                    'learning_path': current_path,
-                    'current_progress': f"{new_index + 1}/{len(current_path)}",
-                    'is_small_talk': False
-                }
+                # Use the prefetched explanation and videos if available, else generate them now
+                step_content = self._serve_step_content(user_id, next_topic, new_index, current_path, query_analysis)
+                explanation = step_content['explanation']
+                videos = step_content['videos']
                 
-                explanation = self.generate_mistral_response(f"Explain {next_topic} in detail", context)
-                videos = self.get_video_recommendations(next_topic, context)
+                # Start on the steps after this one
+                self.prefetcher.schedule(user_id, current_path, new_index, self._graph_version())
                 
                 response = f"🎉 Great! You've completed **{completed_topic}**!\n\n"
                 response += f"🎯 **Next Topic: {next_topic}** (Step {new_index + 1}/{len(current_path)})\n\n"
@@ -1361,6 +1491,66 @@ class IntegratedChatHandler:
             'analysis': {'progress_error': True}
         }
     
+    def _build_step_content(self, topic: str, step_index: int, path: List[str],
+                            known_concepts: Optional[List[str]] = None) -> Dict:
+        """Explanation and videos for a learning-path step (shared by live and prefetched replies).
+        
+        Stored explanations are returned unpersonalized ('stored': True) so prefetched content
+        can be personalized with the student's known concepts when it is served."""
+        context = {
+            'target_topic': {'name': topic},
+            'learning_path': path,
+            'current_progress': f"{step_index + 1}/{len(path)}",
+            'known_concepts': known_concepts or [],
+            'is_small_talk': False
+        }
+        stored = self.explanation_store.get(topic) if self.explanation_store else None
+        return {
+            'explanation': stored or self.generate_mistral_response(f"Explain {topic} in detail", context),
+            'stored': bool(stored),
+            'videos': self.get_video_recommendations(topic, context)
+        }
+    
+    def _serve_step_content(self, user_id: str, topic: str, step_index: int, path: List[str],
+                            query_analysis: Dict) -> Dict:
+        """Prefetched or freshly built step content, personalized for the student being served."""
+        known_concepts = list(dict.fromkeys(
+            query_analysis.get('truly_known_topics', []) + query_analysis.get('known_subtopics', [])
+        ))
+        step_content = self.prefetcher.take(user_id, topic, path, self._graph_version())
+        if step_content is None:
+            step_content = self._build_step_content(topic, step_index, path, known_concepts)
+        if step_content.get('stored'):
+            context = {'learning_path': path, 'known_concepts': known_concepts}
+            step_content = {**step_content,
+                            'explanation': self._personalize_explanation(topic, step_content['explanation'], context)}
+        return step_content
+    
+    def explain_graph_topic(self, topic: str, context: Dict, prompt: Optional[str] = None) -> str:
+        """Serve the pre-generated explanation for a graph node, falling back to a live LLM call."""
+        stored = self.explanation_store.get(topic) if self.explanation_store else None
+        if not stored:
+            return self.generate_mistral_response(prompt or topic, context)
+        return self._personalize_explanation(topic, stored, context)
+    
+    def _personalize_explanation(self, topic: str, explanation: str, context: Dict) -> str:
+        """Wrap a stored explanation with the student's path position and known concepts."""
+        intro = []
+        learning_path = context.get('learning_path') or []
+        if topic in learning_path:
+            step_number = learning_path.index(topic) + 1
+            intro.append(f"📍 Step {step_number} of {len(learning_path)} in your path: **{topic}**")
+            if step_number > 1:
+                intro.append(f"This builds on {learning_path[step_number - 2]}.")
+        
+        known_concepts = [concept for concept in context.get('known_concepts', []) if concept != topic]
+        if known_concepts:
+            intro.append(f"Since you already know {', '.join(known_concepts[:3])}, we can focus on what's new here.")
+        
+        if not intro:
+            return explanation
+        return "\n".join(intro) + "\n\n" + explanation
+    
     def handle_more_explanation_request(self, message: str, learning_session: Dict, query_analysis: Dict, chat_history: List[Dict]) -> Dict:
         """Handle user request for more explanation when they don't understand."""
         current_path = learning_session.get('current_path', [])
@@ -1517,16 +1707,12 @@ class IntegratedChatHandler:
                     response += f"🎯 **Next Topic: {next_topic}** (Step {new_index + 1}/{len(current_path)})\n\n"
                     response += "Ready to continue with the next topic? Let me know when you want to proceed!"
                     
-                    # Generate explanation for next topic
-                    context = {
-                        'target_topic': {'name': next_topic},
-                        'learning_path': current_path,
-                        'current_progress': f"{new_index + 1}/{len(current_path)}",
-                        'is_small_talk': False
-                    }
+                    # Use the prefetched explanation and videos if available, else generate them now
+                    step_content = self._serve_step_content(user_id, next_topic, new_index, current_path, query_analysis)
+                    explanation = step_content['explanation']
+                    videos = step_content['videos']
                     
-                    explanation = self.generate_mistral_response(f"Explain {next_topic} in detail", context)
-                    videos = self.get_video_recommendations(next_topic, context)
+                    self.prefetcher.schedule(user_id, current_path, new_index, self._graph_version())
                     
                     return {
                         'response': response,
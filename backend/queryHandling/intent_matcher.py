@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+One-pass multi-pattern intent matcher for learning-flow intents
+
+Phrases are loaded from learning_intents.json (intent name -> list of phrases)
+and compiled into a single Aho-Corasick automaton over word tokens. A query is
+tokenized once and scanned once, and every intent whose phrase occurs in the
+query as whole words is reported. Matching on tokens instead of characters
+means "no" no longer fires on "know" and "ok" no longer fires on "book".
+
+Cost per query is linear in the number of query tokens plus matches, so adding
+hundreds of phrases (including Hinglish ones) does not slow detection down.
+"""
+
+import json
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Set
+
+DEFAULT_INTENTS_FILE = Path(__file__).parent / "learning_intents.json"
+
+# Apostrophes stay inside tokens so "don't" and "what's" are single words
+TOKEN_PATTERN = re.compile(r"[\w']+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower().replace("’", "'"))
+
+
+class IntentMatcher:
+    """Aho-Corasick automaton over word tokens mapping phrases to intents."""
+
+    def __init__(self, intent_patterns: Dict[str, Iterable[str]]):
+        self.intent_names = list(intent_patterns.keys())
+
+        # Node 0 is the root; each node has goto transitions, a failure link
+        # and the set of intents completed at that node
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Set[str]] = [set()]
+        self.phrase_count = 0
+
+        for intent, phrases in intent_patterns.items():
+            for phrase in phrases:
+                tokens = tokenize(phrase)
+                if tokens:
+                    self._add_phrase(tokens, intent)
+                    self.phrase_count += 1
+
+        self._build_failure_links()
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_INTENTS_FILE) -> "IntentMatcher":
+        """Build a matcher from a JSON file of {intent: [phrases]}."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _add_phrase(self, tokens: List[str], intent: str):
+        node = 0
+        for token in tokens:
+            next_node = self._goto[node].get(token)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][token] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+            node = next_node
+        self._output[node].add(intent)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[child] = target if target != child else 0
+
+                # Suffix phrases ending here are matches too
+                self._output[child] |= self._output[self._fail[child]]
+
+    def match(self, text: str) -> Set[str]:
+        """Return every intent triggered by the text in a single scan."""
+        matched: Set[str] = set()
+        node = 0
+        for token in tokenize(text):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            if self._output[node]:
+                matched |= self._output[node]
+        return matched
+
+    def detect(self, text: str) -> Dict[str, bool]:
+        """Return a flag for every known intent, True when it was triggered."""
+        matched = self.match(text)
+        return {intent: intent in matched for intent in self.intent_names}
@@ -0,0 +1,180 @@
+"""
+Semantic cache for tutor LLM responses
+
+Many questions are paraphrases of each other ("what is a stack", "explain
+stack data structure"). The cache embeds each query with the MiniLM model
+shared with DSATopicValidator (sentence_model.get_sentence_model) and returns a stored answer when a previous query was
+similar enough (cosine similarity >= threshold) *and* was asked with the same
+user context (target topic, gaps, path, known concepts), since the answer is
+tailored to that context.
+
+Nearest neighbours come from an in-memory random-hyperplane LSH index: each
+vector is hashed into one bucket per table, buckets are partitioned by context,
+and only the candidates sharing a bucket are scored exactly. Entries older
+than ttl seconds are dropped when they come up as candidates, and the least
+recently used ones are evicted beyond max_entries.
+
+sentence_transformers is optional; without it (or if the model cannot be
+loaded) the cache is disabled and every lookup is a miss.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from monitoring.metrics import Counter, Gauge
+
+from sentence_model import DEFAULT_MODEL_NAME, get_sentence_model
+
+SEMANTIC_CACHE_REQUESTS = Counter(
+    "semantic_cache_requests_total",
+    "Semantic LLM response cache lookups (hit, miss, disabled)",
+    ["result"]
+)
+SEMANTIC_CACHE_ENTRIES = Gauge(
+    "semantic_cache_entries",
+    "Responses held in the semantic LLM response cache"
+)
+SEMANTIC_CACHE_HIT_RATIO = Gauge(
+    "semantic_cache_hit_ratio",
+    "Fraction of semantic cache lookups served from the cache since start"
+)
+
+
+def load_minilm_embedder(model_name: str = DEFAULT_MODEL_NAME) -> Optional[Callable[[str], np.ndarray]]:
+    """Embedding function backed by the shared SentenceTransformer, or None if unavailable."""
+    model = get_sentence_model(model_name)
+    if model is None:
+        print("Warning: Semantic response cache disabled (no sentence encoder).")
+        return None
+    return lambda text: model.encode([text])[0]
+
+
+class _LSHIndex:
+    """Random-hyperplane LSH over unit vectors; candidates are exact-scored by the caller."""
+
+    def __init__(self, dim: int, num_tables: int = 8, num_bits: int = 10, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((num_tables, num_bits, dim)).astype(np.float32)
+        self.weights = 1 << np.arange(num_bits)
+        self.buckets: Dict[Tuple[str, int, int], set] = {}
+
+    def signatures(self, vector: np.ndarray) -> List[int]:
+        bits = (self.planes @ vector) > 0
+        return [int(code) for code in bits.astype(np.int64) @ self.weights]
+
+    def add(self, entry_id: int, partition: str, signatures: Sequence[int]):
+        for table, code in enumerate(signatures):
+            self.buckets.setdefault((partition, table, code), set()).add(entry_id)
+
+    def remove(self, entry_id: int, partition: str, signatures: Sequence[int]):
+        for table, code in enumerate(signatures):
+            bucket = self.buckets.get((partition, table, code))
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self.buckets[(partition, table, code)]
+
+    def candidates(self, partition: str, signatures: Sequence[int]) -> set:
+        found = set()
+        for table, code in enumerate(signatures):
+            found.update(self.buckets.get((partition, table, code), ()))
+        return found
+
+
+class SemanticResponseCache:
+    """Context-scoped nearest-neighbour cache of LLM responses."""
+
+    def __init__(self, embed: Optional[Callable[[str], np.ndarray]], threshold: float = 0.92,
+                 ttl: float = 3600.0, max_entries: int = 5000, clock: Callable[[], float] = time.monotonic):
+        self.embed = embed
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+
+        # entry_id -> (partition, vector, signatures, response, created_at)
+        self._entries: "OrderedDict[int, Tuple[str, np.ndarray, List[int], str, float]]" = OrderedDict()
+        self._index: Optional[_LSHIndex] = None
+        self._next_id = 0
+        self._hits = 0
+        self._lookups = 0
+        self._lock = threading.Lock()
+
+        SEMANTIC_CACHE_ENTRIES.set_function(lambda: len(self._entries))
+        SEMANTIC_CACHE_HIT_RATIO.set_function(lambda: self._hits / self._lookups if self._lookups else 0.0)
+
+    @property
+    def enabled(self) -> bool:
+        return self.embed is not None and self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def context_key(context: str) -> str:
+        return hashlib.sha256(context.encode('utf-8')).hexdigest()[:16]
+
+    def get(self, query: str, context: str) -> Optional[str]:
+        """Cached response for a similar query asked in the same context, or None."""
+        if not self.enabled:
+            SEMANTIC_CACHE_REQUESTS.inc(result='disabled')
+            return None
+
+        vector = self._embed(query)
+        partition = self.context_key(context)
+        with self._lock:
+            self._lookups += 1
+            best_id, best_score = None, self.threshold
+            cutoff = self.clock() - self.ttl
+            if self._index is not None:
+                for entry_id in self._index.candidates(partition, self._index.signatures(vector)):
+                    if self._entries[entry_id][4] < cutoff:
+                        self._remove_locked(entry_id)
+                        continue
+                    score = float(self._entries[entry_id][1] @ vector)
+                    if score >= best_score:
+                        best_id, best_score = entry_id, score
+            if best_id is None:
+                SEMANTIC_CACHE_REQUESTS.inc(result='miss')
+                return None
+            self._hits += 1
+            self._entries.move_to_end(best_id)
+            response = self._entries[best_id][3]
+        SEMANTIC_CACHE_REQUESTS.inc(result='hit')
+        return response
+
+    def put(self, query: str, context: str, response: str):
+        if not self.enabled or not response:
+            return
+
+        vector = self._embed(query)
+        partition = self.context_key(context)
+        with self._lock:
+            if self._index is None:
+                self._index = _LSHIndex(len(vector))
+            signatures = self._index.signatures(vector)
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (partition, vector, signatures, response, self.clock())
+            self._index.add(entry_id, partition, signatures)
+            while len(self._entries) > self.max_entries:
+                self._remove_locked(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._index = None
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embed(" ".join(text.lower().split())), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _remove_locked(self, entry_id: int):
+        partition, _, signatures, _, _ = self._entries.pop(entry_id)
+        self._index.remove(entry_id, partition, signatures)
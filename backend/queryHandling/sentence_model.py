@@ -0,0 +1,39 @@
+"""
+Process-wide MiniLM sentence encoder
+
+DSATopicValidator and the semantic response cache embed text with the same
+all-MiniLM-L6-v2 model. Loading it costs about 90 MB per process, so both get
+the single instance returned by get_sentence_model().
+
+sentence_transformers is optional; without it (or if the model cannot be
+loaded) get_sentence_model() returns None and callers disable their semantic
+features.
+"""
+
+import threading
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def get_sentence_model(model_name: str = DEFAULT_MODEL_NAME):
+    """Return the shared SentenceTransformer for model_name, loading it on first use (None if unavailable)."""
+    with _models_lock:
+        if model_name not in _models:
+            if SentenceTransformer is None:
+                print("Warning: sentence_transformers not installed. Semantic similarity disabled.")
+                _models[model_name] = None
+            else:
+                try:
+                    _models[model_name] = SentenceTransformer(model_name)
+                except Exception as e:
+                    print(f"Warning: Could not load sentence transformer ({e}). Semantic similarity disabled.")
+                    _models[model_name] = None
+        return _models[model_name]
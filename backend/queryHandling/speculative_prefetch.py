@@ -0,0 +1,134 @@
+"""
+Speculative prefetch of upcoming learning-path steps
+
+Once a learning path is shown, most students reply "next topic" or "I
+understand". The prefetcher computes the explanation and videos for the next
+one or two steps in the background and keeps them in a per-user cache, so that
+reply can be served without waiting on Groq and YouTube. If the student asks
+while a prefetch is still running, the request waits for it instead of
+starting the same work twice.
+
+Speculative work is capped: at most max_per_hour step computations across the
+process, and nothing is scheduled while the skip() predicate says the
+providers are busy.
+
+Entries are keyed by graph version as well as user, topic and path, so a
+request still pinned to the previous graph cannot schedule content that a
+request on the reloaded graph would then be served.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from monitoring.metrics import Counter
+
+PREFETCH_EVENTS = Counter(
+    "prefetch_events_total",
+    "Speculative prefetch events (scheduled, hit, miss, skipped_budget, skipped_busy, failed)",
+    ["event"]
+)
+
+StepKey = Tuple[str, Optional[str], str, Tuple[str, ...]]
+
+
+class SpeculativePrefetcher:
+    """Per-user cache of precomputed next-step content."""
+
+    def __init__(self, compute: Callable[[str, int, List[str]], Dict], depth: int = 2,
+                 max_per_hour: int = 120, ttl: float = 1800.0, max_entries: int = 2000,
+                 wait_timeout: float = 30.0, workers: int = 2,
+                 skip: Optional[Callable[[], bool]] = None):
+        self.compute = compute
+        self.depth = depth
+        self.max_per_hour = max_per_hour
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.wait_timeout = wait_timeout
+        self.skip = skip
+
+        self._entries: "OrderedDict[StepKey, Tuple[float, Future]]" = OrderedDict()
+        self._spend = deque()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+
+    def schedule(self, user_id: str, path: List[str], current_index: int, graph_version: Optional[str] = None):
+        """Prefetch the steps after current_index (up to depth of them)."""
+        if self.depth <= 0 or not path:
+            return
+
+        for step_index in range(current_index + 1, min(len(path), current_index + 1 + self.depth)):
+            key = self._key(user_id, graph_version, path[step_index], path)
+            with self._lock:
+                self._expire_locked()
+                if key in self._entries:
+                    continue
+                if self.skip and self.skip():
+                    PREFETCH_EVENTS.inc(event='skipped_busy')
+                    return
+                if not self._take_budget_locked():
+                    PREFETCH_EVENTS.inc(event='skipped_budget')
+                    return
+                future = self._executor.submit(self._run, path[step_index], step_index, list(path))
+                self._entries[key] = (time.monotonic(), future)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            PREFETCH_EVENTS.inc(event='scheduled')
+
+    def take(self, user_id: str, topic: str, path: List[str], graph_version: Optional[str] = None) -> Optional[Dict]:
+        """Return (and remove) prefetched content for a step, waiting if it is still running."""
+        key = self._key(user_id, graph_version, topic, path)
+        with self._lock:
+            self._expire_locked()
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            PREFETCH_EVENTS.inc(event='miss')
+            return None
+
+        try:
+            result = entry[1].result(timeout=self.wait_timeout)
+        except Exception:
+            result = None
+        PREFETCH_EVENTS.inc(event='hit' if result is not None else 'miss')
+        return result
+
+    def clear(self):
+        """Drop every prefetched step (e.g. after the graph they were built from changed)."""
+        with self._lock:
+            self._entries.clear()
+
+    def clear_user(self, user_id: str):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def _run(self, topic: str, step_index: int, path: List[str]) -> Optional[Dict]:
+        try:
+            return self.compute(topic, step_index, path)
+        except Exception as e:
+            PREFETCH_EVENTS.inc(event='failed')
+            print(f"⚠️ Prefetch for '{topic}' failed: {e}")
+            return None
+
+    def _take_budget_locked(self) -> bool:
+        now = time.monotonic()
+        while self._spend and now - self._spend[0] > 3600:
+            self._spend.popleft()
+        if len(self._spend) >= self.max_per_hour:
+            return False
+        self._spend.append(now)
+        return True
+
+    def _expire_locked(self):
+        cutoff = time.monotonic() - self.ttl
+        while self._entries:
+            key, (created_at, _) = next(iter(self._entries.items()))
+            if created_at >= cutoff:
+                break
+            del self._entries[key]
+
+    @staticmethod
+    def _key(user_id: str, graph_version: Optional[str], topic: str, path: List[str]) -> StepKey:
+        return (user_id, graph_version, topic, tuple(path))
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Batch gap analysis for a cohort of users against many targets
+
+RealGraphLearningAnalyzer answers one (user, target) pair per call, which is
+far too slow for instructor dashboards covering thousands of students.
+CohortGapAnalyzer answers every pair at once with matrix operations:
+
+- known: users x nodes sparse matrix of what each user has completed
+- implied knowledge: known @ closure matrix (PrerequisiteClosure.matrix()),
+  since knowing a node implies knowing everything it depends on
+- missing prerequisites per target: the target's closure columns a user
+  does not know
+- next steps: unknown candidates (the target, its prerequisites and its
+  subtopics) whose direct prerequisites are all known, from one sparse
+  product with the prerequisite adjacency
+
+Only the columns of the requested targets are ever materialized densely, so
+the work grows with users x (target neighbourhood), not users x graph size.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from scipy.sparse import csr_array
+
+from csr_graph import CSRGraph
+from prerequisite_closure import PREREQUISITE_EDGE_TYPES, PrerequisiteClosure
+
+
+class CohortGapAnalyzer:
+    """Vectorized gap analysis for many users over one graph version."""
+
+    def __init__(self, csr: CSRGraph, closure: PrerequisiteClosure):
+        self.csr = csr
+        self.closure = closure
+
+        # prerequisites[v, p] = 1 when p is a direct prerequisite/sequence predecessor of v
+        self.prerequisites = csr.typed_matrix({name: 1.0 for name in PREREQUISITE_EDGE_TYPES}, reverse=True)
+        self.contains_code = csr.edge_type_codes.get('contains')
+
+    def known_matrix(self, users: Sequence[Iterable[str]],
+                     resolve: Optional[Callable[[str], Optional[str]]] = None) -> csr_array:
+        """users x nodes matrix of what each user knows.
+
+        Entries are node IDs, or anything resolve() maps to a node ID (e.g. names);
+        each distinct entry is resolved once, and unknown ones are skipped.
+        """
+        flat = [concept for concepts in users for concept in concepts]
+        rows = np.repeat(np.arange(len(users), dtype=np.int32), [len(concepts) for concepts in users])
+        index: Dict[str, int] = {}
+        for concept in {concept for concept in flat if isinstance(concept, str)}:
+            node_id = resolve(concept) if resolve is not None else concept
+            column = self.csr.index.get(node_id) if node_id is not None else None
+            if column is not None:
+                index[concept] = column
+        columns = np.array([index.get(concept, -1) if isinstance(concept, str) else -1 for concept in flat],
+                           dtype=np.int64)
+        found = columns >= 0
+        matrix = csr_array((np.ones(int(found.sum()), dtype=np.int8), (rows[found], columns[found])),
+                           shape=(len(users), len(self.csr)))
+        matrix.sum_duplicates()
+        return matrix
+
+    def analyze(self, known: csr_array, targets: Sequence[str]) -> Dict[str, Dict]:
+        """Gap analysis of every user (row of known) against every target node ID.
+
+        Returns {target_id: {...}} with, per target, node ID lists for the column
+        groups ('prerequisites' in learning order, 'subtopics', 'candidates') and
+        per-user arrays: 'readiness' (% of prerequisites known), 'completion'
+        (% of the target's subtopics known), 'missing' and 'next_steps'
+        (users x len(prerequisites) / len(candidates) boolean matrices).
+        """
+        targets = [target for target in dict.fromkeys(targets) if target in self.csr]
+        groups = {}
+        for target in targets:
+            i = self.csr.index[target]
+            prerequisites = [node_id for node_id in self.closure.closure(target) if node_id != target]
+            subtopics = []
+            if self.contains_code is not None:
+                start, end = self.csr.out_indptr[i], self.csr.out_indptr[i + 1]
+                children = self.csr.out_indices[start:end][self.csr.out_types[start:end] == self.contains_code]
+                subtopics = [self.csr.node_ids[k] for k in children]
+            groups[target] = (prerequisites, subtopics)
+
+        # One dense column per candidate node or direct prerequisite of one, in rank order
+        candidate_ids = {node_id for target, (prerequisites, subtopics) in groups.items()
+                         for node_id in [target] + prerequisites + subtopics}
+        candidate_rows = np.array(sorted(self.csr.index[node_id] for node_id in candidate_ids), dtype=np.int32)
+        direct = self.prerequisites[candidate_rows] if len(candidate_rows) else self.prerequisites[:0]
+        columns = np.union1d(candidate_rows, direct.indices)
+        columns = columns[np.argsort(self.closure.closure_rank[columns], kind='stable')]
+        position = {int(node): k for k, node in enumerate(columns)}
+
+        # Known directly, or implied by knowing something that depends on it
+        known = known.astype(np.int32)
+        implied = known @ self.closure.matrix()[:, columns]
+        known_columns = (known[:, columns] + implied).toarray() > 0
+
+        # Unmet direct prerequisites per column (columns x columns adjacency)
+        adjacency = self.prerequisites[columns][:, columns].astype(np.float32)
+        unmet = (adjacency @ (~known_columns).T.astype(np.float32)).T
+
+        results = {}
+        for target, (prerequisites, subtopics) in groups.items():
+            prerequisite_cols = [position[self.csr.index[node_id]] for node_id in prerequisites]
+            subtopic_cols = [position[self.csr.index[node_id]] for node_id in subtopics]
+            candidate_cols = sorted(set(prerequisite_cols + subtopic_cols + [position[self.csr.index[target]]]))
+
+            known_prerequisites = known_columns[:, prerequisite_cols]
+            candidates_unknown = ~known_columns[:, candidate_cols]
+            results[target] = {
+                'prerequisites': prerequisites,
+                'subtopics': subtopics,
+                'candidates': [self.csr.node_ids[columns[k]] for k in candidate_cols],
+                'readiness': known_prerequisites.mean(axis=1) * 100 if prerequisite_cols
+                             else np.full(known.shape[0], 100.0),
+                'completion': known_columns[:, subtopic_cols].mean(axis=1) * 100 if subtopic_cols
+                              else np.zeros(known.shape[0]),
+                'missing': ~known_prerequisites,
+                'next_steps': candidates_unknown & (unmet[:, candidate_cols] == 0),
+            }
+        return results
+
+
+def _row_lists(matrix: np.ndarray, labels: List[str], limit: int) -> List[List[str]]:
+    """Labels of the True cells of each row (in column order), at most limit per row."""
+    rows, cols = np.nonzero(matrix)
+    bounds = np.searchsorted(rows, np.arange(matrix.shape[0] + 1))
+    keep = np.arange(len(rows)) - bounds[rows] < limit
+    rows, cols = rows[keep], cols[keep]
+    values = np.array(labels, dtype=object)[cols].tolist() if len(labels) else []
+    bounds = np.searchsorted(rows, np.arange(matrix.shape[0] + 1)).tolist()
+    return [values[bounds[r]:bounds[r + 1]] for r in range(matrix.shape[0])]
+
+
+def cohort_report(results: Dict[str, Dict], user_ids: Sequence[str], names: Dict[str, str],
+                  max_items: int = 5) -> List[Dict]:
+    """JSON-ready per-target summaries and per-user rows for analyze() results."""
+    report = []
+    for target, result in results.items():
+        missing, prerequisites = result['missing'], result['prerequisites']
+        missing_counts = missing.sum(axis=0)
+        most_missing = np.argsort(-missing_counts, kind='stable')[:max_items]
+        missing_totals = missing.sum(axis=1)
+        rows = zip(user_ids,
+                   np.round(result['readiness'], 1).tolist(),
+                   np.round(result['completion'], 1).tolist(),
+                   missing_totals.tolist(),
+                   _row_lists(missing, [names.get(n, n) for n in prerequisites], max_items),
+                   _row_lists(result['next_steps'], [names.get(n, n) for n in result['candidates']], max_items))
+
+        report.append({
+            'target': {'id': target, 'name': names.get(target, target)},
+            'prerequisite_count': len(prerequisites),
+            'subtopic_count': len(result['subtopics']),
+            'average_readiness': round(float(result['readiness'].mean()), 1) if len(user_ids) else 0.0,
+            'average_completion': round(float(result['completion'].mean()), 1) if len(user_ids) else 0.0,
+            'users_ready': int((missing_totals == 0).sum()),
+            'most_missing': [{'id': prerequisites[k], 'name': names.get(prerequisites[k], prerequisites[k]),
+                              'users': int(missing_counts[k])}
+                             for k in most_missing if missing_counts[k] > 0],
+            'users': [{
+                'user_id': user_id,
+                'readiness_percentage': readiness,
+                'completion_percentage': completion,
+                'missing_count': missing_count,
+                'missing_prerequisites': missing_names,
+                'next_steps': next_names,
+            } for user_id, readiness, completion, missing_count, missing_names, next_names in rows],
+        })
+    return report
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Compressed-sparse-row learning graph for hot-path queries
+
+NetworkX stores every edge as a dict of attributes inside two dict-of-dicts,
+which costs hundreds of bytes per edge and a Python-level dict lookup for every
+edge-type check. CSRGraph keeps the same graph in a few NumPy arrays:
+
+- nodes are integers 0..n-1 (node_ids / index map to the graph_data.json IDs)
+- out_indptr/out_indices and in_indptr/in_indices: successor and predecessor rows
+- out_types/in_types: int8 edge-type codes (EDGE_TYPES)
+- out_weights/in_weights: float32 path weights
+
+Rows keep the order edges appear in graph_data.json, matching the iteration
+order NetworkX gave the analyzer. Shortest paths run on the arrays through
+scipy.sparse.csgraph. The analyzer keeps its NetworkX DiGraph only for
+visualization and ad-hoc analysis.
+"""
+
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.sparse import csr_array
+from scipy.sparse.csgraph import dijkstra
+
+# Code 0 is used for edges without a type (NetworkX would have no 'type' attribute)
+EDGE_TYPES = ['default', 'prerequisite', 'sequence', 'contains', 'leads_to', 'related']
+
+# float32 weights carry ~7 significant digits; summed path lengths are rounded back
+# to that precision so 0.1 + 0.2 still reports as 0.3
+DISTANCE_DECIMALS = 6
+
+
+def round_distance(distance) -> float:
+    return round(float(distance), DISTANCE_DECIMALS)
+
+
+class CSRGraph:
+    """Immutable directed graph in CSR form with typed, weighted edges."""
+
+    def __init__(self, node_ids: List[str], node_types: List[Optional[str]], edge_type_names: List[str],
+                 sources: np.ndarray, targets: np.ndarray, types: np.ndarray, weights: np.ndarray):
+        self.node_ids = node_ids
+        self.index: Dict[str, int] = {node_id: i for i, node_id in enumerate(node_ids)}
+        self.edge_type_names = edge_type_names
+        self.edge_type_codes = {name: code for code, name in enumerate(edge_type_names)}
+
+        self.node_type_names = sorted({t for t in node_types if t is not None})
+        node_type_codes = {name: code + 1 for code, name in enumerate(self.node_type_names)}
+        self.node_types = np.array([node_type_codes.get(t, 0) for t in node_types], dtype=np.int8)
+
+        n = len(node_ids)
+        self.out_indptr, self.out_indices, self.out_types, self.out_weights = \
+            self._compress(n, sources, targets, types, weights)
+        self.in_indptr, self.in_indices, self.in_types, self.in_weights = \
+            self._compress(n, targets, sources, types, weights)
+
+    @classmethod
+    def from_graph_data(cls, graph_data: Dict, weight_for_type: Callable[[str], float]) -> "CSRGraph":
+        """Build from graph_data.json content; duplicate edges keep their first position and last attributes."""
+        node_ids: List[str] = []
+        node_types: List[Optional[str]] = []
+        index: Dict[str, int] = {}
+
+        def node_index(node_id, node_type=None):
+            if node_id not in index:
+                index[node_id] = len(node_ids)
+                node_ids.append(node_id)
+                node_types.append(node_type)
+            return index[node_id]
+
+        for node in graph_data.get('nodes', []):
+            i = node_index(node['id'], node.get('type'))
+            node_types[i] = node.get('type')
+
+        edge_type_names = list(EDGE_TYPES)
+        edge_type_codes = {name: code for code, name in enumerate(edge_type_names)}
+        edges: Dict[Tuple[int, int], Tuple[int, float]] = {}
+        for edge in graph_data.get('edges', []):
+            edge_type = edge.get('type')
+            if edge_type is not None and edge_type not in edge_type_codes:
+                edge_type_codes[edge_type] = len(edge_type_names)
+                edge_type_names.append(edge_type)
+            code = edge_type_codes.get(edge_type, 0)
+            key = (node_index(edge['source']), node_index(edge['target']))
+            edges[key] = (code, weight_for_type(edge.get('type', 'default')))
+
+        count = len(edges)
+        sources = np.fromiter((s for s, _ in edges), dtype=np.int32, count=count)
+        targets = np.fromiter((t for _, t in edges), dtype=np.int32, count=count)
+        types = np.fromiter((code for code, _ in edges.values()), dtype=np.int8, count=count)
+        weights = np.fromiter((w for _, w in edges.values()), dtype=np.float32, count=count)
+        return cls(node_ids, node_types, edge_type_names, sources, targets, types, weights)
+
+    # Array attributes, in the order they are written to a compiled graph snapshot
+    ARRAY_NAMES = ('node_types', 'out_indptr', 'out_indices', 'out_types', 'out_weights',
+                   'in_indptr', 'in_indices', 'in_types', 'in_weights')
+
+    @classmethod
+    def from_arrays(cls, node_ids: Sequence[str], index: Mapping[str, int], node_type_names: List[str],
+                    edge_type_names: List[str], arrays: Dict[str, np.ndarray]) -> "CSRGraph":
+        """Wrap prebuilt (e.g. memory-mapped) arrays without copying them."""
+        graph = cls.__new__(cls)
+        graph.node_ids = node_ids
+        graph.index = index
+        graph.node_type_names = list(node_type_names)
+        graph.edge_type_names = list(edge_type_names)
+        graph.edge_type_codes = {name: code for code, name in enumerate(graph.edge_type_names)}
+        for name in cls.ARRAY_NAMES:
+            setattr(graph, name, arrays[name])
+        return graph
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in self.ARRAY_NAMES}
+
+    @staticmethod
+    def _compress(n, rows, columns, types, weights):
+        order = np.argsort(rows, kind='stable')
+        indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return (indptr, np.ascontiguousarray(columns[order], dtype=np.int32),
+                np.ascontiguousarray(types[order]), np.ascontiguousarray(weights[order]))
+
+    # -- Basic queries ---------------------------------------------------------
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.out_indices)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the CSR arrays."""
+        return sum(array.nbytes for array in self.arrays().values())
+
+    def node_type(self, node_id) -> Optional[str]:
+        i = self.index.get(node_id)
+        if i is None or self.node_types[i] == 0:
+            return None
+        return self.node_type_names[self.node_types[i] - 1]
+
+    def successors(self, node_id, edge_types: Optional[Iterable[str]] = None,
+                   node_type: Optional[str] = None) -> List[str]:
+        """Successor IDs in edge order, optionally filtered by edge type and successor node type."""
+        return self._neighbors(node_id, self.out_indptr, self.out_indices, self.out_types, edge_types, node_type)
+
+    def predecessors(self, node_id, edge_types: Optional[Iterable[str]] = None,
+                     node_type: Optional[str] = None) -> List[str]:
+        """Predecessor IDs in edge order, optionally filtered by edge type and predecessor node type."""
+        return self._neighbors(node_id, self.in_indptr, self.in_indices, self.in_types, edge_types, node_type)
+
+    def edge_type(self, source, target) -> Optional[str]:
+        """Type of the source -> target edge ('default' if untyped), or None if there is no edge."""
+        i, j = self.index.get(source), self.index.get(target)
+        if i is None or j is None:
+            return None
+        start, end = self.out_indptr[i], self.out_indptr[i + 1]
+        hits = np.flatnonzero(self.out_indices[start:end] == j)
+        if not len(hits):
+            return None
+        return self.edge_type_names[self.out_types[start + hits[0]]]
+
+    def has_edge(self, source, target) -> bool:
+        return self.edge_type(source, target) is not None
+
+    def in_degree(self, node_id) -> int:
+        i = self.index.get(node_id)
+        return 0 if i is None else int(self.in_indptr[i + 1] - self.in_indptr[i])
+
+    def out_degree(self, node_id) -> int:
+        i = self.index.get(node_id)
+        return 0 if i is None else int(self.out_indptr[i + 1] - self.out_indptr[i])
+
+    def degree(self, node_id) -> int:
+        return self.in_degree(node_id) + self.out_degree(node_id)
+
+    def _neighbors(self, node_id, indptr, indices, types, edge_types, node_type) -> List[str]:
+        i = self.index.get(node_id)
+        if i is None:
+            return []
+        start, end = indptr[i], indptr[i + 1]
+        neighbors = indices[start:end]
+        mask = np.ones(len(neighbors), dtype=bool)
+        if edge_types is not None:
+            codes = [self.edge_type_codes[name] for name in edge_types if name in self.edge_type_codes]
+            mask &= np.isin(types[start:end], codes)
+        if node_type is not None:
+            code = self.node_type_names.index(node_type) + 1 if node_type in self.node_type_names else -1
+            mask &= self.node_types[neighbors] == code
+        return [self.node_ids[k] for k in neighbors[mask]]
+
+    # -- Shortest paths --------------------------------------------------------
+
+    def to_scipy(self, reverse: bool = False) -> csr_array:
+        """Weighted adjacency matrix sharing the CSR arrays (transposed when reverse)."""
+        n = len(self.node_ids)
+        if reverse:
+            return csr_array((self.in_weights, self.in_indices, self.in_indptr), shape=(n, n))
+        return csr_array((self.out_weights, self.out_indices, self.out_indptr), shape=(n, n))
+
+    def typed_matrix(self, type_weights: Mapping[str, float], default: float = 0.0,
+                     reverse: bool = False) -> csr_array:
+        """Adjacency matrix whose entries are edge-type weights (default for unlisted types).
+
+        Row i holds node i's successors, or its predecessors when reverse. Edges
+        weighted 0 are left out, so e.g. {'prerequisite': 1.0} keeps only those edges.
+        """
+        n = len(self.node_ids)
+        weights = np.array([type_weights.get(name, default) for name in self.edge_type_names], dtype=np.float64)
+        indptr, indices, types = (self.in_indptr, self.in_indices, self.in_types) if reverse else \
+            (self.out_indptr, self.out_indices, self.out_types)
+        rows = np.repeat(np.arange(n, dtype=np.int32), np.diff(indptr))
+        data = weights[types]
+        keep = data != 0
+        return csr_array((data[keep], (rows[keep], indices[keep])), shape=(n, n))
+
+    def shortest_path(self, sources: Sequence[str], target) -> Tuple[float, Optional[List[str]]]:
+        """Nearest path from any of sources to target: (distance, node IDs) or (inf, None)."""
+        rows = sorted({self.index[source] for source in sources if source in self.index})
+        j = self.index.get(target)
+        if not rows or j is None:
+            return float('inf'), None
+        dist, predecessors, _ = dijkstra(self.to_scipy(), directed=True, indices=rows,
+                                         return_predecessors=True, min_only=True)
+        if not np.isfinite(dist[j]):
+            return float('inf'), None
+        path = [j]
+        while predecessors[path[-1]] >= 0:
+            path.append(int(predecessors[path[-1]]))
+        return round_distance(dist[j]), [self.node_ids[k] for k in reversed(path)]
+
+    def distances_to(self, target) -> Dict[str, float]:
+        """Finite distances from every node to target (one search on the reversed graph)."""
+        j = self.index.get(target)
+        if j is None:
+            return {}
+        dist = dijkstra(self.to_scipy(reverse=True), directed=True, indices=j)
+        return {self.node_ids[i]: round_distance(dist[i]) for i in np.flatnonzero(np.isfinite(dist))}
+
+    def distance(self, source, target) -> float:
+        return self.shortest_path([source], target)[0]
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Precomputed all-pairs distance and next-hop tables for the learning graph
+
+For the curated graph sizes we run (tens to a few thousand nodes) it is cheaper
+to compute every weighted shortest path once than to run Dijkstra on each
+request. build_distance_table() runs SciPy's Dijkstra from every node over the
+reversed graph, which yields in one pass:
+
+- dist[i, j]: weighted distance from node i to node j (inf if unreachable)
+- next_hop[i, j]: the node after i on a shortest path to j (-1 if none)
+
+Distance lookups are then O(1) and paths O(path length). Distances are stored
+as float32 (8 bytes per node pair with the int32 next hops, about 18 MB at 1500
+nodes). Tables are built offline by build_distance_table.py and saved as an
+.npz artifact next to graph_data.json, keyed by the graph's content hash, so an
+edited graph never reuses stale distances. Servers only load the artifact.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+
+from csr_graph import DISTANCE_DECIMALS, round_distance
+
+ARTIFACT_SUFFIX = "_distances.npz"
+
+# Graphs larger than this (GRAPH_DISTANCE_TABLE_MAX_NODES) use on-demand searches instead
+DEFAULT_MAX_NODES = 1500
+
+
+def distance_table_max_nodes() -> int:
+    return int(os.getenv('GRAPH_DISTANCE_TABLE_MAX_NODES', DEFAULT_MAX_NODES))
+
+
+def artifact_path_for(graph_file) -> Path:
+    graph_file = Path(graph_file)
+    return graph_file.with_name(graph_file.stem + ARTIFACT_SUFFIX)
+
+
+class DistanceTable:
+    """All-pairs weighted distances and next hops over a fixed node list."""
+
+    def __init__(self, node_ids: List[str], dist: np.ndarray, next_hop: np.ndarray, graph_version: Optional[str]):
+        self.node_ids = list(node_ids)
+        self.index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.dist = dist
+        self.next_hop = next_hop
+        self.graph_version = graph_version
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def distance(self, source: str, target: str) -> float:
+        """Weighted distance from source to target, inf if unreachable or unknown."""
+        i, j = self.index.get(source), self.index.get(target)
+        if i is None or j is None:
+            return float('inf')
+        return round_distance(self.dist[i, j])
+
+    def path(self, source: str, target: str) -> Optional[List[str]]:
+        """Node IDs of a shortest path from source to target (inclusive), or None."""
+        i, j = self.index.get(source), self.index.get(target)
+        if i is None or j is None or not np.isfinite(self.dist[i, j]):
+            return None
+        path = [i]
+        while i != j:
+            i = int(self.next_hop[i, j])
+            path.append(i)
+        return [self.node_ids[k] for k in path]
+
+    def nearest_source(self, sources: Iterable[str], target: str) -> Tuple[Optional[str], float]:
+        """The source closest to target and its distance ((None, inf) if none reaches it)."""
+        j = self.index.get(target)
+        rows = [self.index[source] for source in sources if source in self.index]
+        if j is None or not rows:
+            return None, float('inf')
+        column = self.dist[rows, j]
+        best = int(np.argmin(column))
+        if not np.isfinite(column[best]):
+            return None, float('inf')
+        return self.node_ids[rows[best]], round_distance(column[best])
+
+    def distances_to(self, target: str) -> Dict[str, float]:
+        """Finite distances from every node to target."""
+        j = self.index.get(target)
+        if j is None:
+            return {}
+        column = self.dist[:, j]
+        return {self.node_ids[i]: round_distance(column[i]) for i in np.flatnonzero(np.isfinite(column))}
+
+    def save(self, path):
+        """Write the artifact atomically through a uniquely named, fsynced temp file."""
+        path = Path(path)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                os.fchmod(f.fileno(), 0o644)  # mkstemp creates 0600; other users' workers read it too
+                np.savez(f, node_ids=np.array(self.node_ids), dist=self.dist, next_hop=self.next_hop,
+                         graph_version=np.array(self.graph_version or ""))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, path, graph_version: Optional[str]) -> Optional["DistanceTable"]:
+        """Load the artifact if it exists and was built from the same graph version."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            if str(data['graph_version']) != (graph_version or ""):
+                return None
+            return cls([str(node_id) for node_id in data['node_ids']], data['dist'], data['next_hop'], graph_version)
+
+
+def build_distance_table(graph, graph_version: Optional[str] = None,
+                         weight: str = 'weight') -> DistanceTable:
+    """Compute all-pairs distances and next hops with one Dijkstra per node on the reversed graph.
+
+    graph may be a CSRGraph or a NetworkX DiGraph (weights read from the ``weight`` attribute).
+    """
+    if isinstance(graph, nx.DiGraph):
+        node_ids = list(graph.nodes())
+        reverse_adjacency = nx.to_scipy_sparse_array(graph, nodelist=node_ids, weight=weight, format='csr').T.tocsr() \
+            if node_ids else None
+    else:
+        node_ids = list(graph.node_ids)
+        reverse_adjacency = graph.to_scipy(reverse=True)
+    if not node_ids:
+        return DistanceTable([], np.zeros((0, 0), dtype=np.float32), np.zeros((0, 0), dtype=np.int32), graph_version)
+
+    # From target t on the reversed graph, the predecessor of i is the next hop from i towards t
+    reverse_dist, reverse_pred = dijkstra(reverse_adjacency, directed=True, return_predecessors=True)
+    dist = np.round(np.ascontiguousarray(reverse_dist.T), DISTANCE_DECIMALS).astype(np.float32)
+    next_hop = np.ascontiguousarray(reverse_pred.T).astype(np.int32)
+    next_hop[next_hop < 0] = -1
+    return DistanceTable(node_ids, dist, next_hop, graph_version)
+
+
+def load_for_graph(graph_file, graph_version: Optional[str]) -> Optional[DistanceTable]:
+    """The prebuilt artifact for this graph version, or None if it is missing, stale or unreadable."""
+    path = artifact_path_for(graph_file)
+    try:
+        return DistanceTable.load(path, graph_version)
+    except Exception as e:
+        print(f"⚠️ Could not load distance table from {path}: {e}")
+        return None
@@ -0,0 +1,128 @@
+"""
+Pre-generated tutor explanations for graph nodes
+
+build_explanations.py generates one explanation per topic/subtopic in
+graph_data.json and stores them here (a JSON file keyed by node ID). The chat
+handler looks explanations up by node name and personalizes them with the
+student's path and known concepts, instead of making a full LLM call for every
+graph-topic request.
+
+Each entry records a hash of the node's name and description so the build job
+can regenerate only the nodes whose content changed.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_STORE_PATH = Path(__file__).parent / "node_explanations.json"
+
+
+def node_source_hash(node: Dict) -> str:
+    """Hash of the node fields the explanation prompt is built from."""
+    source = json.dumps([node.get('name'), node.get('description'), node.get('parent_topic')], ensure_ascii=False)
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+
+
+def _normalize(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+class ExplanationStore:
+    """JSON-backed node_id -> explanation store with lookup by name."""
+
+    def __init__(self, path=DEFAULT_STORE_PATH, check_interval: float = 30.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+
+        self._entries: Dict[str, Dict] = {}
+        self._by_name: Dict[str, Dict] = {}
+        self._mtime = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, name: str) -> Optional[str]:
+        """Stored explanation for a node name, or None."""
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self._last_check = now
+            if self._file_mtime() != self._mtime:
+                self._load()
+        entry = self._by_name.get(_normalize(name))
+        return entry['explanation'] if entry else None
+
+    def needs_update(self, node: Dict) -> bool:
+        entry = self._entries.get(node['id'])
+        return entry is None or entry.get('source_hash') != node_source_hash(node)
+
+    def put(self, node: Dict, explanation: str, backend: str, model: str):
+        entry = {
+            'name': node['name'],
+            'explanation': explanation,
+            'backend': backend,
+            'model': model,
+            'source_hash': node_source_hash(node),
+            'generated_at': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        }
+        key = _normalize(node['name'])
+        with self._lock:
+            previous = self._entries.get(node['id'])
+            self._entries[node['id']] = entry
+            previous_key = _normalize(previous['name']) if previous is not None else None
+            if previous is not None and self._by_name.get(previous_key) is previous:
+                if previous_key == key:
+                    # Regenerated under the same name: serve the new explanation
+                    self._by_name[key] = entry
+                else:
+                    # Renamed: hand the old name to another node that has it, if any
+                    del self._by_name[previous_key]
+                    for other in self._entries.values():
+                        if _normalize(other['name']) == previous_key:
+                            self._by_name[previous_key] = other
+                            break
+            # Like _load, the first node ID to claim a name keeps it
+            self._by_name.setdefault(key, entry)
+
+    def save(self):
+        """Atomically write the store to disk."""
+        with self._lock:
+            data = dict(self._entries)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._mtime = self._file_mtime()
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self):
+        entries: Dict[str, Dict] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+            except Exception as e:
+                print(f"⚠️ Could not load node explanations from {self.path}: {e}")
+
+        by_name: Dict[str, Dict] = {}
+        for entry in entries.values():
+            by_name.setdefault(_normalize(entry['name']), entry)
+
+        with self._lock:
+            self._entries = entries
+            self._by_name = by_name
+            self._mtime = self._file_mtime()
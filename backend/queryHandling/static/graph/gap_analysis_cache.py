@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Gap Analysis Cache
+
+Memoizes learning-path and gap-analysis results so that students who share
+the same set of known concepts and ask about the same target are answered
+from memory instead of re-running the graph searches.
+
+Entries are keyed by a canonical hash of (sorted known concept IDs, target ID,
+graph version) and evicted in LRU order. When graph_data.json changes, the
+graph reloader swaps in a new analyzer and calls invalidate(); requests still
+pinned to the old analyzer keep hitting their own graph version's entries
+until then.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+class GapAnalysisCache:
+    """Thread-safe LRU cache for (known-set, target) gap-analysis results."""
+
+    def __init__(self, max_entries: int = 2048):
+        """
+        Args:
+            max_entries: Maximum number of results kept before LRU eviction.
+        """
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(known_ids: Iterable[str], target_id: str, graph_version: Optional[str]) -> str:
+        """Build the canonical cache key for a known-set/target pair."""
+        canonical = json.dumps([sorted(set(known_ids)), target_id, graph_version], separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value) for a key, refreshing its LRU position."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            # Callers are free to mutate what they get back
+            return True, copy.deepcopy(self._entries[key])
+
+    def put(self, key: str, value: Any):
+        """Store a value, evicting the least recently used entries if full."""
+        with self._lock:
+            self._entries[key] = copy.deepcopy(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, known_ids: Iterable[str], target_id: str, graph_version: Optional[str],
+                       compute: Callable[[], Any]) -> Any:
+        """Return the cached result for this signature, computing it on a miss.
+
+        Results are only stored when ``compute`` returns without raising.
+        """
+        key = self.make_key(known_ids, target_id, graph_version)
+        found, value = self.get(key)
+        if found:
+            return value
+
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self):
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self):
+        """Drop every cached result because the graph they were computed on was replaced."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
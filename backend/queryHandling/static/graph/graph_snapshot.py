@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Compiled, memory-mapped snapshot of the learning graph
+
+Parsing graph_data.json, building the DiGraph and the name/ID dictionaries is
+repeated by every worker process and every analyzer instance. A snapshot is
+the same graph compiled once into a single binary file:
+
+    magic | header length | JSON header | 64-byte aligned arrays
+
+The header holds the format version, the source graph version (content hash)
+and the size/mtime of the JSON it was compiled from, plus an offset table for
+the arrays: the CSR adjacency (csr_graph.CSRGraph), the prerequisite closure
+(prerequisite_closure.PrerequisiteClosure), node and edge records, the name
+indexes and the partial-match name index (name_index.NameIndex). Strings are stored as UTF-8 blobs with offset arrays, and
+lookups binary-search a sorted permutation, so opening a snapshot only maps
+the file; nothing is decoded until it is used. Node and edge records are
+decoded once on first access and kept, so request paths that loop over
+graph_data['nodes'] do not re-parse JSON. Every process that maps the same
+file shares one copy of the arrays in the page cache.
+"""
+
+import bisect
+import json
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from name_index import NameIndex
+from prerequisite_closure import PrerequisiteClosure
+
+SNAPSHOT_MAGIC = b"CPSGRAPH"
+SNAPSHOT_FORMAT = 3
+SNAPSHOT_SUFFIX = "_snapshot.bin"
+ALIGNMENT = 64
+
+# Name indexes carried by the snapshot, as exposed on RealGraphLearningAnalyzer
+NAME_INDEXES = ('topic_name_to_id', 'subtopic_name_to_id', 'all_name_to_id')
+
+
+def snapshot_path_for(graph_file) -> Path:
+    graph_file = Path(graph_file)
+    return graph_file.with_name(graph_file.stem + SNAPSHOT_SUFFIX)
+
+
+def source_stamp(graph_file) -> Dict[str, int]:
+    """Size and mtime of the source JSON, used to detect a stale snapshot without reading it."""
+    stat = os.stat(graph_file)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+# -- Lazy views over the mapped arrays -----------------------------------------
+
+class StringTable(Sequence):
+    """Read-only list of strings stored as a UTF-8 blob plus an offsets array."""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+
+    @staticmethod
+    def pack(strings: Sequence[str]):
+        encoded = [s.encode('utf-8') for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        i = int(i)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+
+class _SortedKeys(Sequence):
+    """Keys viewed in sorted order, so bisect can search them."""
+
+    def __init__(self, keys: StringTable, order: np.ndarray):
+        self.keys = keys
+        self.order = order
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __getitem__(self, i):
+        return self.keys[self.order[i]]
+
+
+class StringIndex(Mapping):
+    """Read-only dict from string keys to values, in the original insertion order.
+
+    Lookups binary-search a sorted permutation of the keys (O(log n) string
+    decodes). ``values`` of None maps each key to its position.
+    """
+
+    def __init__(self, keys: StringTable, order: np.ndarray, values: Optional[Sequence] = None):
+        self.keys = keys
+        self.order = order
+        self.values_table = values
+        self._sorted = _SortedKeys(keys, order)
+
+    @staticmethod
+    def sort_order(keys: Sequence[str]) -> np.ndarray:
+        return np.array(sorted(range(len(keys)), key=lambda i: keys[i]), dtype=np.int32)
+
+    def position(self, key) -> Optional[int]:
+        if not isinstance(key, str):
+            return None
+        i = bisect.bisect_left(self._sorted, key)
+        if i < len(self.order) and self._sorted[i] == key:
+            return int(self.order[i])
+        return None
+
+    def _value(self, position: int):
+        if self.values_table is None:
+            return position
+        value = self.values_table[position]
+        return int(value) if isinstance(value, np.integer) else value
+
+    def __getitem__(self, key):
+        position = self.position(key)
+        if position is None:
+            raise KeyError(key)
+        return self._value(position)
+
+    def __contains__(self, key) -> bool:
+        return self.position(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def items(self):
+        return ((self.keys[i], self._value(i)) for i in range(len(self.keys)))
+
+
+class RecordTable(Sequence):
+    """JSON records (node or edge dicts) decoded on first access and cached.
+
+    Like graph_data loaded from JSON, every caller gets the same dict for a record.
+    """
+
+    def __init__(self, records: StringTable):
+        self.records = records
+        self._decoded: List[Optional[Dict]] = [None] * len(records)
+
+    def __len__(self) -> int:
+        return len(self._decoded)
+
+    def __getitem__(self, i):
+        i = int(i)
+        record = self._decoded[i]
+        if record is None:
+            record = self._decoded[i] = json.loads(self.records[i])
+        return record
+
+
+class RecordList(Sequence):
+    """Records of a RecordTable, optionally a subset by position."""
+
+    def __init__(self, records: RecordTable, positions: Optional[np.ndarray] = None):
+        self.records = records
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.records) if self.positions is None else len(self.positions)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if self.positions is not None:
+            i = self.positions[i]
+        return self.records[i]
+
+
+class RecordMap(Mapping):
+    """Read-only dict from node ID to its node record."""
+
+    def __init__(self, index: StringIndex, records: RecordTable):
+        self.index = index
+        self.records = records
+
+    def __getitem__(self, key):
+        return self.records[self.index[key]]
+
+    def __contains__(self, key) -> bool:
+        return key in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+# -- Snapshot ------------------------------------------------------------------
+
+class GraphSnapshot:
+    """A mapped snapshot file: graph_data, CSR graph, prerequisite closure, node table and name indexes."""
+
+    def __init__(self, path: Path, header: Dict, arrays: Dict[str, np.ndarray]):
+        self.path = path
+        self.header = header
+        self.graph_version = header['graph_version'] or None
+        self.source = header['source']
+
+        node_records = RecordTable(StringTable(arrays['node_record_blob'], arrays['node_record_offsets']))
+        edge_records = RecordTable(StringTable(arrays['edge_record_blob'], arrays['edge_record_offsets']))
+        self.graph_data = dict(header['metadata'])
+        self.graph_data['nodes'] = RecordList(node_records)
+        self.graph_data['edges'] = RecordList(edge_records)
+        self.topics = RecordList(node_records, arrays['topic_positions'])
+        self.subtopics = RecordList(node_records, arrays['subtopic_positions'])
+        self.all_id_to_data = RecordMap(self._string_index(arrays, 'node_record', arrays['node_record_positions']),
+                                        node_records)
+        self.name_indexes = {
+            name: self._string_index(arrays, name, StringTable(arrays[f'{name}_value_blob'], arrays[f'{name}_value_offsets']))
+            for name in NAME_INDEXES
+        }
+        self.clusters = {key: members for key, members in header['clusters']}
+
+        node_ids = StringTable(arrays['node_id_blob'], arrays['node_id_offsets'])
+        self.csr = CSRGraph.from_arrays(node_ids, StringIndex(node_ids, arrays['node_id_order']),
+                                        header['node_type_names'], header['edge_type_names'], arrays)
+        self.closure = PrerequisiteClosure(self.csr, arrays)
+        all_names = self.name_indexes['all_name_to_id']
+        self.name_index = NameIndex(all_names.keys, all_names.values_table, arrays)
+
+    @staticmethod
+    def _string_index(arrays, name, values) -> StringIndex:
+        return StringIndex(StringTable(arrays[f'{name}_key_blob'], arrays[f'{name}_key_offsets']),
+                           arrays[f'{name}_key_order'], values)
+
+    @classmethod
+    def load(cls, path, source: Optional[Dict[str, int]] = None) -> Optional["GraphSnapshot"]:
+        """Map the snapshot at path, or None if it is missing, another format, or stale for source."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        with open(path, 'rb') as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                return None
+            (header_length,) = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_length).decode('utf-8'))
+        if header.get('format') != SNAPSHOT_FORMAT:
+            return None
+        if source is not None and header.get('source') != source:
+            return None
+
+        mapped = np.memmap(path, dtype=np.uint8, mode='r')
+        arrays = {}
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape'], dtype=np.int64))
+            start = spec['offset']
+            arrays[name] = mapped[start:start + count * dtype.itemsize].view(dtype).reshape(spec['shape'])
+        return cls(path, header, arrays)
+
+
+def _pack_string_index(arrays: Dict[str, np.ndarray], name: str, keys: List[str]):
+    arrays[f'{name}_key_blob'], arrays[f'{name}_key_offsets'] = StringTable.pack(keys)
+    arrays[f'{name}_key_order'] = StringIndex.sort_order(keys)
+
+
+def write_graph_snapshot(path, graph_data: Dict, graph_version: Optional[str], csr: CSRGraph,
+                         closure: PrerequisiteClosure, name_index: NameIndex, name_indexes: Dict[str, Dict[str, str]],
+                         clusters: Dict, source: Optional[Dict[str, int]]) -> Path:
+    """Compile graph_data and its derived indexes into a snapshot file (written atomically)."""
+    nodes = list(graph_data.get('nodes', []))
+    edges = list(graph_data.get('edges', []))
+    arrays: Dict[str, np.ndarray] = {}
+
+    arrays['node_record_blob'], arrays['node_record_offsets'] = StringTable.pack(
+        [json.dumps(node, ensure_ascii=False) for node in nodes])
+    arrays['edge_record_blob'], arrays['edge_record_offsets'] = StringTable.pack(
+        [json.dumps(edge, ensure_ascii=False) for edge in edges])
+    arrays['topic_positions'] = np.array([i for i, node in enumerate(nodes) if node.get('type') == 'topic'], dtype=np.int32)
+    arrays['subtopic_positions'] = np.array([i for i, node in enumerate(nodes) if node.get('type') == 'subtopic'], dtype=np.int32)
+
+    # Same semantics as {node['id']: node for node in nodes}: first position, last record wins
+    record_positions = {}
+    for i, node in enumerate(nodes):
+        record_positions[node['id']] = i
+    _pack_string_index(arrays, 'node_record', list(record_positions))
+    arrays['node_record_positions'] = np.array(list(record_positions.values()), dtype=np.int32)
+
+    for name in NAME_INDEXES:
+        index = name_indexes.get(name, {})
+        _pack_string_index(arrays, name, list(index))
+        arrays[f'{name}_value_blob'], arrays[f'{name}_value_offsets'] = StringTable.pack(list(index.values()))
+
+    node_ids = list(csr.node_ids)
+    arrays['node_id_blob'], arrays['node_id_offsets'] = StringTable.pack(node_ids)
+    arrays['node_id_order'] = StringIndex.sort_order(node_ids)
+    arrays.update(csr.arrays())
+    arrays.update(closure.arrays())
+    arrays.update(name_index.arrays())
+
+    header = {
+        'format': SNAPSHOT_FORMAT,
+        'graph_version': graph_version or "",
+        'source': source,
+        'metadata': {key: value for key, value in graph_data.items() if key not in ('nodes', 'edges')},
+        'node_type_names': csr.node_type_names,
+        'edge_type_names': csr.edge_type_names,
+        'clusters': [[key, members] for key, members in clusters.items()],
+        'arrays': {},
+    }
+
+    # Offsets are relative to the start of the file, so the header size must be fixed first
+    def layout(data_start):
+        offset, specs = data_start, {}
+        for name, array in arrays.items():
+            offset = -(-offset // ALIGNMENT) * ALIGNMENT
+            specs[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+            offset += array.nbytes
+        return specs
+
+    data_start = 0
+    while True:
+        header['arrays'] = layout(data_start)
+        encoded = json.dumps(header).encode('utf-8')
+        needed = -(-(len(SNAPSHOT_MAGIC) + 8 + len(encoded)) // ALIGNMENT) * ALIGNMENT
+        if needed <= data_start:
+            break
+        data_start = needed
+
+    # Workers may compile at the same moment: each writes its own temp file and
+    # fsyncs it, so a rename never exposes a file another process is still writing
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            os.fchmod(f.fileno(), 0o644)  # mkstemp creates 0600; other users' workers read it too
+            f.write(SNAPSHOT_MAGIC)
+            f.write(struct.pack('<Q', len(encoded)))
+            f.write(encoded)
+            for name, array in arrays.items():
+                f.write(b"\0" * (header['arrays'][name]['offset'] - f.tell()))
+                f.write(np.ascontiguousarray(array).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return path
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Ranked partial-match lookup over node names
+
+find_node_by_name used to fall back to scanning every name with two substring
+checks and returning the shortest hit. NameIndex answers the same question
+(names containing the query, or contained in it) from precomputed arrays:
+
+- a sorted permutation of the names, which works as a compact trie: names
+  starting with the query are one bisected range of it
+- a sorted table of polynomial name hashes, so the names occurring inside
+  the query are found by hashing all of its substrings at once
+- an inverted index from character trigrams to the names containing them, so
+  only names sharing the query's trigrams are ever looked at; shared trigram
+  counts also give fuzzy (Dice similarity) candidates for misspellings
+
+Candidates are ranked by specificity: the length ratio of the shorter string
+to the longer one (1.0 for an exact match), then prefix matches, then name
+order. Like PrerequisiteClosure, all state is NumPy arrays (ARRAY_NAMES), so
+the index is compiled into the graph snapshot and memory-mapped.
+"""
+
+import bisect
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Trigrams are packed into one int64, 21 bits per code point
+_CHAR_BITS = 21
+_CHAR_MASK = (1 << _CHAR_BITS) - 1
+
+# Polynomial hash of a name's code points, modulo 2**64
+_HASH_BASE = 1000003
+_HASH_MASK = (1 << 64) - 1
+
+# Substring matches, then names that are merely similar
+MATCH_KINDS = ('exact', 'prefix', 'substring', 'contained', 'fuzzy')
+
+
+def _code_points(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+
+
+def _hash_powers(count: int) -> np.ndarray:
+    powers = [1]
+    for _ in range(count):
+        powers.append(powers[-1] * _HASH_BASE & _HASH_MASK)
+    return np.array(powers, dtype=np.uint64)
+
+
+def _trigram_codes(text: str) -> np.ndarray:
+    chars = _code_points(text)
+    if len(chars) < 3:
+        return np.zeros(0, dtype=np.int64)
+    return (chars[:-2] << (2 * _CHAR_BITS)) | (chars[1:-1] << _CHAR_BITS) | chars[2:]
+
+
+class _SortedNames(Sequence):
+    """Names viewed in sorted order, so bisect can search them."""
+
+    def __init__(self, names: Sequence[str], order: np.ndarray):
+        self.names = names
+        self.order = order
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __getitem__(self, i):
+        return self.names[self.order[i]]
+
+
+class NameIndex:
+    """Prefix, substring and fuzzy lookup of (lowercase) names, ranked by specificity."""
+
+    # Array attributes, in the order they are written to a compiled graph snapshot
+    ARRAY_NAMES = ('name_order', 'name_sorted_rank', 'name_lengths', 'name_hashes', 'name_hash_order',
+                   'name_gram_counts', 'name_gram_keys', 'name_gram_offsets', 'name_gram_postings')
+
+    def __init__(self, names: Sequence[str], node_ids: Sequence[str], arrays: Dict[str, np.ndarray]):
+        """
+        Args:
+            names: The indexed names (position i is name i).
+            node_ids: node_ids[i] is the node name i refers to.
+            arrays: name_order sorts the names and name_sorted_rank inverts it;
+                name_hashes are the names' polynomial hashes in ascending order, of the names
+                at name_hash_order; name_gram_postings[name_gram_offsets[k]:name_gram_offsets[k + 1]]
+                lists the names containing trigram name_gram_keys[k], shortest first.
+        """
+        self.names = names
+        self.node_ids = node_ids
+        for name in self.ARRAY_NAMES:
+            setattr(self, name, arrays[name])
+        self._sorted = _SortedNames(names, self.name_order)
+        # Names too short to have a trigram are checked directly
+        self._short = np.flatnonzero(np.asarray(self.name_lengths) < 3)
+        self._longest = int(self.name_lengths.max()) if len(self.name_lengths) else 0
+        self._powers = _hash_powers(self._longest)
+
+    @classmethod
+    def build(cls, name_to_id: Dict[str, str]) -> "NameIndex":
+        """Index the keys of a name -> node ID dict (e.g. all_name_to_id)."""
+        names, node_ids = list(name_to_id), list(name_to_id.values())
+        lengths = np.array([len(name) for name in names], dtype=np.int32)
+        order = np.array(sorted(range(len(names)), key=names.__getitem__), dtype=np.int32)
+        sorted_rank = np.empty(len(names), dtype=np.int32)
+        sorted_rank[order] = np.arange(len(names), dtype=np.int32)
+
+        # Every name at once as one UTF-32 buffer; owner[k] is the name of character k
+        chars = _code_points("".join(names))
+        starts = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=starts[1:])
+        owner = np.repeat(np.arange(len(names), dtype=np.int32), lengths)
+
+        # hash = sum(char[k] * BASE ** (length - 1 - k)), wrapping at 2**64
+        powers = _hash_powers(int(lengths.max()) if len(names) else 0)
+        hashes = np.zeros(len(names), dtype=np.uint64)
+        np.add.at(hashes, owner, chars.astype(np.uint64) * powers[starts[owner + 1] - 1 - np.arange(len(chars))])
+        hash_order = np.argsort(hashes, kind='stable').astype(np.int32)
+
+        # Trigram codes at each position whose trigram lies within a single name
+        valid = np.flatnonzero(np.arange(len(chars)) + 2 < starts[owner + 1]) if len(chars) else np.zeros(0, np.int64)
+        codes = (chars[valid] << (2 * _CHAR_BITS)) | (chars[valid + 1] << _CHAR_BITS) | chars[valid + 2]
+        owners = owner[valid]
+
+        # Postings grouped by trigram, shortest (most specific) name first, one entry per name
+        sort = np.lexsort((owners, lengths[owners], codes))
+        codes, owners = codes[sort], owners[sort]
+        first = np.ones(len(codes), dtype=bool)
+        first[1:] = (codes[1:] != codes[:-1]) | (owners[1:] != owners[:-1])
+        codes, owners = codes[first], owners[first]
+        keys, key_starts = np.unique(codes, return_index=True)
+        offsets = np.append(key_starts, len(codes)).astype(np.int64)
+
+        return cls(names, node_ids, {
+            'name_order': order,
+            'name_sorted_rank': sorted_rank,
+            'name_lengths': lengths,
+            'name_hashes': hashes[hash_order],
+            'name_hash_order': hash_order,
+            'name_gram_counts': np.bincount(owners, minlength=len(names)).astype(np.int32),
+            'name_gram_keys': keys,
+            'name_gram_offsets': offsets,
+            'name_gram_postings': owners.astype(np.int32),
+        })
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in self.ARRAY_NAMES}
+
+    def __len__(self) -> int:
+        return len(self.name_lengths)
+
+    # -- Queries ---------------------------------------------------------------
+
+    def _posting(self, j: int) -> np.ndarray:
+        return self.name_gram_postings[self.name_gram_offsets[j]:self.name_gram_offsets[j + 1]]
+
+    def _gram_slots(self, keys: np.ndarray) -> np.ndarray:
+        """Slots of the given trigram codes in name_gram_keys, -1 for codes no name contains."""
+        k = np.searchsorted(self.name_gram_keys, keys)
+        found = k < len(self.name_gram_keys)
+        found[found] = self.name_gram_keys[k[found]] == keys[found]
+        return np.where(found, k, -1)
+
+    def _rank(self, positions: np.ndarray, scores: np.ndarray, prefix: np.ndarray, limit: int) -> List[tuple]:
+        """The best limit of (score, is prefix, position), best first."""
+        order = np.lexsort((positions, ~prefix, -scores))[:limit]
+        return [(float(scores[k]), bool(prefix[k]), int(positions[k])) for k in order]
+
+    def _containing(self, query: str, limit: int, lo: int, hi: int) -> List[tuple]:
+        """The most specific names containing query: shortest first, prefix matches first within a length."""
+        m = len(query)
+        if m < 3:
+            # Any trigram containing the query marks a name containing it; no verification needed
+            keys = np.asarray(self.name_gram_keys)
+            grams = [(keys >> (2 * _CHAR_BITS)) & _CHAR_MASK, (keys >> _CHAR_BITS) & _CHAR_MASK, keys & _CHAR_MASK]
+            mask = np.zeros(len(keys), dtype=bool)
+            for start in range(4 - m):
+                hit = np.ones(len(keys), dtype=bool)
+                for offset, char in enumerate(query):
+                    hit &= grams[start + offset] == ord(char)
+                mask |= hit
+            found = np.zeros(len(self), dtype=bool)
+            for j in np.flatnonzero(mask):
+                found[self._posting(j)] = True
+            found[[p for p in self._short.tolist() if query in self.names[p]]] = True
+            positions = np.flatnonzero(found)
+            if len(positions) > limit:
+                cutoff = np.partition(self.name_lengths[positions], limit - 1)[limit - 1]
+                positions = positions[self.name_lengths[positions] <= cutoff]
+            ranks = self.name_sorted_rank[positions]
+            return self._rank(positions, m / self.name_lengths[positions], (ranks >= lo) & (ranks < hi), limit)
+
+        # Every name containing the query is in the posting of its rarest trigram,
+        # which lists names shortest first: check them in that order until limit
+        # names are found, then add the remaining prefix matches of the last length
+        # (they rank first among equally long names and contain the query anyway)
+        slots = self._gram_slots(np.unique(_trigram_codes(query)))
+        if (slots < 0).any():
+            return []
+        sizes = self.name_gram_offsets[slots + 1] - self.name_gram_offsets[slots]
+        posting = self._posting(int(slots[np.argmin(sizes)]))
+        lengths = self.name_lengths[posting]
+        found = []
+        start = int(np.searchsorted(lengths, m))
+        while start < len(posting) and len(found) < limit:
+            end = min(len(posting), start + 64 * limit)
+            for p in posting[start:end].tolist():
+                if query in self.names[p]:
+                    found.append(p)
+                    if len(found) == limit:
+                        break
+            start = end
+        if not found:
+            return []
+        if len(found) == limit:
+            last = self.name_lengths[found[-1]]
+            group = posting[np.searchsorted(lengths, last):np.searchsorted(lengths, last, side='right')]
+            ranks = self.name_sorted_rank[group]
+            found = np.union1d(found, group[(ranks >= lo) & (ranks < hi)])
+        positions = np.asarray(found, dtype=np.int64)
+        ranks = self.name_sorted_rank[positions]
+        return self._rank(positions, m / self.name_lengths[positions], (ranks >= lo) & (ranks < hi), limit)
+
+    def _contained(self, query: str, limit: int) -> List[tuple]:
+        """The most specific (longest) names that occur inside query."""
+        m = len(query)
+        longest = min(m - 1, self._longest)
+        if longest < 1:
+            return []
+        # Hashes of every substring of query no longer than the longest name, from prefix hashes
+        prefix = [0]
+        for char in query:
+            prefix.append((prefix[-1] * _HASH_BASE + ord(char)) & _HASH_MASK)
+        prefix = np.array(prefix, dtype=np.uint64)
+        starts, ends = np.triu_indices(m + 1, 1)
+        keep = ends - starts <= longest
+        starts, ends = starts[keep], ends[keep]
+        hashes = prefix[ends] - prefix[starts] * self._powers[ends - starts]
+
+        # Verify hash hits longest first, stopping after the length that fills limit
+        lo = np.searchsorted(self.name_hashes, hashes, side='left')
+        hi = np.searchsorted(self.name_hashes, hashes, side='right')
+        hits = np.flatnonzero(hi > lo)
+        hits = hits[np.argsort(starts[hits] - ends[hits], kind='stable')]
+        results, seen = [], set()
+        for k in hits.tolist():
+            substring = query[starts[k]:ends[k]]
+            if len(results) >= limit and len(substring) / m < results[-1][0]:
+                break
+            for p in self.name_hash_order[lo[k]:hi[k]].tolist():
+                if p not in seen and self.names[p] == substring:
+                    seen.add(p)
+                    results.append((len(substring) / m, False, p))
+        results.sort(key=lambda item: (-item[0], item[2]))
+        return results[:limit]
+
+    def _similar(self, query: str, limit: int, min_similarity: float, lo: int, hi: int) -> List[tuple]:
+        """Names sharing the most trigrams with query (Dice similarity of trigram sets)."""
+        slots = self._gram_slots(np.unique(_trigram_codes(query)))
+        query_grams = len(slots)
+        slots = slots[slots >= 0]
+        if not len(slots):
+            return []
+        shared = np.bincount(np.concatenate([self._posting(j) for j in slots]), minlength=len(self))
+        positions = np.flatnonzero(shared)
+        similarity = 2.0 * shared[positions] / (query_grams + self.name_gram_counts[positions])
+        keep = similarity >= min_similarity
+        positions, similarity = positions[keep], similarity[keep]
+        ranks = self.name_sorted_rank[positions]
+        return self._rank(positions, similarity, (ranks >= lo) & (ranks < hi), limit)
+
+    def lookup(self, query: str, limit: int = 5, fuzzy: bool = False,
+               min_similarity: float = 0.5) -> List[Dict]:
+        """Best matches for a (lowercase) query, most specific first.
+
+        A name matches if it contains the query or the query contains it; with
+        fuzzy, names whose trigram Dice similarity is at least min_similarity
+        follow the substring matches. Returns up to limit dicts with the
+        'position' of the name, its 'name', 'id', 'score' and 'match' kind
+        (one of MATCH_KINDS).
+        """
+        if not query or limit <= 0 or not len(self):
+            return []
+        m = len(query)
+        lo = bisect.bisect_left(self._sorted, query)
+        hi = bisect.bisect_left(self._sorted, query + '\U0010ffff', lo)
+
+        matches = self._containing(query, limit, lo, hi) + self._contained(query, limit)
+        matches.sort(key=lambda item: (-item[0], not item[1], item[2]))
+        matches = matches[:limit]
+        results = []
+        for score, prefix, position in matches:
+            name = self.names[position]
+            kind = 'exact' if len(name) == m else 'contained' if len(name) < m else 'prefix' if prefix else 'substring'
+            results.append({'position': position, 'name': name, 'id': self.node_ids[position],
+                            'score': round(score, 4), 'match': kind})
+
+        if fuzzy and len(results) < limit and m >= 3:
+            seen = {result['position'] for result in results}
+            for score, _, position in self._similar(query, limit + len(seen), min_similarity, lo, hi):
+                if len(results) >= limit:
+                    break
+                if position not in seen:
+                    results.append({'position': position, 'name': self.names[position], 'id': self.node_ids[position],
+                                    'score': round(score, 4), 'match': 'fuzzy'})
+        return results
+
+    def best(self, query: str) -> Optional[str]:
+        """Node ID of the most specific name containing or contained in query, or None."""
+        results = self.lookup(query, limit=1)
+        return results[0]['id'] if results else None
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Transitive prerequisite closure of the learning graph as bitsets
+
+find_missing_prerequisites used to walk predecessors breadth-first on every
+call. PrerequisiteClosure precomputes, for every node, the set of nodes it
+transitively depends on through 'prerequisite' and 'sequence' edges, so a
+user's missing prerequisites are one bitwise expression:
+
+    closure[target] & ~known
+
+Bit positions are topological ranks: a prerequisite always ranks below the
+nodes that depend on it (nodes in a prerequisite cycle share one strongly
+connected component and get consecutive ranks). Reading set bits in ascending
+order therefore yields a valid learning order without sorting.
+
+Ranks follow graph_data.json order wherever the prerequisites allow, so a node
+and its prerequisites usually rank close together even in a large graph.
+Closures are Python ints stored relative to their lowest set bit, and queries
+only look at the bits between the target's lowest and highest prerequisite;
+a node's bitset costs its rank span / 8 bytes rather than node count / 8.
+All state is five NumPy arrays (ARRAY_NAMES), so the index is compiled into
+the graph snapshot and memory-mapped like the CSR graph.
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_array
+from scipy.sparse.csgraph import connected_components
+
+from csr_graph import CSRGraph
+
+PREREQUISITE_EDGE_TYPES = ('prerequisite', 'sequence')
+
+
+def _to_bytes(bits: int) -> bytes:
+    return bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+
+
+class PrerequisiteClosure:
+    """Per-node transitive prerequisite sets and a topological rank over a CSRGraph."""
+
+    # Array attributes, in the order they are written to a compiled graph snapshot
+    ARRAY_NAMES = ('closure_rank', 'closure_order', 'closure_base', 'closure_offsets', 'closure_blob')
+
+    def __init__(self, csr: CSRGraph, arrays: Dict[str, np.ndarray]):
+        """
+        Args:
+            csr: The graph the closure was built from (node IDs and index).
+            arrays: closure_rank[node] is the node's topological rank and closure_order[rank]
+                the node at that rank; node i's closure is the little-endian integer in
+                closure_blob[closure_offsets[i]:closure_offsets[i + 1]], shifted left by
+                closure_base[i] bits.
+        """
+        self.csr = csr
+        for name in self.ARRAY_NAMES:
+            setattr(self, name, arrays[name])
+
+    @classmethod
+    def build(cls, csr: CSRGraph, edge_types: Iterable[str] = PREREQUISITE_EDGE_TYPES) -> "PrerequisiteClosure":
+        """Compute ranks and closures over the edges of the given types."""
+        n = len(csr)
+        codes = [csr.edge_type_codes[name] for name in edge_types if name in csr.edge_type_codes]
+        rows = np.repeat(np.arange(n, dtype=np.int32), np.diff(csr.out_indptr))
+        mask = np.isin(csr.out_types, codes)
+        sources, targets = rows[mask], csr.out_indices[mask]
+
+        # Condense prerequisite cycles so the component graph is a DAG
+        adjacency = csr_array((np.ones(len(sources), dtype=np.int8), (sources, targets)), shape=(n, n))
+        component_count, labels = connected_components(adjacency, directed=True, connection='strong')
+        members: List[List[int]] = [[] for _ in range(component_count)]
+        for node in range(n):
+            members[labels[node]].append(node)
+
+        cyclic = np.zeros(component_count, dtype=bool)
+        component_edges = set()
+        for source, target in zip(labels[sources].tolist(), labels[targets].tolist()):
+            if source == target:
+                cyclic[source] = True
+            else:
+                component_edges.add((source, target))
+        predecessors: List[List[int]] = [[] for _ in range(component_count)]
+        successors: List[List[int]] = [[] for _ in range(component_count)]
+        for source, target in sorted(component_edges):
+            predecessors[target].append(source)
+            successors[source].append(target)
+
+        # Kahn's algorithm, always taking the ready component whose first node comes
+        # earliest in the graph, so ranks keep graph order wherever prerequisites allow
+        in_degree = [len(p) for p in predecessors]
+        ready = [(members[c][0], c) for c in range(component_count) if in_degree[c] == 0]
+        heapq.heapify(ready)
+        component_order = []
+        while ready:
+            _, component = heapq.heappop(ready)
+            component_order.append(component)
+            for successor in successors[component]:
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    heapq.heappush(ready, (members[successor][0], successor))
+
+        order = np.array([node for c in component_order for node in members[c]], dtype=np.int32)
+        rank = np.empty(n, dtype=np.int32)
+        rank[order] = np.arange(n, dtype=np.int32)
+
+        # Closures in topological order: (base, bits) with bits relative to the lowest set bit
+        closures: List[Tuple[int, int]] = [(0, 0)] * component_count
+        member_bits = [(int(rank[m[0]]), (1 << len(m)) - 1) for m in members]
+        for component in component_order:
+            parts = [closures[p] for p in predecessors[component]] + [member_bits[p] for p in predecessors[component]]
+            if cyclic[component] or len(members[component]) > 1:
+                parts.append(member_bits[component])
+            closures[component] = cls._union(parts)
+
+        bases = np.zeros(n, dtype=np.int32)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        encoded = []
+        for node in range(n):
+            base, bits = closures[labels[node]]
+            data = _to_bytes(bits)
+            bases[node] = base
+            offsets[node + 1] = offsets[node] + len(data)
+            encoded.append(data)
+
+        return cls(csr, {
+            'closure_rank': rank,
+            'closure_order': order,
+            'closure_base': bases,
+            'closure_offsets': offsets,
+            'closure_blob': np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        })
+
+    @staticmethod
+    def _union(parts: List[Tuple[int, int]]) -> Tuple[int, int]:
+        parts = [(base, bits) for base, bits in parts if bits]
+        if not parts:
+            return 0, 0
+        low = min(base for base, _ in parts)
+        bits = 0
+        for base, part in parts:
+            bits |= part << (base - low)
+        # Re-anchor at the lowest set bit
+        shift = (bits & -bits).bit_length() - 1
+        return low + shift, bits >> shift
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in self.ARRAY_NAMES}
+
+    def matrix(self) -> csr_array:
+        """Sparse nodes x nodes matrix; row i marks everything node i depends on (built once, on first use)."""
+        if getattr(self, '_matrix', None) is None:
+            n = len(self.closure_rank)
+            # Decode every bitset at once: set bit -> owning node (row) and rank (column)
+            positions = np.flatnonzero(np.unpackbits(np.asarray(self.closure_blob), bitorder='little'))
+            rows = np.searchsorted(self.closure_offsets, positions // 8, side='right') - 1
+            ranks = self.closure_base[rows] + (positions - self.closure_offsets[rows] * 8)
+            self._matrix = csr_array((np.ones(len(rows), dtype=np.int8), (rows, self.closure_order[ranks])),
+                                     shape=(n, n))
+        return self._matrix
+
+    # -- Queries ---------------------------------------------------------------
+
+    def rank(self, node_id) -> Optional[int]:
+        """Topological rank of node_id (prerequisites rank lower), or None if unknown."""
+        i = self.csr.index.get(node_id)
+        return None if i is None else int(self.closure_rank[i])
+
+    def _closure(self, i: int) -> Tuple[int, int]:
+        """(base, bits): node i depends on the nodes ranked base + k for each set bit k."""
+        data = self.closure_blob[self.closure_offsets[i]:self.closure_offsets[i + 1]].tobytes()
+        return int(self.closure_base[i]), int.from_bytes(data, 'little')
+
+    def closure(self, node_id) -> List[str]:
+        """Everything node_id transitively depends on, prerequisites first."""
+        i = self.csr.index.get(node_id)
+        return [] if i is None else self._node_ids(*self._closure(i))
+
+    def missing(self, known: Iterable[str], target) -> List[str]:
+        """Transitive prerequisites of target not implied by known, prerequisites first.
+
+        Knowing a node implies knowing everything it depends on. Only bits inside the
+        target's closure window are computed, and a known node ranked below the window
+        is skipped outright since its own prerequisites rank lower still.
+        """
+        i = self.csr.index.get(target)
+        if i is None:
+            return []
+        base, bits = self._closure(i)
+        if not bits:
+            return []
+        top = base + bits.bit_length()
+
+        # The target itself is never its own prerequisite, even inside a cycle
+        target_rank = int(self.closure_rank[i])
+        known_bits = 1 << (target_rank - base) if base <= target_rank < top else 0
+        for node_id in known:
+            k = self.csr.index.get(node_id)
+            if k is None:
+                continue
+            rank = int(self.closure_rank[k])
+            if rank < base:
+                continue
+            if rank < top:
+                known_bits |= 1 << (rank - base)
+            known_base, known_closure = self._closure(k)
+            if known_closure and known_base < top:
+                if known_base >= base:
+                    known_bits |= known_closure << (known_base - base)
+                else:
+                    known_bits |= known_closure >> (base - known_base)
+        return self._node_ids(base, bits & ~known_bits)
+
+    def _node_ids(self, base: int, bits: int) -> List[str]:
+        if bits <= 0:
+            return []
+        ranks = np.flatnonzero(np.unpackbits(np.frombuffer(_to_bytes(bits), dtype=np.uint8), bitorder='little'))
+        return [self.csr.node_ids[k] for k in self.closure_order[ranks + base]]
@@ -0,0 +1,856 @@
+#!/usr/bin/env python3
+"""
+Command line interface for the Real Graph-Based Learning Path Analyzer
+
+RealGraphLearningAnalyzer is a headless engine: it returns structured results
+and never prints or prompts, so the chat handler can call it on the request
+path. This module is the console presentation layer on top of it: the
+interactive subtopic selection, the analysis reports and the matplotlib
+visualizations.
+
+Usage:
+    python real_graph_cli.py --target 'Queue' [--completed 'Array' ...] [--interactive] [--visualize]
+    python real_graph_cli.py --source-subtopic 'Array Deletion' --target-subtopic 'Array Sorting'
+    python real_graph_cli.py --demo-subtopic-paths
+"""
+
+import argparse
+import sys
+from collections import defaultdict
+from datetime import datetime
+
+import matplotlib.pyplot as plt
+import matplotlib.patches as mpatches
+import networkx as nx
+
+from real_graph_analyzer import RealGraphLearningAnalyzer
+
+
+def prompt_completed_subtopics(analyzer):
+    """Interactive selection of completed subtopics."""
+    print("\n" + "="*80)
+    print("📝 SUBTOPIC COMPLETION ANALYSIS")
+    print("="*80)
+    print("Let's analyze your progress at the subtopic level for more precise gap analysis.")
+
+    completed_subtopics = []
+
+    # Show all available subtopics grouped by topic
+    topics_with_subtopics = {}
+    for topic in analyzer.topics:
+        topic_id = topic['id']
+        subtopics = analyzer.get_all_subtopics_for_topic(topic_id)
+        if subtopics:
+            topics_with_subtopics[topic_id] = subtopics
+
+    print(f"\n📚 Available Topics with Subtopics:")
+    for i, (topic_id, subtopics) in enumerate(topics_with_subtopics.items(), 1):
+        topic_data = analyzer.all_id_to_data[topic_id]
+        print(f"\n{i}. {topic_data['name']} (ID: {topic_id}) - {len(subtopics)} subtopics")
+        for j, subtopic_id in enumerate(subtopics, 1):
+            subtopic_data = analyzer.all_id_to_data[subtopic_id]
+            print(f"   {j}. {subtopic_data['name']} (ID: {subtopic_id})")
+
+    # Interactive selection
+    while True:
+        print(f"\n📋 Current completed subtopics: {len(completed_subtopics)}")
+        if completed_subtopics:
+            for subtopic_id in completed_subtopics:
+                subtopic_data = analyzer.all_id_to_data[subtopic_id]
+                print(f"   ✅ {subtopic_data['name']} (ID: {subtopic_id})")
+
+        print(f"\nOptions:")
+        print(f"1. Add completed subtopic by name")
+        print(f"2. Add completed subtopic by ID")
+        print(f"3. Remove subtopic from completed list")
+        print(f"4. Continue with analysis")
+        print(f"5. Show subtopic connections")
+
+        choice = input("Choose option (1-5): ").strip()
+
+        if choice == '1':
+            name = input("Enter subtopic name: ").strip()
+            subtopic_id = analyzer.find_node_by_name(name)
+            if subtopic_id and analyzer.all_id_to_data[subtopic_id].get('type') == 'subtopic':
+                if subtopic_id not in completed_subtopics:
+                    completed_subtopics.append(subtopic_id)
+                    subtopic_data = analyzer.all_id_to_data[subtopic_id]
+                    print(f"✅ Added: {subtopic_data['name']}")
+                else:
+                    print("⚠️  Already in completed list")
+            else:
+                print(f"❌ Subtopic '{name}' not found")
+
+        elif choice == '2':
+            subtopic_id = input("Enter subtopic ID: ").strip()
+            if subtopic_id in analyzer.all_id_to_data and analyzer.all_id_to_data[subtopic_id].get('type') == 'subtopic':
+                if subtopic_id not in completed_subtopics:
+                    completed_subtopics.append(subtopic_id)
+                    subtopic_data = analyzer.all_id_to_data[subtopic_id]
+                    print(f"✅ Added: {subtopic_data['name']}")
+                else:
+                    print("⚠️  Already in completed list")
+            else:
+                print(f"❌ Subtopic ID '{subtopic_id}' not found")
+
+        elif choice == '3':
+            if completed_subtopics:
+                print("Select subtopic to remove:")
+                for i, subtopic_id in enumerate(completed_subtopics, 1):
+                    subtopic_data = analyzer.all_id_to_data[subtopic_id]
+                    print(f"   {i}. {subtopic_data['name']}")
+                try:
+                    idx = int(input("Enter number: ")) - 1
+                    if 0 <= idx < len(completed_subtopics):
+                        removed = completed_subtopics.pop(idx)
+                        removed_data = analyzer.all_id_to_data[removed]
+                        print(f"❌ Removed: {removed_data['name']}")
+                except ValueError:
+                    print("Invalid selection")
+            else:
+                print("No subtopics to remove")
+
+        elif choice == '4':
+            break
+
+        elif choice == '5':
+            print_subtopic_connections(analyzer)
+
+    return completed_subtopics
+
+
+def print_subtopic_connections(analyzer):
+    """Show connections between subtopics."""
+    print("\n🔗 SUBTOPIC CONNECTIONS:")
+    print("-" * 60)
+
+    connections = analyzer.get_subtopic_connections()
+    subtopic_connections = connections['subtopic_connections']
+    if subtopic_connections:
+        print(f"Found {len(subtopic_connections)} subtopic-to-subtopic connections:")
+        for i, edge in enumerate(subtopic_connections[:10], 1):  # Show first 10
+            source_data = analyzer.all_id_to_data[edge['source']]
+            target_data = analyzer.all_id_to_data[edge['target']]
+            edge_type = edge.get('type', 'default')
+            print(f"   {i}. {source_data['name']} → {target_data['name']} ({edge_type})")
+
+        if len(subtopic_connections) > 10:
+            print(f"   ... and {len(subtopic_connections) - 10} more connections")
+    else:
+        print("No direct subtopic-to-subtopic connections found in the graph.")
+
+    # Show topic-subtopic relationships
+    print(f"\n📚 Topic-Subtopic Relationships:")
+    for topic_id, count in connections['topic_subtopic_counts'][:3]:  # Show first 3 topics
+        print(f"   📖 {analyzer.all_id_to_data[topic_id]['name']}: {count} subtopics")
+
+
+def print_subtopic_gap_analysis(analyzer, target_topic_id, completed_subtopics, subtopic_analysis):
+    """Report the subtopic-level gaps returned by analyze_subtopic_learning_gaps."""
+    print("\n" + "="*80)
+    print("🔍 SUBTOPIC-LEVEL GAP ANALYSIS")
+    print("="*80)
+
+    target_data = analyzer.all_id_to_data[target_topic_id]
+    completed_in_target = subtopic_analysis['completed_in_target']
+
+    print(f"🎯 Target Topic: {target_data['name']}")
+    print(f"📝 Total subtopics in target: {len(subtopic_analysis['target_subtopics'])}")
+    print(f"✅ Completed subtopics overall: {len(completed_subtopics)}")
+    print(f"✅ Completed in target topic: {len(completed_in_target)}")
+    print(f"❌ Missing in target topic: {len(subtopic_analysis['missing_in_target'])}")
+
+    # Show detailed breakdown
+    if completed_in_target:
+        print(f"\n✅ COMPLETED SUBTOPICS IN TARGET:")
+        for i, subtopic_id in enumerate(completed_in_target, 1):
+            subtopic_data = analyzer.all_id_to_data[subtopic_id]
+            print(f"   {i}. {subtopic_data['name']} (ID: {subtopic_id})")
+
+    if subtopic_analysis['missing_priorities']:
+        print(f"\n❌ MISSING SUBTOPICS IN TARGET:")
+        for i, (subtopic_id, priority) in enumerate(subtopic_analysis['missing_priorities'], 1):
+            subtopic_data = analyzer.all_id_to_data[subtopic_id]
+            print(f"   {i}. {subtopic_data['name']} (ID: {subtopic_id}) - Priority: {priority:.2f}")
+            print(f"      Description: {subtopic_data.get('description', 'No description')[:60]}...")
+
+    if subtopic_analysis['prerequisite_subtopics']:
+        print(f"\n⚡ PREREQUISITE SUBTOPICS FROM OTHER TOPICS:")
+        for i, subtopic_id in enumerate(subtopic_analysis['prerequisite_subtopics'], 1):
+            subtopic_data = analyzer.all_id_to_data[subtopic_id]
+            parent_data = analyzer.all_id_to_data.get(subtopic_data.get('parent_topic'), {})
+            print(f"   {i}. {subtopic_data['name']} from {parent_data.get('name', 'Unknown')} (ID: {subtopic_id})")
+
+
+def print_cluster_analysis(analyzer, cluster_analysis):
+    """Show cluster-based analysis."""
+    print(f"\n🔍 CLUSTER ANALYSIS:")
+    print("-" * 60)
+
+    if cluster_analysis is None:
+        return
+
+    missing_in_cluster = cluster_analysis['missing_in_cluster']
+    print(f"   🎯 Target belongs to cluster {cluster_analysis['cluster_id']}")
+    print(f"   📊 Cluster size: {len(cluster_analysis['cluster_topics'])} topics")
+    print(f"   ✅ Completed in cluster: {len(cluster_analysis['completed_in_cluster'])}")
+    print(f"   📋 Still to learn: {len(missing_in_cluster)}")
+
+    if missing_in_cluster:
+        print(f"   🔸 Related topics in same cluster:")
+        for topic_id in missing_in_cluster[:3]:
+            topic_data = analyzer.all_id_to_data.get(topic_id, {})
+            print(f"      • {topic_data.get('name', 'Unknown')} (ID: {topic_id})")
+
+
+def print_topic_relationships(analyzer, relationships):
+    """Show real graph relationships for a topic."""
+    prerequisites = relationships['prerequisites']
+    if prerequisites:
+        print(f"      ⚡ Prerequisites: {len(prerequisites)}")
+        for prereq_id in prerequisites[:2]:  # Show first 2
+            prereq_data = analyzer.all_id_to_data.get(prereq_id, {})
+            print(f"         • {prereq_data.get('name', 'Unknown')}")
+
+    if relationships['leads_to']:
+        print(f"      🎯 Leads to: {len(relationships['leads_to'])} topics")
+
+
+def print_recommendations(recommendations):
+    """Provide detailed recommendations based on subtopic analysis."""
+    print(f"\n💡 SUBTOPIC-BASED LEARNING RECOMMENDATIONS:")
+    print("-" * 60)
+
+    print(recommendations['headline'])
+    for i, step in enumerate(recommendations['steps'], 1):
+        print(f"   {i}. {step}")
+
+    if recommendations['prerequisite_count'] > 0:
+        print(f"\n⚡ PRIORITY: Complete {recommendations['prerequisite_count']} prerequisite subtopics first")
+
+    if recommendations['missing_count'] > 0:
+        print(f"📝 FOCUS: {recommendations['missing_count']} subtopics remaining in target topic")
+
+
+def print_target_topic_analysis(analyzer, target_details):
+    """Show detailed analysis of the target topic."""
+    print(f"\n🎯 TARGET TOPIC DETAILED ANALYSIS:")
+    print("-" * 60)
+
+    target_data = target_details['node']
+    subtopics = target_details['subtopics']
+
+    print(f"   📖 Name: {target_data['name']}")
+    print(f"   🆔 ID: {target_details['id']}")
+    print(f"   📊 Level: {target_data.get('level', 'Unknown').upper()}")
+    print(f"   📝 Description: {target_data.get('description', 'No description')}")
+    print(f"   🔸 Total subtopics: {len(subtopics)}")
+    print(f"   📊 Graph metrics: {target_details['in_degree']} incoming, {target_details['out_degree']} outgoing connections")
+
+    if subtopics:
+        print(f"\n   🔸 All Target Subtopics:")
+        for i, subtopic_id in enumerate(subtopics, 1):
+            subtopic_data = analyzer.all_id_to_data.get(subtopic_id, {})
+            print(f"      {i:2d}. {subtopic_data.get('name', 'Unknown')} (ID: {subtopic_id})")
+            if i >= 10:  # Limit display
+                print(f"      ... and {len(subtopics) - 10} more")
+                break
+
+
+def print_gap_analysis(analyzer, result):
+    """Full console report for a result of analyze_learning_gap_with_real_graph."""
+    print("\n" + "="*100)
+    print("🎯 REAL GRAPH-BASED LEARNING GAP ANALYSIS")
+    print("="*100)
+
+    for topic_id in result['completed_topic_ids']:
+        print(f"✅ Completed: {analyzer.all_id_to_data[topic_id]['name']} (ID: {topic_id})")
+    for name in result['unresolved_topics']:
+        print(f"⚠️  Warning: Topic '{name}' not found")
+
+    target_topic_id = result['target_topic_id']
+    target_data = analyzer.all_id_to_data[target_topic_id]
+    print(f"🎯 Target: {target_data['name']} (ID: {target_topic_id})")
+
+    subtopic_analysis = result['subtopic_analysis']
+    print_subtopic_gap_analysis(analyzer, target_topic_id, result['completed_subtopics'], subtopic_analysis)
+
+    path_result = result['path_result']
+    print(f"\n📊 GRAPH ANALYSIS RESULTS:")
+    print("-" * 60)
+    print(f"   🔍 Analysis method: {path_result['reason'].replace('_', ' ').title()}")
+    print(f"   📏 Path distance: {path_result.get('distance', 'N/A')}")
+    print(f"   🎯 Topics in path: {len(path_result['path'])}")
+
+    print_cluster_analysis(analyzer, result['cluster_analysis'])
+
+    # Show detailed path analysis
+    if result['path_steps']:
+        print(f"\n📚 OPTIMAL LEARNING PATH:")
+        print("-" * 60)
+
+        for i, step in enumerate(result['path_steps'], 1):
+            topic_id = step['id']
+            topic_data = analyzer.all_id_to_data.get(topic_id, {})
+            print(f"\n   📌 STEP {i}: {topic_data.get('name', 'Unknown')} (ID: {topic_id})")
+            print(f"      📊 Level: {topic_data.get('level', 'Unknown').upper()}")
+            print(f"      📝 Description: {topic_data.get('description', 'No description')[:100]}...")
+
+            print_topic_relationships(analyzer, step['relationships'])
+
+            subtopics = step['subtopics']
+            if subtopics:
+                print(f"      🔸 Subtopics ({len(subtopics)}):")
+                for j, subtopic_id in enumerate(subtopics[:5], 1):  # Show first 5
+                    subtopic_data = analyzer.all_id_to_data.get(subtopic_id, {})
+                    print(f"         {j}. {subtopic_data.get('name', 'Unknown')} (ID: {subtopic_id})")
+                if len(subtopics) > 5:
+                    print(f"         ... and {len(subtopics) - 5} more subtopics")
+    else:
+        print(f"\n🎉 EXCELLENT! You can start learning {target_data['name']} immediately!")
+
+    # Show subtopic analysis results
+    print(f"\n📈 SUBTOPIC ANALYSIS SUMMARY:")
+    print("-" * 60)
+    print(f"   🎯 Target completion: {subtopic_analysis['completion_percentage']:.1f}%")
+    print(f"   ✅ Completed subtopics: {len(subtopic_analysis['completed_in_target'])}")
+    print(f"   ❌ Missing subtopics: {len(subtopic_analysis['missing_in_target'])}")
+    print(f"   ⚡ Prerequisites needed: {len(subtopic_analysis['prerequisite_subtopics'])}")
+
+    print_recommendations(result['recommendations'])
+    print_target_topic_analysis(analyzer, result['target_details'])
+
+
+def print_subtopic_path(analyzer, source_subtopic_name, target_subtopic_name, result):
+    """Report a result of find_subtopic_to_subtopic_path, including why it may be missing."""
+    print(f"\n🎯 SUBTOPIC-TO-SUBTOPIC LEARNING PATH")
+    print("=" * 80)
+    print(f"From: {source_subtopic_name} → To: {target_subtopic_name}")
+
+    if result is None:
+        source_id = analyzer.find_node_by_name(source_subtopic_name)
+        target_id = analyzer.find_node_by_name(target_subtopic_name)
+        if not source_id:
+            print(f"❌ Source subtopic '{source_subtopic_name}' not found")
+        elif not target_id:
+            print(f"❌ Target subtopic '{target_subtopic_name}' not found")
+        elif 'subtopic' != analyzer.all_id_to_data[source_id].get('type') or \
+                'subtopic' != analyzer.all_id_to_data[target_id].get('type'):
+            print(f"❌ Both nodes must be subtopics")
+        else:
+            print("❌ No direct learning path found between these subtopics")
+        return
+
+    if result.get('analysis') == 'already_completed':
+        print("🎉 You already know the target subtopic!")
+        return
+
+    print(f"✅ Source: {result['source']['name']} (ID: {result['source']['id']})")
+    print(f"✅ Target: {result['target']['name']} (ID: {result['target']['id']})")
+
+    if result.get('path_type') == 'alternative_through_topics':
+        print("❌ No direct learning path found between these subtopics")
+        print(f"✅ Alternative path found through topics: {len(result['topic_path'])} topic steps")
+        return
+
+    print(f"✅ Learning path found: {len(result['path'])} steps")
+    print(f"📏 Path complexity: {result['path_length']:.2f}")
+
+    print(f"\n📚 DETAILED LEARNING PATH:")
+    print("=" * 60)
+    for step in result['analysis']['steps']:
+        print(f"   📌 STEP {step['position']}: {step['name']}")
+        print(f"      {step['status'].split(' ')[0]} Status: {step['status']}")
+        print(f"      🆔 ID: {step['id']}")
+        print(f"      🏷️  Type: {step['type']}")
+        print(f"      📊 Level: {step['level']}")
+        print(f"      📝 Description: {step['description'][:80]}...")
+        if 'importance' in step:
+            print(f"      💡 Why important: {step['importance']}")
+            if step['connections']:
+                print(f"      🔗 Related concepts: {', '.join(step['connections'][:3])}")
+        print()
+
+    print(f"⏱️  LEARNING TIMELINE:")
+    print(f"   📅 Total duration: {result['analysis']['total_time_weeks']} weeks")
+    print(f"   🎯 Focus per week: 1 subtopic")
+    print(f"   📚 Study time per week: 10-15 hours")
+
+    print(f"\n📅 WEEKLY STUDY PLAN:")
+    print("=" * 60)
+    for week in result['study_plan']['weekly_plans']:
+        print(f"🗓️  WEEK {week['week']}: {week['subtopic']}")
+        print(f"   🎯 Primary Goal: Master {week['subtopic']} concepts")
+        print(f"   📚 Monday-Tuesday: Theory and Fundamentals")
+        print(f"      • Read documentation and tutorials")
+        print(f"      • Understand core concepts")
+        print(f"      • Watch educational videos")
+        print(f"   💻 Wednesday-Thursday: Implementation Practice")
+        print(f"      • Code implementations from scratch")
+        print(f"      • Work through examples")
+        print(f"      • Debug and optimize code")
+        print(f"   🧪 Friday-Weekend: Problem Solving")
+        print(f"      • Solve 5-10 practice problems")
+        print(f"      • Apply concepts in different contexts")
+        print(f"      • Review and connect to previous learning")
+        print()
+
+
+def create_subtopic_visualization(analyzer, completed_subtopics, target_topic_id, subtopic_analysis):
+    """Create enhanced visualization showing subtopic-level analysis."""
+    plt.figure(figsize=(24, 18))
+
+    # Create subgraph with target topic and related subtopics
+    relevant_nodes = set()
+
+    # Add target topic and its subtopics
+    relevant_nodes.add(target_topic_id)
+    target_subtopics = subtopic_analysis['target_subtopics']
+    relevant_nodes.update(target_subtopics)
+
+    # Add prerequisite subtopics
+    relevant_nodes.update(subtopic_analysis['prerequisite_subtopics'])
+
+    # Add completed subtopics and their parent topics
+    for subtopic_id in completed_subtopics:
+        relevant_nodes.add(subtopic_id)
+        subtopic_data = analyzer.all_id_to_data[subtopic_id]
+        parent_topic = subtopic_data.get('parent_topic')
+        if parent_topic:
+            relevant_nodes.add(parent_topic)
+
+    # Create subgraph
+    subgraph = analyzer.graph.subgraph(relevant_nodes)
+
+    # Enhanced layout
+    pos = nx.spring_layout(subgraph, k=4, iterations=200, seed=42)
+
+    # Define node categories with colors
+    completed_subtopics_set = set(completed_subtopics)
+    completed_in_target = set(subtopic_analysis['completed_in_target'])
+    missing_in_target = set(subtopic_analysis['missing_in_target'])
+    prerequisite_subtopics = set(subtopic_analysis['prerequisite_subtopics'])
+
+    # Node styling
+    node_configs = [
+        ([target_topic_id], {"color": "#D32F2F", "size": 1500, "shape": "D", "label": "🎯 Target Topic"}),
+        (completed_in_target, {"color": "#4CAF50", "size": 800, "shape": "s", "label": "✅ Completed in Target"}),
+        (missing_in_target, {"color": "#FF9800", "size": 800, "shape": "s", "label": "❌ Missing in Target"}),
+        (prerequisite_subtopics, {"color": "#9C27B0", "size": 700, "shape": "^", "label": "⚡ Prerequisites"}),
+        (completed_subtopics_set - completed_in_target, {"color": "#2196F3", "size": 600, "shape": "s", "label": "✅ Other Completed"}),
+    ]
+
+    # Draw nodes
+    legend_elements = []
+    for nodes, config in node_configs:
+        nodes_in_graph = [n for n in nodes if n in subgraph]
+        if nodes_in_graph:
+            nx.draw_networkx_nodes(
+                subgraph, pos,
+                nodelist=nodes_in_graph,
+                node_color=config["color"],
+                node_size=config["size"],
+                node_shape=config["shape"],
+                alpha=0.9,
+                edgecolors="black",
+                linewidths=2
+            )
+            legend_elements.append(
+                mpatches.Patch(color=config["color"], label=config["label"])
+            )
+
+    # Draw other nodes (topics)
+    other_nodes = [n for n in subgraph.nodes()
+                  if n not in relevant_nodes or analyzer.all_id_to_data[n].get('type') == 'topic']
+    if other_nodes:
+        nx.draw_networkx_nodes(
+            subgraph, pos,
+            nodelist=other_nodes,
+            node_color="#E0E0E0",
+            node_size=400,
+            node_shape="o",
+            alpha=0.6
+        )
+
+    # Enhanced edge drawing with subtopic connections highlighted
+    edge_configs = {
+        "prerequisite": {"color": "#C62828", "width": 3, "alpha": 0.9},
+        "sequence": {"color": "#1565C0", "width": 2.5, "alpha": 0.8},
+        "contains": {"color": "#6A1B9A", "width": 2, "alpha": 0.7},
+        "leads_to": {"color": "#2E7D32", "width": 1.5, "alpha": 0.6},
+        "related": {"color": "#5D4037", "width": 1, "alpha": 0.5}
+    }
+
+    # Group edges by type
+    edges_by_type = defaultdict(list)
+    for u, v, data in subgraph.edges(data=True):
+        edge_type = data.get('type', 'related')
+        edges_by_type[edge_type].append((u, v))
+
+    # Draw edges
+    for edge_type, edges in edges_by_type.items():
+        config = edge_configs.get(edge_type, edge_configs["related"])
+        if edges:
+            nx.draw_networkx_edges(
+                subgraph, pos,
+                edgelist=edges,
+                edge_color=config["color"],
+                width=config["width"],
+                alpha=config["alpha"],
+                arrows=True,
+                arrowsize=20,
+                arrowstyle="->",
+                connectionstyle="arc3,rad=0.1"
+            )
+
+    # Enhanced labels
+    labels = {}
+    for node in subgraph.nodes():
+        node_data = analyzer.all_id_to_data[node]
+        name = node_data['name']
+        if len(name) > 10:
+            name = name[:10] + "..."
+        labels[node] = f"{name}\n({node})"
+
+    nx.draw_networkx_labels(subgraph, pos, labels, font_size=8, font_weight="bold",
+                           bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8))
+
+    # Create comprehensive legend
+    plt.legend(handles=legend_elements, loc="upper left", title="🎨 Subtopic Analysis",
+              fontsize=12, title_fontsize=14, framealpha=0.9)
+
+    # Enhanced title with statistics
+    target_data = analyzer.all_id_to_data[target_topic_id]
+    completion_pct = subtopic_analysis['completion_percentage']
+
+    title = f"🔍 Subtopic-Level Learning Gap Analysis: {target_data['name']}\n"
+    title += f"📊 Completion: {completion_pct:.1f}% | "
+    title += f"✅ {len(completed_in_target)} Completed | "
+    title += f"❌ {len(missing_in_target)} Missing | "
+    title += f"⚡ {len(prerequisite_subtopics)} Prerequisites"
+
+    plt.title(title, fontsize=16, fontweight='bold', pad=30)
+    plt.axis('off')
+    plt.tight_layout()
+
+    # Save visualization
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = f"subtopic_analysis_{timestamp}.png"
+    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+
+    print(f"\n🎨 Subtopic visualization saved as: {output_file}")
+    plt.show()
+
+    return output_file
+
+
+def visualize_subtopic_learning_path(analyzer, path, source_name, target_name):
+    """Create visualization for subtopic learning path."""
+    try:
+        plt.figure(figsize=(16, 10))
+
+        # Create subgraph with path nodes and immediate neighbors
+        path_nodes = set(path)
+        extended_nodes = set(path)
+
+        # Add immediate neighbors for context
+        for node_id in path:
+            neighbors = list(analyzer.graph.predecessors(node_id)) + list(analyzer.graph.successors(node_id))
+            for neighbor in neighbors[:2]:  # Limit to 2 neighbors per node
+                if analyzer.all_id_to_data[neighbor].get('type') == 'subtopic':
+                    extended_nodes.add(neighbor)
+
+        subgraph = analyzer.graph.subgraph(extended_nodes)
+
+        # Create layout
+        pos = nx.spring_layout(subgraph, k=3, iterations=50, seed=42)
+
+        # Color nodes based on their role in the path
+        node_colors = []
+        node_sizes = []
+
+        for node_id in subgraph.nodes():
+            if node_id == path[0]:  # Source
+                node_colors.append('#4CAF50')  # Green
+                node_sizes.append(1000)
+            elif node_id == path[-1]:  # Target
+                node_colors.append('#F44336')  # Red
+                node_sizes.append(1000)
+            elif node_id in path_nodes:  # Path nodes
+                node_colors.append('#2196F3')  # Blue
+                node_sizes.append(800)
+            else:  # Context nodes
+                node_colors.append('#E0E0E0')  # Light gray
+                node_sizes.append(400)
+
+        # Draw nodes
+        nx.draw_networkx_nodes(subgraph, pos, node_color=node_colors,
+                             node_size=node_sizes, alpha=0.8)
+
+        # Draw edges with different colors for path vs context
+        path_edges = []
+        context_edges = []
+
+        for edge in subgraph.edges():
+            # Check if this is a path edge
+            is_path_edge = False
+            for i in range(len(path) - 1):
+                if (path[i] == edge[0] and path[i + 1] == edge[1]) or \
+                   (path[i + 1] == edge[0] and path[i] == edge[1]):
+                    path_edges.append(edge)
+                    is_path_edge = True
+                    break
+
+            if not is_path_edge:
+                context_edges.append(edge)
+
+        # Draw path edges
+        if path_edges:
+            nx.draw_networkx_edges(subgraph, pos, edgelist=path_edges,
+                                 edge_color='#FF9800', width=3, alpha=0.8,
+                                 arrows=True, arrowsize=20)
+
+        # Draw context edges
+        if context_edges:
+            nx.draw_networkx_edges(subgraph, pos, edgelist=context_edges,
+                                 edge_color='#CCCCCC', width=1, alpha=0.5,
+                                 arrows=True, arrowsize=15)
+
+        # Add labels
+        labels = {}
+        for node_id in subgraph.nodes():
+            node_name = analyzer.all_id_to_data[node_id]['name']
+            if len(node_name) > 12:
+                node_name = node_name[:10] + ".."
+            labels[node_id] = node_name
+
+        nx.draw_networkx_labels(subgraph, pos, labels, font_size=9, font_weight='bold')
+
+        # Add legend
+        legend_elements = [
+            mpatches.Patch(facecolor='#4CAF50', label=f'🏁 Start: {source_name}'),
+            mpatches.Patch(facecolor='#2196F3', label='📚 Learning Steps'),
+            mpatches.Patch(facecolor='#F44336', label=f'🎯 Goal: {target_name}'),
+            mpatches.Patch(facecolor='#E0E0E0', label='🔗 Related Concepts'),
+        ]
+
+        plt.legend(handles=legend_elements, loc='upper right')
+
+        # Set title
+        plt.title(f"🎯 Learning Path: {source_name} → {target_name}\n"
+                 f"📊 {len(path)} steps • ⏱️ ~{len(path)-1} weeks",
+                 fontsize=14, fontweight='bold', pad=20)
+
+        plt.axis('off')
+        plt.tight_layout()
+
+        # Save visualization
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"subtopic_path_{source_name.replace(' ', '_')}_{target_name.replace(' ', '_')}_{timestamp}.png"
+        plt.savefig(filename, dpi=300, bbox_inches='tight', facecolor='white')
+        print(f"💾 Visualization saved: {filename}")
+
+        plt.show()
+
+    except Exception as e:
+        print(f"⚠️ Visualization failed: {e}")
+
+
+def run_subtopic_path(analyzer, source, target, visualize=False):
+    """Find, report and optionally draw one subtopic-to-subtopic path."""
+    result = analyzer.find_subtopic_to_subtopic_path(source, target)
+    print_subtopic_path(analyzer, source, target, result)
+    if result and visualize and len(result.get('path', [])) > 1:
+        print("\n🎨 Creating visualization...")
+        visualize_subtopic_learning_path(analyzer, result['path'], source, target)
+    return result
+
+
+def run_subtopic_path_demo(analyzer, demo_cases=None):
+    """Run demonstrations for different subtopic-to-subtopic scenarios."""
+    print("🚀 SUBTOPIC-TO-SUBTOPIC LEARNING PATH DEMONSTRATIONS")
+    print("=" * 80)
+
+    if demo_cases is None:
+        # Default demo cases covering different topics
+        demo_cases = [
+            ("Array Deletion", "Array Sorting"),
+            ("Stack Push", "Stack Pop"),
+            ("Tree Traversal", "Tree Searching"),
+            ("Graph Vertex", "Graph Edge"),
+            ("Queue Enqueue", "Queue Dequeue"),
+            ("Hash Insert", "Hash Search"),
+            ("Binary Search", "Binary Tree"),
+            ("Linked List Insert", "Linked List Delete")
+        ]
+
+    successful_demos = 0
+
+    for i, (source, target) in enumerate(demo_cases, 1):
+        print(f"\n📋 DEMO {i}: {source} → {target}")
+        print("-" * 60)
+
+        # Create visualization for this path if it exists
+        result = run_subtopic_path(analyzer, source, target, visualize=True)
+
+        if result:
+            successful_demos += 1
+            print(f"✅ Demo {i} completed successfully!")
+        else:
+            print(f"❌ Demo {i} - No path found")
+
+        print("\n" + "="*80)
+
+    print(f"\n🎉 DEMO SUMMARY:")
+    print(f"   ✅ Successful demonstrations: {successful_demos}/{len(demo_cases)}")
+    print(f"   📊 Success rate: {successful_demos/len(demo_cases)*100:.1f}%")
+
+
+def run_gap_analysis(analyzer, completed, target, interactive=False, completed_subtopics=None, visualize=False):
+    """Run and report a topic-based gap analysis (prompting for subtopics when interactive)."""
+    if analyzer.find_node_by_name(target) is None:
+        print(f"❌ Error: Target topic '{target}' not found")
+        suggestions = analyzer.find_nodes_by_name(target, limit=3)
+        if suggestions:
+            print(f"💡 Did you mean: {', '.join(match['name'] for match in suggestions)}?")
+        return None
+
+    if interactive:
+        completed_subtopics = prompt_completed_subtopics(analyzer)
+    result = analyzer.analyze_learning_gap_with_real_graph(completed, target, completed_subtopics)
+    print_gap_analysis(analyzer, result)
+
+    if visualize:
+        print("\n🎨 Creating subtopic visualization...")
+        create_subtopic_visualization(
+            analyzer,
+            result['completed_subtopics'],
+            result['target_topic_id'],
+            result['subtopic_analysis']
+        )
+    return result
+
+
+def main():
+    """Main function with command line interface."""
+    parser = argparse.ArgumentParser(description="Real Graph-Based DSA Learning Path Analyzer with Subtopic Analysis")
+    parser.add_argument("--completed", nargs="*", default=[],
+                       help="Names of completed topics")
+    parser.add_argument("--completed-subtopics", nargs="*", default=[],
+                       help="IDs of completed subtopics (instead of --interactive)")
+    parser.add_argument("--target", type=str,
+                       help="Name of target topic")
+    parser.add_argument("--show-clusters", action="store_true",
+                       help="Show cluster analysis")
+    parser.add_argument("--interactive", action="store_true",
+                       help="Run interactive subtopic analysis")
+    parser.add_argument("--visualize", action="store_true",
+                       help="Create subtopic visualization")
+    parser.add_argument("--subtopic-path", action="store_true",
+                       help="Find path between two subtopics")
+    parser.add_argument("--source-subtopic", type=str,
+                       help="Source subtopic name for subtopic-to-subtopic path")
+    parser.add_argument("--target-subtopic", type=str,
+                       help="Target subtopic name for subtopic-to-subtopic path")
+    parser.add_argument("--demo-subtopic-paths", action="store_true",
+                       help="Run demo of various subtopic-to-subtopic paths")
+
+    args = parser.parse_args()
+
+    analyzer = RealGraphLearningAnalyzer()
+
+    if args.show_clusters:
+        print("\n🔍 TOPIC CLUSTERS:")
+        for cluster_id, topics in analyzer.clusters.items():
+            print(f"\nCluster {cluster_id}:")
+            for topic_id in topics:
+                topic_data = analyzer.all_id_to_data[topic_id]
+                print(f"  • {topic_data['name']} (ID: {topic_id})")
+        return
+
+    if args.demo_subtopic_paths:
+        # Run demo of multiple subtopic-to-subtopic scenarios
+        run_subtopic_path_demo(analyzer)
+        return
+
+    if args.subtopic_path or (args.source_subtopic and args.target_subtopic):
+        # Subtopic-to-subtopic path analysis
+        if not args.source_subtopic or not args.target_subtopic:
+            print("Error: Both --source-subtopic and --target-subtopic are required for subtopic path analysis")
+            return
+
+        run_subtopic_path(analyzer, args.source_subtopic, args.target_subtopic, visualize=args.visualize)
+        return
+
+    if args.target:
+        # Traditional topic-based analysis
+        run_gap_analysis(analyzer, args.completed, args.target, interactive=args.interactive,
+                         completed_subtopics=args.completed_subtopics, visualize=args.visualize)
+        return
+
+    # If no specific action specified, show help
+    print("🎯 DSA LEARNING PATH ANALYZER")
+    print("=" * 50)
+    print("Available modes:")
+    print("1. Topic Analysis: --target 'topic_name'")
+    print("2. Subtopic Path: --source-subtopic 'name' --target-subtopic 'name'")
+    print("3. Demo Multiple Paths: --demo-subtopic-paths")
+    print("4. Interactive Mode: --interactive")
+    print("5. Show Clusters: --show-clusters")
+    print("\nExamples:")
+    print("  python real_graph_cli.py --demo-subtopic-paths")
+    print("  python real_graph_cli.py --source-subtopic 'Array Deletion' --target-subtopic 'Array Sorting'")
+    print("  python real_graph_cli.py --target 'Queue' --interactive")
+
+
+def run_interactive_demo():
+    """Run an interactive demo of the subtopic analysis system."""
+    print("🚀 Enhanced Subtopic Analysis Demo")
+    print("=" * 80)
+
+    analyzer = RealGraphLearningAnalyzer()
+
+    print("Choose demo mode:")
+    print("1. Traditional Topic-based Analysis")
+    print("2. Subtopic-to-Subtopic Path Finding")
+    print("3. Multiple Subtopic Path Demonstrations")
+
+    try:
+        choice = input("\nEnter choice (1-3): ").strip()
+
+        if choice == "1":
+            # Traditional demo
+            print("\n📋 TRADITIONAL DEMO: Topic-based Analysis for Queue")
+            run_gap_analysis(analyzer, [], "Queue", interactive=True, visualize=True)
+
+        elif choice == "2":
+            # Subtopic-to-subtopic demo
+            print("\n📋 SUBTOPIC-TO-SUBTOPIC DEMO:")
+            source = input("Enter source subtopic (e.g., 'Array Deletion'): ").strip() or "Array Deletion"
+            target = input("Enter target subtopic (e.g., 'Array Sorting'): ").strip() or "Array Sorting"
+            run_subtopic_path(analyzer, source, target, visualize=True)
+
+        elif choice == "3":
+            # Multiple demonstrations
+            print("\n📋 MULTIPLE SUBTOPIC PATH DEMONSTRATIONS:")
+            run_subtopic_path_demo(analyzer)
+
+        else:
+            print("Invalid choice. Running default Array Deletion → Array Sorting demo.")
+            run_subtopic_path(analyzer, "Array Deletion", "Array Sorting")
+
+    except KeyboardInterrupt:
+        print("\n👋 Demo cancelled by user")
+    except Exception as e:
+        print(f"\n❌ Demo error: {e}")
+        # Fallback to simple demo
+        print("Running fallback demo...")
+        run_subtopic_path(analyzer, "Array Deletion", "Array Sorting")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 1:
+        # No arguments provided, run interactive demo
+        run_interactive_demo()
+    else:
+        main()
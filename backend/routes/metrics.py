@@ -0,0 +1,17 @@
+"""
+Metrics Routes
+
+Exposes application metrics in the Prometheus text exposition format.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from monitoring.metrics import REGISTRY, CONTENT_TYPE_LATEST
+
+router = APIRouter(tags=["monitoring"])
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
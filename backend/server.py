@@ -1,13 +1,20 @@
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, HTTPException, BackgroundTasks
 from pydantic import BaseModel, EmailStr
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from queryHandling.integrated_chat_handler import IntegratedChatHandler
 from routes.auth import router as auth_router
+from routes.metrics import router as metrics_router
+from monitoring.metrics import HTTP_REQUEST_DURATION
+from clients.admission import AdmissionRejected, get_async_admission_controller
+from clients.http import close_sessions
 from typing import List, Dict, Optional
 from datetime import datetime
 from database.models import user_model, chat_history_model, learning_session_model, db_config
 import bcrypt
+import hmac
 import os
+import time
 
 # Ensure database is connected on startup
 db_connected = db_config.check_and_reconnect()
@@ -26,6 +33,28 @@ chat_handler = IntegratedChatHandler()
 # Include auth routes
 app.include_router(auth_router)
 
+# Prometheus metrics endpoint
+app.include_router(metrics_router)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Record per-route request latency and status"""
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        # Label by route template, not raw path, to keep label cardinality bounded
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status_code)
+        )
+
 # CORS setup to allow requests from frontend
 app.add_middleware(
     CORSMiddleware,
@@ -142,14 +171,26 @@ async def status_page():
     from fastapi.responses import HTMLResponse
     return HTMLResponse(content=html_content)
 
+# Bounds concurrent chat requests; excess requests get 503 with Retry-After.
+# Waiting happens on the event loop so queued requests hold no threadpool token.
+chat_admission = get_async_admission_controller('chat')
+
+def run_chat_handler(message: str, chat_history: List[Dict], user_id: str) -> Dict:
+    """Run the (blocking) chat handler; callers hold a chat admission slot."""
+    return chat_handler.handle_chat_message(
+        message=message,
+        chat_history=chat_history,
+        user_id=user_id
+    )
+
 class MessageRequest(BaseModel):
     message: str
     chat_history: Optional[List[Dict]] = []
     user_id: Optional[str] = "default"
 
 @app.post("/api/chat")
-async def chat(request: MessageRequest):
-    """Handle chat messages and save to MongoDB"""
+async def chat(request: MessageRequest, background_tasks: BackgroundTasks):
+    """Handle chat messages; MongoDB writes are queued and run after the response is sent"""
     try:
         prompt = request.message
         chat_history = request.chat_history or []
@@ -159,38 +200,14 @@ async def chat(request: MessageRequest):
         print(f"🔄 Prompt: {prompt}")
         print(f"🔄 Chat history: {chat_history}")
         
-        # Use the integrated chat handler with enhanced parameters
-        result = chat_handler.handle_chat_message(
-            message=prompt,
-            chat_history=chat_history,
-            user_id=user_id
-        )
+        # Use the integrated chat handler off the event loop so requests run concurrently
+        async with chat_admission.slot():
+            result = await run_in_threadpool(run_chat_handler, prompt, chat_history, user_id)
         print(f"🔄 Chat handler result: {result}")
         
-        # Save chat message to MongoDB
+        # The handler queued the chat turn and statistics update; write them once this response is sent
         if result.get('response'):
-            chat_message_id = chat_history_model.save_chat_message(
-                user_id=user_id,
-                message=prompt,
-                response=result.get('response'),
-                analysis=result.get('analysis', {})
-            )
-            
-            if chat_message_id:
-                print(f"✅ Chat message saved with ID: {chat_message_id}")
-                
-                # Update user statistics if user exists
-                try:
-                    user = user_model.get_user_by_id(user_id)
-                    if user:
-                        current_queries = user.get('statistics', {}).get('total_queries', 0)
-                        user_model.update_user(user_id, {
-                            'statistics.total_queries': current_queries + 1,
-                            'statistics.last_active': datetime.now().isoformat()
-                        })
-                        print(f"✅ Updated user statistics for user: {user_id}")
-                except Exception as stats_err:
-                    print(f"⚠️ Could not update user statistics: {stats_err}")
+            background_tasks.add_task(chat_handler.persistence_queue.drain)
         else:
             print(f"⚠️ No response from chat handler. Result: {result}")
         
@@ -201,6 +218,13 @@ async def chat(request: MessageRequest):
             "error": result.get('error')
         }
         
+    except AdmissionRejected as e:
+        print(f"⏳ Chat request shed by admission control ({e.reason})")
+        raise HTTPException(
+            status_code=503,
+            detail="The tutor is busy right now. Please try again shortly.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         print(f"❌ Chat error: {e}")
         import traceback
@@ -212,6 +236,49 @@ async def chat(request: MessageRequest):
             "error": str(e)
         }
 
+# Admin endpoints (graph hot reload, cohort analytics); disabled unless ADMIN_TOKEN is set
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+COHORT_MAX_USERS = int(os.getenv("COHORT_MAX_USERS", "10000"))
+
+def require_admin(request: Request):
+    """Reject admin calls without the X-Admin-Token header matching ADMIN_TOKEN"""
+    if not ADMIN_TOKEN or not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    if chat_handler.graph_reloader is None:
+        raise HTTPException(status_code=503, detail="Graph analyzer is not available")
+
+@app.get("/api/admin/graph")
+async def graph_status(request: Request):
+    """Current graph version and reload state"""
+    require_admin(request)
+    return chat_handler.graph_reloader.status()
+
+@app.post("/api/admin/graph/reload", status_code=202)
+async def reload_graph(request: Request):
+    """Rebuild the graph from graph_data.json in the background and swap it in when ready"""
+    require_admin(request)
+    started = chat_handler.graph_reloader.reload_async()
+    return {"started": started, **chat_handler.graph_reloader.status()}
+
+class CohortGapRequest(BaseModel):
+    targets: List[str]
+    user_ids: Optional[List[str]] = None
+    max_items: Optional[int] = 5
+
+@app.post("/api/admin/cohort/gaps")
+async def cohort_gaps(request: Request, body: CohortGapRequest):
+    """Gap analysis of many students against many targets at once (instructor dashboards)"""
+    require_admin(request)
+    users = await run_in_threadpool(user_model.get_cohort_progress, body.user_ids, COHORT_MAX_USERS)
+    if users is None:
+        raise HTTPException(status_code=503, detail="User database is not available")
+    
+    # Profiles store concept names; the analyzer resolves names and node IDs alike
+    concepts = {user['user_id']: list(user['completed_topics']) + list(user['known_concepts']) for user in users}
+    return await run_in_threadpool(
+        chat_handler.graph_analyzer.analyze_cohort_gaps, concepts, body.targets, body.max_items or 5
+    )
+
 # Pydantic models for requests
 class UserLoginRequest(BaseModel):
     email: EmailStr
@@ -620,8 +687,14 @@ async def startup_db_client():
 @app.on_event("shutdown")
 async def shutdown_db_client():
     """Close database connection on shutdown"""
+    print("🔄 Shutdown event: Flushing background writes...")
+    chat_handler.persistence_queue.stop()
+    chat_handler.persistence_queue.close()
+    if chat_handler.graph_reloader is not None:
+        chat_handler.graph_reloader.stop()
     print("🔄 Shutdown event: Closing database connections...")
     db_config.close()
+    close_sessions()
     print("✅ Shutdown complete: Database connections closed")
 
 if __name__ == "__main__":
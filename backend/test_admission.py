@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test per-provider admission control and load shedding
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from clients.admission import (AdmissionController, AdmissionRejected, AsyncAdmissionController,
+                               get_admission_controller, get_async_admission_controller)
+
+
+def test_queue_full_is_rejected_immediately():
+    """With every slot taken and the queue full, callers are shed at once"""
+    controller = AdmissionController("test_full", max_concurrency=1, max_queue=0, queue_timeout=5)
+    controller.acquire()
+    with pytest.raises(AdmissionRejected) as exc:
+        controller.acquire()
+    assert exc.value.reason == "queue_full"
+    assert exc.value.retry_after == 5
+    controller.release()
+    with controller.slot():
+        assert controller.in_flight == 1
+    assert controller.in_flight == 0
+
+
+def test_queued_caller_times_out():
+    """A queued caller gives up after the queue timeout"""
+    controller = AdmissionController("test_timeout", max_concurrency=1, max_queue=1, queue_timeout=0.05)
+    controller.acquire()
+    with pytest.raises(AdmissionRejected) as exc:
+        controller.acquire()
+    assert exc.value.reason == "timeout"
+    assert controller.waiting == 0
+
+
+def test_queued_caller_gets_released_slot():
+    """A waiting caller is admitted as soon as a slot is released"""
+    controller = AdmissionController("test_handoff", max_concurrency=1, max_queue=1, queue_timeout=5)
+    controller.acquire()
+    admitted = threading.Event()
+
+    def waiter():
+        with controller.slot():
+            admitted.set()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    while controller.waiting == 0:
+        pass
+    assert not admitted.is_set()
+    controller.release()
+    thread.join(timeout=1)
+    assert admitted.is_set()
+    assert controller.in_flight == 0
+
+
+def test_async_controller_queues_on_the_event_loop():
+    """Event-loop waiters are bounded, time out, and are handed released slots"""
+    async def scenario():
+        controller = AsyncAdmissionController("test_async", max_concurrency=1, max_queue=1, queue_timeout=0.2)
+        await controller.acquire()
+
+        waiter = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0)
+        assert controller.waiting == 1
+        with pytest.raises(AdmissionRejected) as exc:
+            await controller.acquire()
+        assert exc.value.reason == "queue_full"
+
+        controller.release()
+        await waiter
+        assert controller.in_flight == 1 and controller.waiting == 0
+
+        with pytest.raises(AdmissionRejected) as exc:
+            await controller.acquire()
+        assert exc.value.reason == "timeout"
+        controller.release()
+        async with controller.slot():
+            assert controller.in_flight == 1
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_sync_and_async_controllers_are_registered_separately():
+    """Whichever kind is requested first, each caller gets its own kind back"""
+    async_controller = get_async_admission_controller('test_registry')
+    sync_controller = get_admission_controller('test_registry')
+    assert isinstance(async_controller, AsyncAdmissionController)
+    assert isinstance(sync_controller, AdmissionController)
+    assert get_admission_controller('test_registry') is sync_controller
+    assert get_async_admission_controller('test_registry') is async_controller
+
+
+if __name__ == "__main__":
+    test_queue_full_is_rejected_immediately()
+    test_queued_caller_times_out()
+    test_queued_caller_gets_released_slot()
+    test_async_controller_queues_on_the_event_loop()
+    test_sync_and_async_controllers_are_registered_separately()
+    print("✅ Admission control tests passed")
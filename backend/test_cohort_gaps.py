@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test batch cohort gap analysis against the per-user prerequisite closure
+"""
+
+import contextlib
+import io
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from cohort_analysis import CohortGapAnalyzer
+from csr_graph import CSRGraph
+from prerequisite_closure import PrerequisiteClosure
+from real_graph_analyzer import RealGraphLearningAnalyzer
+from test_prerequisite_closure import random_graph_data
+
+
+def test_batch_matches_per_user_closure():
+    rng = random.Random(5)
+    graph_data = random_graph_data(300, seed=2)
+    for i, node in enumerate(graph_data['nodes']):
+        node['type'] = 'topic' if i % 5 == 0 else 'subtopic'
+    csr = CSRGraph.from_graph_data(graph_data, lambda edge_type: 1.0)
+    closure = PrerequisiteClosure.build(csr)
+    cohort = CohortGapAnalyzer(csr, closure)
+
+    users = [[f"n{rng.randrange(300)}" for _ in range(rng.randint(0, 12))] + ['not-a-node'] for _ in range(60)]
+    targets = [f"n{rng.randrange(300)}" for _ in range(8)] + ['not-a-node']
+    results = cohort.analyze(cohort.known_matrix(users), targets)
+    assert 'not-a-node' not in results
+
+    for target, result in results.items():
+        prerequisites = result['prerequisites']
+        assert target not in prerequisites
+        for u, known in enumerate(users):
+            missing = [p for p, flag in zip(prerequisites, result['missing'][u]) if flag]
+            assert missing == closure.missing(known, target)
+            expected = 100.0 * (1 - len(missing) / len(prerequisites)) if prerequisites else 100.0
+            assert abs(result['readiness'][u] - expected) < 1e-9
+
+            # A next step is an unknown candidate whose direct prerequisites are all known
+            implied = set(known) | {p for k in known for p in closure.closure(k)}
+            for node_id, flag in zip(result['candidates'], result['next_steps'][u]):
+                direct = csr.predecessors(node_id, edge_types=('prerequisite', 'sequence'))
+                assert flag == (node_id not in implied and all(p in implied for p in direct))
+
+
+def test_analyzer_resolves_names_and_reports_per_user():
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = RealGraphLearningAnalyzer()
+    topic = analyzer.topics[0]
+    subtopics = analyzer.get_all_subtopics_for_topic(topic['id'])
+    first = analyzer.all_id_to_data[subtopics[0]]['name']
+
+    report = analyzer.analyze_cohort_gaps(
+        {'alice': [], 'bob': subtopics, 'carol': [first, {'not': 'a name'}]},
+        [topic['id'], 'definitely not a topic name xyz'],
+        max_items=3
+    )
+    assert report['user_count'] == 3
+    assert report['unresolved_targets'] == ['definitely not a topic name xyz']
+    (target,) = report['targets']
+    assert target['target']['name'] == topic['name']
+    users = {row['user_id']: row for row in target['users']}
+    assert users['alice']['completion_percentage'] == 0.0
+    assert users['bob']['completion_percentage'] == 100.0
+    assert 0.0 < users['carol']['completion_percentage'] < 100.0
+    assert all(len(row['next_steps']) <= 3 and len(row['missing_prerequisites']) <= 3 for row in users.values())
+    json.dumps(report)
+
+
+if __name__ == "__main__":
+    test_batch_matches_per_user_closure()
+    test_analyzer_resolves_names_and_reports_per_user()
+    print("✅ Cohort gap analysis tests passed")
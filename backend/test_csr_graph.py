@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test the CSR graph engine against the NetworkX graph built from graph_data.json
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+import networkx as nx
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from csr_graph import CSRGraph
+from real_graph_analyzer import RealGraphLearningAnalyzer
+
+with contextlib.redirect_stdout(io.StringIO()):
+    ANALYZER = RealGraphLearningAnalyzer()
+GRAPH = ANALYZER.graph
+CSR = ANALYZER.csr
+
+
+def test_neighbors_types_and_degrees_match_networkx():
+    assert len(CSR) == GRAPH.number_of_nodes()
+    assert CSR.edge_count == GRAPH.number_of_edges()
+    for node_id in GRAPH.nodes():
+        assert CSR.successors(node_id) == list(GRAPH.successors(node_id))
+        assert CSR.predecessors(node_id) == list(GRAPH.predecessors(node_id))
+        assert CSR.degree(node_id) == GRAPH.degree(node_id)
+        assert CSR.node_type(node_id) == GRAPH.nodes[node_id].get('type')
+        for successor in GRAPH.successors(node_id):
+            assert CSR.edge_type(node_id, successor) == GRAPH.get_edge_data(node_id, successor).get('type', 'default')
+
+
+def test_typed_filters():
+    for topic in ANALYZER.topics:
+        expected = [s for s in GRAPH.successors(topic['id'])
+                    if GRAPH.nodes[s].get('type') == 'subtopic'
+                    and GRAPH.get_edge_data(topic['id'], s).get('type') == 'contains']
+        assert ANALYZER.get_all_subtopics_for_topic(topic['id']) == expected
+        assert CSR.predecessors(topic['id'], edge_types=('prerequisite',)) == [
+            p for p in GRAPH.predecessors(topic['id']) if GRAPH.get_edge_data(p, topic['id']).get('type') == 'prerequisite'
+        ]
+
+
+def test_shortest_paths_match_networkx():
+    nodes = list(GRAPH.nodes())
+    for source in nodes[:10]:
+        expected = nx.single_source_dijkstra_path_length(GRAPH, source, weight='weight')
+        for target in nodes:
+            distance, path = CSR.shortest_path([source], target)
+            if target not in expected:
+                assert path is None
+                continue
+            assert abs(distance - expected[target]) < 1e-5
+            assert abs(nx.path_weight(GRAPH, path, 'weight') - expected[target]) < 1e-9
+
+
+def test_untyped_and_unknown_edges():
+    csr = CSRGraph.from_graph_data({'nodes': [{'id': 'a', 'type': 'topic'}],
+                                    'edges': [{'source': 'a', 'target': 'b'},
+                                              {'source': 'b', 'target': 'c', 'type': 'custom'}]},
+                                   lambda edge_type: 1.0)
+    assert len(csr) == 3
+    assert csr.edge_type('a', 'b') == 'default'
+    assert csr.edge_type('b', 'c') == 'custom'
+    assert csr.edge_type('a', 'c') is None
+    assert csr.successors('missing') == []
+    assert csr.shortest_path(['a'], 'c') == (2.0, ['a', 'b', 'c'])
+
+
+if __name__ == "__main__":
+    test_neighbors_types_and_degrees_match_networkx()
+    test_typed_filters()
+    test_shortest_paths_match_networkx()
+    test_untyped_and_unknown_edges()
+    print("✅ CSR graph tests passed")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test the precomputed all-pairs distance / next-hop tables
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import networkx as nx
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+import numpy as np
+
+from distance_table import DistanceTable, artifact_path_for, build_distance_table, load_for_graph
+
+
+def random_graph(node_count=60, seed=3):
+    rng = random.Random(seed)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(f"n{i}" for i in range(node_count))
+    for _ in range(node_count * 3):
+        u, v = rng.sample(range(node_count), 2)
+        graph.add_edge(f"n{u}", f"n{v}", weight=rng.choice([0.1, 0.2, 0.3, 0.5, 0.8, 1.0]))
+    return graph
+
+
+def test_matches_networkx_dijkstra():
+    graph = random_graph()
+    table = build_distance_table(graph, "v1")
+    for source in list(graph.nodes())[:15]:
+        expected = nx.single_source_dijkstra_path_length(graph, source, weight='weight')
+        for target in graph.nodes():
+            if target not in expected:
+                assert table.distance(source, target) == float('inf')
+                assert table.path(source, target) is None
+                continue
+            assert abs(table.distance(source, target) - expected[target]) < 1e-9
+            path = table.path(source, target)
+            assert path[0] == source and path[-1] == target
+            assert abs(nx.path_weight(graph, path, 'weight') - expected[target]) < 1e-9
+
+
+def test_nearest_source_and_distances_to():
+    graph = nx.DiGraph()
+    graph.add_edge('a', 'c', weight=0.8)
+    graph.add_edge('b', 'd', weight=0.1)
+    graph.add_edge('d', 'c', weight=0.2)
+    table = build_distance_table(graph)
+    nearest, distance = table.nearest_source(['a', 'b', 'missing'], 'c')
+    assert nearest == 'b' and abs(distance - 0.3) < 1e-9
+    assert table.path('b', 'c') == ['b', 'd', 'c']
+    assert table.nearest_source(['c'], 'a') == (None, float('inf'))
+    assert set(table.distances_to('c')) == {'a', 'b', 'c', 'd'}
+
+
+def test_artifact_is_keyed_by_graph_version(tmp_path):
+    graph = random_graph(20)
+    graph_file = tmp_path / "graph_data.json"
+    assert load_for_graph(graph_file, "v1") is None  # servers never build the table themselves
+    build_distance_table(graph, "v1").save(artifact_path_for(graph_file))
+    assert [path.name for path in tmp_path.iterdir()] == [artifact_path_for(graph_file).name]
+
+    table = load_for_graph(graph_file, "v1")
+    assert table.dist.dtype == np.float32 and table.next_hop.dtype == np.int32
+    assert load_for_graph(graph_file, "v2") is None
+
+    # A rebuild for a new graph version overwrites the artifact
+    graph.add_edge("n0", "n19", weight=0.1)
+    build_distance_table(graph, "v2").save(artifact_path_for(graph_file))
+    assert load_for_graph(graph_file, "v2").distance("n0", "n19") == 0.1
+    assert load_for_graph(graph_file, "v1") is None
+
+
+if __name__ == "__main__":
+    import tempfile
+    test_matches_networkx_dijkstra()
+    test_nearest_source_and_distances_to()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_artifact_is_keyed_by_graph_version(Path(tmp))
+    print("✅ Distance table tests passed")
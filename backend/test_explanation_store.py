@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test the pre-generated node explanation store and the stub LLM backend
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from clients.llm_backends import get_backend
+from explanation_store import ExplanationStore
+
+NODE = {'id': 't1', 'name': 'Binary Search', 'type': 'topic', 'description': 'Search a sorted array'}
+
+
+def test_store_roundtrip_and_lookup_by_name(tmp_path):
+    path = tmp_path / "node_explanations.json"
+    store = ExplanationStore(path)
+    assert store.get("Binary Search") is None
+
+    backend = get_backend("stub")
+    store.put(NODE, backend.generate("Explain Binary Search in detail"), backend.name, backend.model)
+    store.save()
+
+    reloaded = ExplanationStore(path)
+    assert reloaded.get("  binary search ") == "[stub explanation] Explain Binary Search in detail"
+    assert len(reloaded) == 1
+
+
+def test_needs_update_when_node_changes(tmp_path):
+    store = ExplanationStore(tmp_path / "node_explanations.json")
+    assert store.needs_update(NODE)
+
+    store.put(NODE, "text", "stub", "stub")
+    assert not store.needs_update(NODE)
+    assert store.needs_update(dict(NODE, description='Halve the search range each step'))
+
+
+def test_regenerated_explanation_is_visible_by_name(tmp_path):
+    store = ExplanationStore(tmp_path / "node_explanations.json")
+    store.put(NODE, "old text", "stub", "stub")
+    store.put(dict(NODE, description='Halve the search range each step'), "new text", "stub", "stub")
+    assert store.get("Binary Search") == "new text"
+
+    # A different node with the same name does not take over the lookup
+    store.put(dict(NODE, id='t2'), "other text", "stub", "stub")
+    assert store.get("Binary Search") == "new text"
+
+    store.put(dict(NODE, name='Bisection'), "renamed text", "stub", "stub")
+    assert store.get("Bisection") == "renamed text"
+    assert store.get("Binary Search") == "other text"
+
+
+def test_serving_store_picks_up_rebuilt_file(tmp_path):
+    """A running server sees explanations written by the build job"""
+    path = tmp_path / "node_explanations.json"
+    serving = ExplanationStore(path, check_interval=0)
+    builder = ExplanationStore(path)
+    builder.put(NODE, "text", "stub", "stub")
+    builder.save()
+    assert serving.get("Binary Search") == "text"
+
+
+def test_unknown_backend_is_rejected():
+    try:
+        get_backend("nope")
+    except ValueError:
+        pass
+    else:
+        assert False, "expected ValueError"
+
+
+if __name__ == "__main__":
+    import tempfile
+    for test in (test_store_roundtrip_and_lookup_by_name,
+                 test_needs_update_when_node_changes,
+                 test_regenerated_explanation_is_visible_by_name,
+                 test_serving_store_picks_up_rebuilt_file):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    test_unknown_backend_is_rejected()
+    print("✅ Explanation store tests passed")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test the gap analysis cache used by the integrated chat handler
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from gap_analysis_cache import GapAnalysisCache
+
+
+def test_key_is_order_insensitive():
+    """Known concept order and duplicates must not change the key"""
+    key_a = GapAnalysisCache.make_key(['s2', 's1', 's1'], 't1', 'v1')
+    key_b = GapAnalysisCache.make_key(['s1', 's2'], 't1', 'v1')
+    assert key_a == key_b
+    assert key_a != GapAnalysisCache.make_key(['s1', 's2'], 't1', 'v2')
+    assert key_a != GapAnalysisCache.make_key(['s1', 's2'], 't2', 'v1')
+
+
+def test_get_or_compute_memoizes_and_evicts():
+    """Second lookup is a hit; least recently used entry is evicted"""
+    cache = GapAnalysisCache(max_entries=2)
+    calls = []
+
+    def compute(target):
+        calls.append(target)
+        return {'learning_path': [target], 'gaps': []}
+
+    cache.get_or_compute(['s1'], 't1', 'v1', lambda: compute('t1'))
+    result = cache.get_or_compute(['s1'], 't1', 'v1', lambda: compute('t1'))
+    assert result == {'learning_path': ['t1'], 'gaps': []}
+    assert calls == ['t1']
+
+    # Mutating a returned value must not corrupt the cache
+    result['learning_path'].append('tampered')
+    assert cache.get_or_compute(['s1'], 't1', 'v1', lambda: compute('t1'))['learning_path'] == ['t1']
+
+    cache.get_or_compute(['s1'], 't2', 'v1', lambda: compute('t2'))
+    cache.get_or_compute(['s1'], 't3', 'v1', lambda: compute('t3'))
+    stats = cache.stats()
+    assert stats['size'] == 2
+    assert stats['evictions'] == 1
+
+
+def test_invalidate_clears_cache():
+    """The graph reloader invalidates cached results when it swaps the graph"""
+    cache = GapAnalysisCache()
+    cache.get_or_compute([], 't1', 'v1', lambda: {'learning_path': [], 'gaps': []})
+    assert cache.stats()['size'] == 1
+    assert not cache.get(GapAnalysisCache.make_key([], 't1', 'v2'))[0]
+
+    cache.invalidate()
+    found, _ = cache.get(GapAnalysisCache.make_key([], 't1', 'v1'))
+    assert not found
+    assert cache.stats()['invalidations'] == 1
+
+
+if __name__ == "__main__":
+    test_key_is_order_insensitive()
+    test_get_or_compute_memoizes_and_evicts()
+    test_invalidate_clears_cache()
+    print("✅ Gap analysis cache tests passed")
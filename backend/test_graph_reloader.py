@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test hot reload of the learning graph
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling"))
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from graph_reloader import GraphReloader
+from graph_snapshot import source_stamp
+from real_graph_analyzer import RealGraphLearningAnalyzer
+
+
+def graph_data(*names):
+    return {'nodes': [{'id': f"t{i}", 'name': name, 'type': 'topic'} for i, name in enumerate(names)],
+            'edges': [{'source': 't0', 'target': f"t{i}", 'type': 'prerequisite'} for i in range(1, len(names))]}
+
+
+def write_graph(graph_file, data, mtime_ns):
+    graph_file.write_text(json.dumps(data))
+    # Distinct mtimes even on filesystems with coarse timestamps
+    os.utime(graph_file, ns=(mtime_ns, mtime_ns))
+
+
+def quiet_build(graph_file):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return RealGraphLearningAnalyzer(graph_file)
+
+
+def make_reloader(graph_file, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return GraphReloader(str(graph_file), quiet_build, stamp=source_stamp, **kwargs)
+
+
+def test_swap_keeps_pinned_analyzer_and_notifies(tmp_path):
+    graph_file = tmp_path / "graph_data.json"
+    write_graph(graph_file, graph_data('Arrays', 'Sorting'), 1_000_000_000)
+    reloader = make_reloader(graph_file)
+    swaps = []
+    reloader.add_listener(lambda old, new: swaps.append((old, new)))
+    old_version = reloader.version
+
+    with reloader.pinned() as pinned:
+        write_graph(graph_file, graph_data('Arrays', 'Sorting', 'Graphs'), 2_000_000_000)
+        assert reloader.changed_on_disk()
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert reloader.reload() is True
+        # The in-flight request still sees the graph it started with
+        assert reloader.analyzer is pinned
+        assert 'graphs' not in reloader.analyzer.topic_name_to_id
+
+    assert reloader.analyzer.topic_name_to_id.get('graphs') == 't2'
+    assert swaps == [(old_version, reloader.version)]
+    assert not reloader.changed_on_disk()
+
+    # Touching the file without changing it does not swap
+    os.utime(graph_file, ns=(3_000_000_000, 3_000_000_000))
+    current = reloader.analyzer
+    assert reloader.reload() is False
+    assert reloader.analyzer is current and len(swaps) == 1
+
+
+def test_broken_graph_keeps_current_version(tmp_path):
+    graph_file = tmp_path / "graph_data.json"
+    write_graph(graph_file, graph_data('Arrays'), 1_000_000_000)
+    reloader = make_reloader(graph_file)
+    version = reloader.version
+
+    graph_file.write_text('{"nodes": [')
+    os.utime(graph_file, ns=(2_000_000_000, 2_000_000_000))
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        assert reloader.reload() is False
+    assert reloader.version == version and reloader.status()['last_error']
+    # The watcher does not retry the same broken file
+    assert not reloader.changed_on_disk()
+
+    write_graph(graph_file, graph_data('Arrays', 'Heaps'), 3_000_000_000)
+    assert reloader.changed_on_disk()
+
+
+def test_watcher_reloads_in_background(tmp_path):
+    graph_file = tmp_path / "graph_data.json"
+    write_graph(graph_file, graph_data('Arrays'), 1_000_000_000)
+    reloader = make_reloader(graph_file, check_interval=0.05)
+    swapped = threading.Event()
+    reloader.add_listener(lambda old, new: swapped.set())
+    reloader.start_watcher()
+    try:
+        write_graph(graph_file, graph_data('Arrays', 'Tries'), 2_000_000_000)
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert swapped.wait(10)
+        assert reloader.analyzer.topic_name_to_id.get('tries') == 't1'
+    finally:
+        reloader.stop()
+
+    assert reloader.reload_async() is True
+    deadline = time.monotonic() + 10
+    while reloader.status()['reloading'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not reloader.status()['reloading']
+
+
+if __name__ == "__main__":
+    import tempfile
+    for test in (test_swap_keeps_pinned_analyzer_and_notifies, test_broken_graph_keeps_current_version,
+                 test_watcher_reloads_in_background):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Graph reloader tests passed")
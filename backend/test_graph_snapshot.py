@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test the compiled, memory-mapped graph snapshot
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from graph_snapshot import GraphSnapshot, snapshot_path_for, source_stamp
+from real_graph_analyzer import RealGraphLearningAnalyzer
+
+GRAPH_DATA = {
+    'nodes': [
+        {'id': 't1', 'name': 'Arrays', 'type': 'topic', 'description': 'Contiguous memory'},
+        {'id': 't2', 'name': 'Sorting', 'type': 'topic'},
+        {'id': 's1', 'name': 'Two Pointers', 'type': 'subtopic', 'parent_topic': 't1'},
+        {'id': 's2', 'name': 'Merge Sort', 'type': 'subtopic', 'parent_topic': 't2', 'keywords': ['divide', 'conquer']},
+        {'id': 's3', 'name': 'Prefix Sums ✓', 'type': 'subtopic', 'parent_topic': 't1'},
+    ],
+    'edges': [
+        {'source': 't1', 'target': 's1', 'type': 'contains'},
+        {'source': 't1', 'target': 's3', 'type': 'contains'},
+        {'source': 't1', 'target': 't2', 'type': 'prerequisite'},
+        {'source': 't2', 'target': 's2', 'type': 'contains', 'label': 'contains'},
+        {'source': 's1', 'target': 's2', 'type': 'related'},
+    ],
+}
+
+
+def load_analyzer(graph_file):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return RealGraphLearningAnalyzer(str(graph_file))
+
+
+def test_snapshot_matches_parsed_graph(tmp_path):
+    graph_file = tmp_path / "graph_data.json"
+    graph_file.write_text(json.dumps(GRAPH_DATA))
+    parsed = load_analyzer(graph_file)
+    assert snapshot_path_for(graph_file).exists()
+    mapped = load_analyzer(graph_file)
+    assert not isinstance(mapped.all_id_to_data, dict)
+
+    assert mapped.graph_version == parsed.graph_version
+    assert list(mapped.graph_data['nodes']) == GRAPH_DATA['nodes']
+    assert list(mapped.graph_data['edges']) == GRAPH_DATA['edges']
+    assert list(mapped.topics) == list(parsed.topics)
+    assert mapped.subtopics[1:] == parsed.subtopics[1:]
+    assert dict(mapped.all_id_to_data) == parsed.all_id_to_data
+    for name in ('topic_name_to_id', 'subtopic_name_to_id', 'all_name_to_id'):
+        assert list(getattr(mapped, name).items()) == list(getattr(parsed, name).items())
+    assert mapped.all_name_to_id.get('prefix sums ✓') == 's3'
+    assert mapped.all_name_to_id.get('missing') is None
+    assert mapped.clusters == parsed.clusters
+
+    for node_id in parsed.csr.node_ids:
+        assert mapped.csr.successors(node_id) == parsed.csr.successors(node_id)
+        assert mapped.csr.predecessors(node_id, edge_types=('contains',)) == parsed.csr.predecessors(node_id, edge_types=('contains',))
+    assert mapped.get_all_subtopics_for_topic('t1') == ['s1', 's3']
+    assert mapped.find_node_by_name('merge') == 's2'
+    for query in ('sort', 'two pointers and arrays', 'prefix sum', 'a', 'merj sort'):
+        assert mapped.find_nodes_by_name(query) == parsed.find_nodes_by_name(query)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert mapped.find_optimal_learning_path(['t1'], 's2') == parsed.find_optimal_learning_path(['t1'], 's2')
+    assert list(mapped.graph.successors('t1')) == ['s1', 's3', 't2']
+
+    # Records are decoded once and shared by every view, like a parsed graph_data
+    assert mapped.graph_data['nodes'][2] is mapped.subtopics[0] is mapped.all_id_to_data['s1']
+
+
+def test_stale_snapshot_is_recompiled(tmp_path):
+    graph_file = tmp_path / "graph_data.json"
+    graph_file.write_text(json.dumps(GRAPH_DATA))
+    load_analyzer(graph_file)
+    path = snapshot_path_for(graph_file)
+    assert GraphSnapshot.load(path, source_stamp(graph_file)) is not None
+
+    edited = dict(GRAPH_DATA, nodes=GRAPH_DATA['nodes'] + [{'id': 't3', 'name': 'Graphs', 'type': 'topic'}])
+    graph_file.write_text(json.dumps(edited))
+    os.utime(graph_file, ns=(0, 0))
+    assert GraphSnapshot.load(path, source_stamp(graph_file)) is None
+
+    analyzer = load_analyzer(graph_file)
+    assert analyzer.topic_name_to_id.get('graphs') == 't3'
+    assert load_analyzer(graph_file).topic_name_to_id.get('graphs') == 't3'
+    assert path.read_bytes()[:8] == b"CPSGRAPH"
+    # Compiles go through uniquely named temp files that never outlive the rename
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['graph_data.json', path.name]
+
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_snapshot_matches_parsed_graph(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_stale_snapshot_is_recompiled(Path(tmp))
+    print("✅ Graph snapshot tests passed")
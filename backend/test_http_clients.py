@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test the shared pooled HTTP sessions used by provider clients
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from clients.http import create_session, get_session
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Returns 503 for the first request, then 200; tracks client ports."""
+    protocol_version = "HTTP/1.1"
+    requests_seen = 0
+    client_ports = set()
+
+    def do_GET(self):
+        FlakyHandler.requests_seen += 1
+        FlakyHandler.client_ports.add(self.client_address[1])
+        status = 503 if FlakyHandler.requests_seen == 1 else 200
+        body = b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_retries_and_reuses_connections():
+    """A 503 is retried and later calls reuse the kept-alive connection"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        session = create_session(pool_size=2, timeout=5, retries=2)
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        assert session.get(url).status_code == 200
+        for _ in range(3):
+            assert session.get(url).status_code == 200
+        assert FlakyHandler.requests_seen == 5
+        assert len(FlakyHandler.client_ports) == 1
+        session.close()
+    finally:
+        server.shutdown()
+
+
+def test_provider_sessions_do_not_retry_error_statuses():
+    """Groq and YouTube sessions hand a 503 straight back instead of re-sending"""
+    FlakyHandler.requests_seen = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        session = create_session(pool_size=2, timeout=5, retries=2, retry_status=False)
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        assert session.get(url).status_code == 503
+        assert FlakyHandler.requests_seen == 1
+        session.close()
+    finally:
+        server.shutdown()
+
+    for service in ('groq', 'youtube'):
+        retry = get_session(service).get_adapter("https://example.com").max_retries
+        assert retry.status == 0 and not retry.status_forcelist
+        assert retry.connect > 0
+
+
+def test_sessions_are_shared_per_service():
+    assert get_session('youtube') is get_session('youtube')
+    assert get_session('youtube') is not get_session('groq')
+    assert get_session('groq').get_adapter("https://api.groq.com").timeout == 30.0
+
+
+if __name__ == "__main__":
+    test_retries_and_reuses_connections()
+    test_provider_sessions_do_not_retry_error_statuses()
+    test_sessions_are_shared_per_service()
+    print("✅ HTTP client tests passed")
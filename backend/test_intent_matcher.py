@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test the compiled learning-intent matcher
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling"))
+
+from intent_matcher import IntentMatcher
+
+
+def test_whole_word_matching():
+    """Short phrases must not fire inside longer words"""
+    matcher = IntentMatcher.from_file()
+    assert not matcher.match("i know arrays") & {'needs_more_explanation', 'says_no_need_help'}
+    assert 'confirms_understanding' not in matcher.match("recommend a book on graphs")
+    assert {'needs_more_explanation', 'says_no_need_help'} <= matcher.match("no, not yet")
+
+
+def test_reports_every_intent_in_one_scan():
+    """Overlapping phrases from several intents are all reported"""
+    matcher = IntentMatcher.from_file()
+    intents = matcher.detect("yes i am satisfied, next topic please")
+    assert intents['confirms_understanding']
+    assert intents['wants_confirmation']
+    assert intents['satisfied_with_topic']
+    assert intents['wants_next_topic']
+    assert not intents['needs_more_explanation']
+
+
+def test_suffix_phrases_match_through_failure_links():
+    """A phrase that is a suffix of a partial longer match is still found"""
+    matcher = IntentMatcher({'a': ['go to next lesson'], 'b': ['next lesson']})
+    assert matcher.match("let's go to next lesson") == {'a', 'b'}
+    assert matcher.match("go to the next lesson") == {'b'}
+
+
+def test_hinglish_phrases():
+    """Hinglish phrases are matched like any other phrase"""
+    matcher = IntentMatcher.from_file()
+    assert matcher.detect("samajh nahi aaya")['needs_more_explanation']
+    assert matcher.detect("agla topic batao")['wants_next_topic']
+
+
+if __name__ == "__main__":
+    test_whole_word_matching()
+    test_reports_every_intent_in_one_scan()
+    test_suffix_phrases_match_through_failure_links()
+    test_hinglish_phrases()
+    print("✅ Intent matcher tests passed")
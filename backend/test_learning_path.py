@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test learning path search in RealGraphLearningAnalyzer
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from real_graph_analyzer import RealGraphLearningAnalyzer
+
+GRAPH = {
+    'nodes': [{'id': node_id, 'name': name, 'type': 'topic'} for node_id, name in [
+        ('t1', 'Array'), ('t2', 'Linked List'), ('t3', 'Stack'), ('t4', 'Queue'), ('t5', 'Heap')
+    ]],
+    'edges': [
+        {'source': 't1', 'target': 't3', 'type': 'related'},       # 0.8
+        {'source': 't2', 'target': 't4', 'type': 'prerequisite'},  # 0.1
+        {'source': 't4', 'target': 't3', 'type': 'sequence'},      # 0.2
+        {'source': 't4', 'target': 't5', 'type': 'prerequisite'},
+        {'source': 't3', 'target': 't5', 'type': 'sequence'},
+    ]
+}
+
+
+def make_analyzer(tmp_path):
+    graph_file = tmp_path / "graph_data.json"
+    graph_file.write_text(json.dumps(GRAPH))
+    return RealGraphLearningAnalyzer(str(graph_file))
+
+
+def test_path_starts_from_nearest_known_concept(tmp_path):
+    analyzer = make_analyzer(tmp_path)
+    result = analyzer.find_optimal_learning_path(['t1', 't2', 'unknown-id'], 't3')
+    assert result['reason'] == 'direct_path'
+    assert result['path'] == ['t4', 't3']
+    assert abs(result['distance'] - 0.3) < 1e-9
+
+
+def test_missing_prerequisites_in_learning_order(tmp_path):
+    analyzer = make_analyzer(tmp_path)
+    result = analyzer.find_optimal_learning_path([], 't5')
+    assert result['reason'] == 'prerequisite_chain'
+    assert result['path'] == ['t2', 't4', 't3']
+
+
+if __name__ == "__main__":
+    import tempfile
+    for test in (test_path_starts_from_nearest_known_concept,
+                 test_missing_prerequisites_in_learning_order):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Learning path tests passed")
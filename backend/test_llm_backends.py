@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test the LLM providers against the local stub server
+"""
+
+import asyncio
+
+from clients.llm_backends import GroqBackend, OllamaBackend, StubBackend, stub_completion
+from clients.llm_stub_server import start_stub_server
+
+PROMPT = "Explain Stack in detail\n\nContext:\nUser is asking about: Stack"
+
+
+def test_groq_and_ollama_generate_and_stream():
+    server, base_url = start_stub_server()
+    try:
+        expected = stub_completion(PROMPT)
+        for backend in (GroqBackend(api_key="stub", base_url=f"{base_url}/openai/v1"),
+                        OllamaBackend(base_url=base_url)):
+            assert backend.generate(PROMPT) == expected
+            assert "".join(backend.stream(PROMPT)) == expected
+    finally:
+        server.shutdown()
+
+
+def test_batch_keeps_order_and_reports_failures():
+    server, base_url = start_stub_server()
+    try:
+        backend = GroqBackend(api_key="stub", base_url=f"{base_url}/openai/v1")
+        broken = GroqBackend(api_key="stub", base_url=f"{base_url}/missing")
+        prompts = [f"Explain topic {i}" for i in range(8)]
+        assert backend.generate_batch(prompts, max_workers=4) == [stub_completion(p) for p in prompts]
+        assert all(isinstance(result, Exception) for result in broken.generate_batch(prompts[:2]))
+    finally:
+        server.shutdown()
+
+
+def test_async_calls():
+    backend = StubBackend()
+
+    async def run():
+        text = await backend.agenerate(PROMPT)
+        chunks = [chunk async for chunk in backend.astream(PROMPT)]
+        return text, "".join(chunks)
+
+    text, streamed = asyncio.run(run())
+    assert text == streamed == stub_completion(PROMPT)
+
+
+def test_groq_requires_api_key():
+    backend = GroqBackend(api_key="stub")
+    assert backend.configured
+    backend.api_key = None
+    assert not backend.configured
+
+
+if __name__ == "__main__":
+    test_groq_and_ollama_generate_and_stream()
+    test_batch_keeps_order_and_reports_failures()
+    test_async_calls()
+    test_groq_requires_api_key()
+    print("✅ LLM backend tests passed")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test the Prometheus-style metrics registry and /metrics route
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from monitoring.metrics import Counter, Gauge, Histogram, MetricsRegistry, CHAT_STAGE_DURATION, set_current_outcome
+from routes.metrics import router as metrics_router
+
+
+def test_histogram_buckets_and_text_format():
+    """Observations land in cumulative buckets with _sum and _count"""
+    registry = MetricsRegistry()
+    histogram = Histogram("test_latency_seconds", "Test latency", ["stage"], buckets=(0.1, 1.0), registry=registry)
+    histogram.observe(0.05, stage="a")
+    histogram.observe(0.5, stage="a")
+    histogram.observe(5.0, stage="a")
+
+    text = registry.render()
+    assert "# TYPE test_latency_seconds histogram" in text
+    assert 'test_latency_seconds_bucket{stage="a",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{stage="a",le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{stage="a",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count{stage="a"} 3' in text
+
+
+def test_timer_labels_outcome():
+    """Timers record success, error and caller-chosen outcomes"""
+    registry = MetricsRegistry()
+    histogram = Histogram("test_stage_seconds", "Test stage", ["stage", "outcome"], registry=registry)
+
+    with histogram.time(stage="llm"):
+        pass
+    with histogram.time(stage="llm") as timer:
+        timer.outcome = "http_error"
+    with pytest.raises(RuntimeError):
+        with histogram.time(stage="llm"):
+            raise RuntimeError("boom")
+
+    assert histogram.get_count(stage="llm", outcome="success") == 1
+    assert histogram.get_count(stage="llm", outcome="http_error") == 1
+    assert histogram.get_count(stage="llm", outcome="error") == 1
+
+
+def test_timed_function_sets_outcome():
+    """A decorated function that swallows its error can still label it"""
+    registry = MetricsRegistry()
+    histogram = Histogram("test_db_seconds", "Test db", ["operation", "outcome"], registry=registry)
+
+    @histogram.timed(operation="inner")
+    def inner():
+        return True
+
+    @histogram.timed(operation="update")
+    def update(fail):
+        inner()
+        try:
+            if fail:
+                raise ConnectionError("down")
+            return True
+        except Exception:
+            set_current_outcome("error")
+            return False
+
+    assert update(False) is True
+    assert update(True) is False
+    set_current_outcome("error")  # no enclosing timer: ignored
+
+    assert histogram.get_count(operation="update", outcome="success") == 1
+    assert histogram.get_count(operation="update", outcome="error") == 1
+    assert histogram.get_count(operation="inner", outcome="success") == 2
+
+
+def test_counter_and_gauge_labels():
+    """Counters accumulate per label set; gauges can read callbacks"""
+    registry = MetricsRegistry()
+    counter = Counter("test_total", "Test counter", ["status_code"], registry=registry)
+    counter.inc(status_code=200)
+    counter.inc(2, status_code=200)
+    assert counter.get(status_code=200) == 3
+
+    gauge = Gauge("test_depth", "Test gauge", registry=registry)
+    gauge.set_function(lambda: 7)
+    assert "test_depth 7" in registry.render()
+
+    with pytest.raises(ValueError):
+        counter.inc()
+
+
+def test_metrics_endpoint():
+    """The /metrics route serves the shared registry as text"""
+    CHAT_STAGE_DURATION.observe(0.01, stage="analysis", outcome="success")
+    app = FastAPI()
+    app.include_router(metrics_router)
+
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'chat_stage_duration_seconds_count{stage="analysis",outcome="success"}' in response.text
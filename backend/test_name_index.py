@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test the ranked name index against a scan of every name
+"""
+
+import contextlib
+import io
+import random
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from name_index import NameIndex
+from real_graph_analyzer import RealGraphLearningAnalyzer
+
+WORDS = ['array', 'binary', 'search', 'tree', 'graph', 'sort', 'heap', 'hash', 'table', 'linked', 'list',
+         'stack', 'queue', 'dynamic', 'programming', 'trie', 'segment', 'union', 'find', 'path', 'ç', 'ω']
+
+
+def scan(name_to_id, query):
+    """Every name matching the way the original find_node_by_name scan did, with its specificity."""
+    return {name: min(len(name), len(query)) / max(len(name), len(query))
+            for name in name_to_id if query in name or name in query}
+
+
+def check_lookup(index, name_to_id, query, limit=5):
+    results = index.lookup(query, limit=limit)
+    expected = scan(name_to_id, query)
+    assert len(results) == min(limit, len(expected)), query
+    assert len({r['position'] for r in results}) == len(results)
+    for result in results:
+        assert result['name'] in expected and result['id'] == name_to_id[result['name']]
+        assert abs(result['score'] - expected[result['name']]) < 1e-4
+    # Most specific first, and nothing left out scores higher than what was returned
+    scores = [result['score'] for result in results]
+    assert scores == sorted(scores, reverse=True)
+    if len(results) == limit:
+        returned = {result['name'] for result in results}
+        assert all(score <= scores[-1] + 1e-4 for name, score in expected.items() if name not in returned)
+    # Equally specific prefix matches come before other substring matches
+    for first, second in zip(results, results[1:]):
+        if first['score'] == second['score'] and second['match'] == 'prefix':
+            assert first['match'] in ('exact', 'prefix')
+    return results
+
+
+def test_lookup_matches_scan():
+    rng = random.Random(9)
+    name_to_id = {}
+    while len(name_to_id) < 3000:
+        words = [rng.choice(WORDS) for _ in range(rng.randint(1, 3))]
+        name = " ".join(words) + (f" {rng.randrange(50)}" if rng.random() < 0.5 else "")
+        name_to_id.setdefault(name, f"n{len(name_to_id)}")
+    name_to_id.update({'a': 'short-a', 'ω': 'short-omega', 'bs': 'short-bs'})
+    index = NameIndex.build(name_to_id)
+
+    queries = ['binary search', 'sort', 'tree 1', 'heap sort and binary search trees', 'ω', 'a', 'bs', 'ar',
+               'programming 42', 'zzz', 'ç tree', 'linked list queue stack']
+    queries += [" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))) for _ in range(40)]
+    for query in queries:
+        check_lookup(index, name_to_id, query)
+    assert index.lookup('binary search', limit=1)[0]['match'] == 'exact'
+    assert index.lookup('') == [] and NameIndex.build({}).lookup('sort') == []
+
+
+def test_fuzzy_candidates_follow_substring_matches():
+    index = NameIndex.build({'binary search': 'bs', 'binary search tree': 'bst', 'breadth first search': 'bfs'})
+    assert index.lookup('binary serch') == []
+    (match,) = index.lookup('binary serch', limit=1, fuzzy=True)
+    assert (match['id'], match['match']) == ('bs', 'fuzzy')
+    results = index.lookup('search', fuzzy=True)
+    assert [r['match'] for r in results] == ['substring'] * 3
+
+
+def test_analyzer_find_node_by_name():
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = RealGraphLearningAnalyzer()
+    name_to_id = dict(analyzer.all_name_to_id.items())
+    for name, node_id in list(name_to_id.items())[:50]:
+        assert analyzer.find_node_by_name(name.upper()) == node_id
+        check_lookup(analyzer.name_index, name_to_id, name[:len(name) // 2 + 1])
+        check_lookup(analyzer.name_index, name_to_id, f"introduction to {name}")
+    assert analyzer.find_node_by_name('definitely not a topic name xyz') is None
+    candidates = analyzer.find_nodes_by_name('arrays', limit=3)
+    assert candidates and set(candidates[0]) == {'id', 'name', 'score', 'match'}
+
+
+if __name__ == "__main__":
+    test_lookup_matches_scan()
+    test_fuzzy_candidates_follow_substring_matches()
+    test_analyzer_find_node_by_name()
+    print("✅ Name index tests passed")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test the spool-backed background persistence queue
+"""
+
+import pytest
+
+from workers.persistence_queue import PersistenceQueue
+
+
+def test_jobs_run_in_order_and_spool_is_compacted(tmp_path):
+    """Drained jobs run FIFO and leave an empty spool behind"""
+    spool = tmp_path / "spool.jsonl"
+    queue = PersistenceQueue(spool, name="test_order", fsync=False)
+    seen = []
+    queue.register('write', lambda value: seen.append(value))
+
+    queue.enqueue('write', value=1)
+    queue.enqueue('write', value=2)
+    assert queue.depth() == 2
+
+    assert queue.drain() == 2
+    assert seen == [1, 2]
+    assert queue.depth() == 0
+    assert spool.read_text() == ""
+
+    with pytest.raises(ValueError):
+        queue.enqueue('unknown')
+
+
+def test_pending_jobs_survive_restart(tmp_path):
+    """Jobs not yet run when the process stops are replayed from the spool"""
+    spool = tmp_path / "spool.jsonl"
+    first = PersistenceQueue(spool, name="test_crash_a", fsync=False)
+    first.register('write', lambda value: None)
+    first.enqueue('write', value="a")
+    first.enqueue('write', value="b")
+    with open(spool, 'a', encoding='utf-8') as f:
+        f.write('{"op": "enqueue", "id": "torn')  # partial line from a crash
+    first.close()  # process exit releases the spool lock
+
+    seen = []
+    second = PersistenceQueue(spool, name="test_crash_b", fsync=False)
+    second.register('write', lambda value: seen.append(value))
+    assert second.depth() == 2
+    second.drain()
+    assert seen == ["a", "b"]
+
+
+def test_workers_sharing_a_path_get_their_own_spools(tmp_path):
+    """A second live queue on the same path spools separately; its jobs are adopted after it exits"""
+    spool = tmp_path / "spool.jsonl"
+    first = PersistenceQueue(spool, name="test_shared_a", fsync=False)
+    second = PersistenceQueue(spool, name="test_shared_b", fsync=False)
+    for queue in (first, second):
+        queue.register('write', lambda value: None)
+    assert first.spool_path == spool and second.spool_path != spool
+
+    first.enqueue('write', value="first")
+    second.enqueue('write', value="second")
+    # Neither queue touches the other's pending jobs while both are alive
+    assert first.drain() == 1 and second.depth() == 1
+    third = PersistenceQueue(spool, name="test_shared_c", fsync=False)
+    assert third.depth() == 0
+
+    for queue in (first, second, third):
+        queue.close()
+    seen = []
+    fourth = PersistenceQueue(spool, name="test_shared_d", fsync=False)
+    fourth.register('write', lambda value: seen.append(value))
+    assert fourth.depth() == 1
+    fourth.drain()
+    assert seen == ["second"]
+    assert not second.spool_path.exists()
+
+
+def test_failed_jobs_retry_then_dead_letter(tmp_path):
+    """A failing job is retried with backoff and dropped after max_attempts"""
+    queue = PersistenceQueue(tmp_path / "spool.jsonl", name="test_retry", max_attempts=3,
+                             retry_base_delay=0.0, fsync=False)
+    calls = []
+
+    def flaky(value):
+        calls.append(value)
+        if len(calls) < 2:
+            raise RuntimeError("database unavailable")
+
+    queue.register('flaky', flaky)
+    queue.enqueue('flaky', value="x")
+    queue.drain()
+    assert calls == ["x", "x"]
+    assert queue.depth() == 0
+
+    queue.register('broken', lambda: (_ for _ in ()).throw(RuntimeError("always")))
+    queue.enqueue('broken')
+    queue.drain()
+    assert queue.depth() == 0
+
+
+def test_jobs_with_the_same_key_wait_for_a_retrying_job(tmp_path):
+    """A later job for a key never overtakes an earlier one waiting on backoff"""
+    queue = PersistenceQueue(tmp_path / "spool.jsonl", name="test_ordering", max_attempts=3,
+                             retry_base_delay=60.0, fsync=False)
+    calls = []
+
+    def write(user_id, value):
+        calls.append((user_id, value))
+        if value == "first" and calls.count((user_id, value)) == 1:
+            raise RuntimeError("database unavailable")
+
+    queue.register('write', write)
+    queue.enqueue('write', ordering_key="alice", user_id="alice", value="first")
+    queue.enqueue('write', ordering_key="alice", user_id="alice", value="second")
+    queue.enqueue('write', ordering_key="bob", user_id="bob", value="other")
+    queue.drain()
+    assert calls == [("alice", "first"), ("bob", "other")]
+    assert queue.depth() == 2
+
+    # Once the retry is due, both alice jobs run in order
+    for job in queue._pending.values():
+        job.next_attempt = 0.0
+    queue.drain()
+    assert calls[2:] == [("alice", "first"), ("alice", "second")]
+    assert queue.depth() == 0
+
+    # Ordering keys survive a restart
+    queue.enqueue('write', ordering_key="carol", user_id="carol", value="x")
+    queue.close()
+    reopened = PersistenceQueue(tmp_path / "spool.jsonl", name="test_ordering_reopen", fsync=False)
+    assert [job.key for job in reopened._pending.values()] == ["carol"]
+    reopened.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (test_jobs_run_in_order_and_spool_is_compacted,
+                 test_pending_jobs_survive_restart,
+                 test_workers_sharing_a_path_get_their_own_spools,
+                 test_failed_jobs_retry_then_dead_letter,
+                 test_jobs_with_the_same_key_wait_for_a_retrying_job):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Persistence queue tests passed")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test the transitive prerequisite closure bitsets against NetworkX ancestors
+"""
+
+import contextlib
+import io
+import json
+import random
+import sys
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from csr_graph import CSRGraph
+from prerequisite_closure import PrerequisiteClosure
+from real_graph_analyzer import RealGraphLearningAnalyzer
+
+EDGE_TYPES = ['prerequisite', 'sequence', 'contains', 'leads_to', 'related', None]
+
+
+def random_graph_data(node_count, seed):
+    """Mostly forward edges plus a few back edges, so prerequisite cycles occur."""
+    rng = random.Random(seed)
+    nodes = [{'id': f"n{i}", 'name': f"Concept {i}", 'type': 'topic'} for i in range(node_count)]
+    edges = []
+    for i in range(1, node_count):
+        for source in rng.sample(range(max(0, i - 30), i), min(i, rng.randint(1, 3))):
+            edges.append({'source': f"n{source}", 'target': f"n{i}", 'type': rng.choice(EDGE_TYPES)})
+    for _ in range(node_count // 20):
+        i = rng.randrange(1, node_count)
+        edges.append({'source': f"n{i}", 'target': f"n{rng.randrange(i)}", 'type': 'prerequisite'})
+    for edge in edges:
+        if edge['type'] is None:
+            del edge['type']
+    return {'nodes': nodes, 'edges': edges}
+
+
+def prerequisite_graph(graph_data):
+    graph = nx.DiGraph()
+    graph.add_nodes_from(node['id'] for node in graph_data['nodes'])
+    graph.add_edges_from((e['source'], e['target']) for e in graph_data['edges']
+                         if e.get('type') in ('prerequisite', 'sequence'))
+    return graph
+
+
+def test_missing_matches_networkx_ancestors():
+    rng = random.Random(3)
+    graph_data = random_graph_data(400, seed=11)
+    graph = prerequisite_graph(graph_data)
+    closure = PrerequisiteClosure.build(CSRGraph.from_graph_data(graph_data, lambda edge_type: 1.0))
+    component = {node: i for i, nodes in enumerate(nx.strongly_connected_components(graph)) for node in nodes}
+
+    for _ in range(200):
+        target = f"n{rng.randrange(400)}"
+        known = [f"n{rng.randrange(400)}" for _ in range(rng.randint(0, 8))] + ['not-a-node']
+        implied = set(known) | {a for k in known if k in graph for a in nx.ancestors(graph, k)}
+
+        missing = closure.missing(known, target)
+        assert set(missing) == nx.ancestors(graph, target) - implied - {target}
+        # Prerequisites come before what depends on them (except within a cycle)
+        position = {node: i for i, node in enumerate(missing)}
+        for source, dependent in graph.subgraph(missing).edges():
+            if component[source] != component[dependent]:
+                assert position[source] < position[dependent]
+
+    assert closure.missing([], 'not-a-node') == []
+    assert closure.rank('n0') == 0 and closure.rank('not-a-node') is None
+
+
+def test_snapshot_maps_the_same_closure(tmp_path):
+    graph_file = tmp_path / "graph_data.json"
+    graph_file.write_text(json.dumps(random_graph_data(120, seed=5)))
+    with contextlib.redirect_stdout(io.StringIO()):
+        parsed = RealGraphLearningAnalyzer(str(graph_file))
+        mapped = RealGraphLearningAnalyzer(str(graph_file))
+    assert isinstance(mapped.prerequisite_closure.closure_blob, np.memmap)
+
+    for name, array in parsed.prerequisite_closure.arrays().items():
+        assert np.array_equal(getattr(mapped.prerequisite_closure, name), array)
+    for i in range(0, 120, 7):
+        assert mapped.find_missing_prerequisites(['n3', 'n40'], f"n{i}") == \
+            parsed.find_missing_prerequisites(['n3', 'n40'], f"n{i}")
+
+
+if __name__ == "__main__":
+    import tempfile
+    test_missing_matches_networkx_ancestors()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_snapshot_maps_the_same_closure(Path(tmp))
+    print("✅ Prerequisite closure tests passed")
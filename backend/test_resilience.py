@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test the circuit breaker and hedged requests used for Groq calls
+"""
+
+import threading
+import time
+
+import pytest
+import requests
+
+from clients.http import is_transient_error
+from clients.resilience import CircuitBreaker, CircuitOpenError, HedgeExecutor, LatencyTracker, hedged_call
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def failing():
+    raise RuntimeError("provider down")
+
+
+def test_breaker_opens_after_consecutive_failures():
+    """N consecutive failures open the breaker and later calls fail fast"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test_open", failure_threshold=3, reset_timeout=10, clock=clock)
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            breaker.call(failing)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: calls.append(1))
+    assert calls == []
+
+
+def test_half_open_probe_closes_or_reopens():
+    """After the reset timeout one probe is let through and decides the state"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test_probe", failure_threshold=1, reset_timeout=10, clock=clock)
+    with pytest.raises(RuntimeError):
+        breaker.call(failing)
+
+    clock.now = 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # only one probe in flight
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now = 20
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_slow_calls_count_as_failures():
+    """Successful calls slower than the threshold still trip the breaker"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test_slow", failure_threshold=2, slow_call_threshold=5, clock=clock)
+
+    def slow():
+        clock.now += 6
+        return "late"
+
+    assert breaker.call(slow) == "late"
+    assert breaker.call(slow) == "late"
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.exceptions.HTTPError(f"{status} error", response=response)
+
+
+def test_only_transient_errors_trip_the_breaker():
+    """Client errors such as 400/413 pass through without opening the breaker"""
+    breaker = CircuitBreaker("test_transient", failure_threshold=2, clock=FakeClock(),
+                             is_failure=is_transient_error)
+
+    def raising(exc):
+        raise exc
+
+    for status in (400, 401, 413, 400):
+        with pytest.raises(requests.exceptions.HTTPError):
+            breaker.call(raising, http_error(status))
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        breaker.call(raising, http_error(429))
+    with pytest.raises(requests.exceptions.Timeout):
+        breaker.call(raising, requests.exceptions.Timeout("read timed out"))
+    assert breaker.state == CircuitBreaker.OPEN
+
+    assert is_transient_error(http_error(503))
+    assert is_transient_error(TimeoutError())
+    assert is_transient_error(requests.exceptions.ConnectionError())
+    assert not is_transient_error(ValueError("bad json"))
+
+
+def test_hedged_call_returns_first_success():
+    """A slow first attempt is raced by a hedge after the delay"""
+    attempts = []
+    lock = threading.Lock()
+
+    def request():
+        with lock:
+            attempts.append(1)
+            attempt = len(attempts)
+        if attempt == 1:
+            time.sleep(0.5)
+            return "slow"
+        return "fast"
+
+    start = time.perf_counter()
+    assert hedged_call(request, 0.02, name="test") == "fast"
+    assert time.perf_counter() - start < 0.4
+    assert len(attempts) == 2
+
+
+def test_hedged_call_is_bounded():
+    """A timeout caps the wait, and a saturated executor runs the call unhedged"""
+    executor = HedgeExecutor(max_workers=1)
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        hedged_call(lambda: time.sleep(0.5), 0.02, name="test", executor=executor, timeout=0.1)
+    assert time.perf_counter() - start < 0.3
+
+    # The timed-out attempt still holds the only worker, so this one runs inline
+    caller = threading.current_thread()
+    assert hedged_call(lambda: threading.current_thread() is caller, 0.02, executor=executor)
+
+
+def test_latency_tracker_percentile():
+    tracker = LatencyTracker(window=100)
+    for i in range(1, 101):
+        tracker.record(i / 100)
+    assert tracker.percentile(0.95) == pytest.approx(0.96)
+
+
+if __name__ == "__main__":
+    test_breaker_opens_after_consecutive_failures()
+    test_half_open_probe_closes_or_reopens()
+    test_slow_calls_count_as_failures()
+    test_only_transient_errors_trip_the_breaker()
+    test_hedged_call_returns_first_success()
+    test_hedged_call_is_bounded()
+    test_latency_tracker_percentile()
+    print("✅ Resilience tests passed")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test the semantic LLM response cache
+
+Uses a small bag-of-words embedding so the tests run without downloading the
+MiniLM model; the handler passes load_minilm_embedder() instead.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent / "queryHandling"))
+
+import sentence_model
+from semantic_cache import SemanticResponseCache, load_minilm_embedder
+
+VOCABULARY = ['what', 'is', 'a', 'stack', 'explain', 'data', 'structure', 'queue', 'heap']
+
+
+def bag_of_words(text):
+    words = text.split()
+    return np.array([words.count(word) for word in VOCABULARY], dtype=np.float32)
+
+
+def test_similar_query_in_same_context_hits():
+    cache = SemanticResponseCache(bag_of_words, threshold=0.8)
+    context = "\nUser is asking about: Stack"
+    assert cache.get("what is a stack", context) is None
+
+    cache.put("what is a stack", context, "A stack is LIFO.")
+    assert cache.get("What is a  stack data", context) == "A stack is LIFO."
+    assert cache.get("what is a queue", context) is None
+
+
+def test_context_is_part_of_the_key():
+    cache = SemanticResponseCache(bag_of_words, threshold=0.8)
+    cache.put("what is a stack", "\nUser already knows: Array", "Stack, building on arrays.")
+    assert cache.get("what is a stack", "\nUser already knows: Linked List") is None
+    assert cache.get("what is a stack", "\nUser already knows: Array") == "Stack, building on arrays."
+
+
+def test_ttl_and_capacity():
+    now = [0.0]
+    cache = SemanticResponseCache(bag_of_words, threshold=0.8, ttl=60, max_entries=2, clock=lambda: now[0])
+    cache.put("what is a stack", "", "stack")
+    cache.put("what is a queue", "", "queue")
+    cache.get("what is a stack", "")  # stack is now most recently used
+    cache.put("what is a heap", "", "heap")
+    assert len(cache) == 2
+    assert cache.get("what is a queue", "") is None
+    assert cache.get("what is a stack", "") == "stack"
+
+    now[0] = 61.0
+    assert cache.get("what is a stack", "") is None
+    assert len(cache) == 1
+
+
+def test_disabled_without_embedder():
+    cache = SemanticResponseCache(None)
+    cache.put("what is a stack", "", "stack")
+    assert not cache.enabled
+    assert cache.get("what is a stack", "") is None
+
+
+def test_embedders_share_one_model(monkeypatch):
+    """The cache reuses the process-wide encoder instead of loading another copy"""
+    loaded = []
+
+    class FakeModel:
+        def __init__(self, name):
+            loaded.append(name)
+
+        def encode(self, texts):
+            return [bag_of_words(text) for text in texts]
+
+    monkeypatch.setattr(sentence_model, "SentenceTransformer", FakeModel)
+    monkeypatch.setattr(sentence_model, "_models", {})
+    first, second = load_minilm_embedder(), load_minilm_embedder()
+    assert sentence_model.get_sentence_model() is sentence_model.get_sentence_model()
+    assert loaded == ['all-MiniLM-L6-v2']
+    assert list(first("a stack")) == list(second("a stack"))
+
+
+if __name__ == "__main__":
+    test_similar_query_in_same_context_hits()
+    test_context_is_part_of_the_key()
+    test_ttl_and_capacity()
+    test_disabled_without_embedder()
+    print("✅ Semantic cache tests passed")
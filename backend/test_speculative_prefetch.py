@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test speculative prefetching of upcoming learning-path steps
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling"))
+
+from speculative_prefetch import SpeculativePrefetcher
+
+PATH = ["Array", "Two Pointers", "Sliding Window", "Prefix Sum"]
+
+
+def make_compute(calls, release=None):
+    def compute(topic, step_index, path):
+        calls.append(topic)
+        if release is not None:
+            release.wait(timeout=2)
+        return {'explanation': f"About {topic}", 'videos': [], 'step': step_index}
+    return compute
+
+
+def test_prefetches_next_steps_and_serves_them():
+    calls = []
+    prefetcher = SpeculativePrefetcher(make_compute(calls), depth=2)
+    prefetcher.schedule("u1", PATH, 0)
+
+    result = prefetcher.take("u1", "Two Pointers", PATH)
+    assert result == {'explanation': "About Two Pointers", 'videos': [], 'step': 1}
+    assert prefetcher.take("u1", "Sliding Window", PATH)['step'] == 2
+    assert sorted(calls) == ["Sliding Window", "Two Pointers"]
+
+    # Consumed entries are gone; other users and other paths miss
+    assert prefetcher.take("u1", "Two Pointers", PATH) is None
+    prefetcher.schedule("u1", PATH, 0)
+    assert prefetcher.take("u2", "Two Pointers", PATH) is None
+    assert prefetcher.take("u1", "Two Pointers", PATH[:3]) is None
+
+
+def test_take_waits_for_in_flight_prefetch():
+    """A request arriving mid-prefetch reuses it rather than recomputing"""
+    calls = []
+    release = threading.Event()
+    prefetcher = SpeculativePrefetcher(make_compute(calls, release), depth=1)
+    prefetcher.schedule("u1", PATH, 0)
+    threading.Timer(0.05, release.set).start()
+    assert prefetcher.take("u1", "Two Pointers", PATH)['explanation'] == "About Two Pointers"
+    assert calls == ["Two Pointers"]
+
+
+def test_spend_cap_and_busy_skip():
+    calls = []
+    prefetcher = SpeculativePrefetcher(make_compute(calls), depth=2, max_per_hour=3)
+    prefetcher.schedule("u1", PATH, 0)
+    prefetcher.schedule("u2", PATH, 0)
+    prefetcher.take("u2", "Two Pointers", PATH)
+    assert len(calls) == 3
+
+    busy = SpeculativePrefetcher(make_compute(calls), skip=lambda: True)
+    busy.schedule("u3", PATH, 0)
+    assert busy.take("u3", "Two Pointers", PATH) is None
+    assert len(calls) == 3
+
+
+def test_steps_scheduled_on_an_old_graph_are_not_served():
+    """A request pinned to the previous graph can schedule after clear() without leaking old content"""
+    calls = []
+    prefetcher = SpeculativePrefetcher(make_compute(calls), depth=1)
+    prefetcher.clear()  # graph swapped from v1 to v2
+    prefetcher.schedule("u1", PATH, 0, graph_version="v1")
+    assert prefetcher.take("u1", "Two Pointers", PATH, graph_version="v2") is None
+
+    prefetcher.schedule("u1", PATH, 0, graph_version="v2")
+    assert prefetcher.take("u1", "Two Pointers", PATH, graph_version="v2")['step'] == 1
+
+
+if __name__ == "__main__":
+    test_prefetches_next_steps_and_serves_them()
+    test_take_waits_for_in_flight_prefetch()
+    test_spend_cap_and_busy_skip()
+    test_steps_scheduled_on_an_old_graph_are_not_served()
+    print("✅ Speculative prefetch tests passed")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test the sparse-matrix subtopic priorities against the original per-pair loops
+"""
+
+import contextlib
+import io
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "static" / "graph"))
+
+from real_graph_analyzer import RealGraphLearningAnalyzer
+from test_prerequisite_closure import random_graph_data
+
+
+def legacy_priority(csr, subtopic_id, completed_subtopics):
+    """The original implementation: edge lookups for every completed subtopic."""
+    priority = 0.0
+    for completed_id in completed_subtopics:
+        edge_type = csr.edge_type(completed_id, subtopic_id)
+        if edge_type is not None:
+            priority += {'prerequisite': 3.0, 'sequence': 2.0, 'leads_to': 1.5}.get(edge_type, 1.0)
+        if csr.has_edge(subtopic_id, completed_id):
+            priority += 0.5
+    return priority + csr.degree(subtopic_id) * 0.1
+
+
+def legacy_prerequisite_subtopics(analyzer, target_topic_id, completed_subtopics):
+    """The original implementation: every subtopic against every target subtopic."""
+    target_subtopics = analyzer.get_all_subtopics_for_topic(target_topic_id)
+    return [s['id'] for s in analyzer.subtopics
+            if s['id'] not in completed_subtopics and s['id'] not in target_subtopics
+            and any(analyzer.csr.edge_type(s['id'], t) in ('prerequisite', 'sequence') for t in target_subtopics)]
+
+
+def check_matches_loops(analyzer, completed_sets, targets):
+    subtopic_ids = [s['id'] for s in analyzer.subtopics]
+    for completed in completed_sets:
+        for target in targets:
+            gaps = analyzer.analyze_subtopic_learning_gaps(completed, target)
+            priorities = gaps['missing_priorities']
+            assert [s for s, _ in priorities] == sorted(
+                gaps['missing_in_target'], key=lambda s: -legacy_priority(analyzer.csr, s, completed))
+            for subtopic_id, priority in priorities:
+                assert abs(priority - legacy_priority(analyzer.csr, subtopic_id, completed)) < 1e-9
+            assert gaps['prerequisite_subtopics'] == legacy_prerequisite_subtopics(analyzer, target, completed)
+
+        for subtopic_id in subtopic_ids[:50] + ['not-a-node']:
+            expected = legacy_priority(analyzer.csr, subtopic_id, completed)
+            assert abs(analyzer.calculate_subtopic_priority(subtopic_id, completed) - expected) < 1e-9
+
+
+def test_random_graph_matches_loops():
+    rng = random.Random(4)
+    graph_data = random_graph_data(400, seed=8)
+    for i, node in enumerate(graph_data['nodes']):
+        node['type'] = 'topic' if i % 8 == 0 else 'subtopic'
+    # Every subtopic belongs to the topic before it
+    graph_data['edges'] += [{'source': f"n{i - i % 8}", 'target': f"n{i}", 'type': 'contains'}
+                            for i in range(400) if i % 8]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        graph_file = Path(tmp) / "graph_data.json"
+        graph_file.write_text(json.dumps(graph_data))
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer = RealGraphLearningAnalyzer(str(graph_file))
+
+    # Completed lists may repeat entries and include unknown IDs, like the original loops allow
+    completed_sets = [[f"n{rng.randrange(400)}" for _ in range(rng.randint(0, 40))] + ['not-a-node']
+                      for _ in range(10)]
+    targets = [f"n{8 * rng.randrange(50)}" for _ in range(10)] + ['not-a-node']
+    check_matches_loops(analyzer, completed_sets, targets)
+
+
+def test_real_graph_matches_loops():
+    rng = random.Random(6)
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = RealGraphLearningAnalyzer()
+    subtopic_ids = [s['id'] for s in analyzer.subtopics]
+    completed_sets = [rng.sample(subtopic_ids, min(len(subtopic_ids), k)) for k in (0, 5, 30)]
+    targets = [topic['id'] for topic in rng.sample(analyzer.topics, min(len(analyzer.topics), 5))]
+    check_matches_loops(analyzer, completed_sets, targets)
+
+
+if __name__ == "__main__":
+    test_random_graph_matches_loops()
+    test_real_graph_matches_loops()
+    print("✅ Subtopic priority tests passed")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test the topic-keyed YouTube video cache
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "dynamic"))
+
+from video_cache import VideoCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_and_disk_tier(tmp_path):
+    """Results are served from memory, and from SQLite after a restart"""
+    db_path = tmp_path / "videos.sqlite3"
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return [{'title': 'Binary Search'}]
+
+    cache = VideoCache(db_path=str(db_path))
+    assert cache.get_or_fetch("Binary  Search", fetch) == [{'title': 'Binary Search'}]
+    assert cache.get_or_fetch("binary search", fetch) == [{'title': 'Binary Search'}]
+    assert len(calls) == 1
+
+    restarted = VideoCache(db_path=str(db_path))
+    assert restarted.get_or_fetch("binary search", fetch) == [{'title': 'Binary Search'}]
+    assert len(calls) == 1
+
+
+def test_empty_results_are_not_cached():
+    cache = VideoCache()
+    calls = []
+    cache.get_or_fetch("graphs", lambda: calls.append(1) or [])
+    cache.get_or_fetch("graphs", lambda: calls.append(1) or [])
+    assert len(calls) == 2
+
+
+def test_concurrent_misses_share_one_fetch():
+    """Single-flight: one upstream call for simultaneous misses"""
+    cache = VideoCache()
+    calls = []
+    release = threading.Event()
+
+    def slow_fetch():
+        calls.append(1)
+        release.wait(timeout=2)
+        return [{'title': 'Stacks'}]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("stack", slow_fetch)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=2)
+
+    assert len(calls) == 1
+    assert results == [[{'title': 'Stacks'}]] * 5
+
+
+def test_stale_entry_served_while_revalidating():
+    """An expired entry inside the stale window is returned while refreshing"""
+    clock = FakeClock()
+    cache = VideoCache(ttl=10, stale_ttl=100, clock=clock)
+    cache.get_or_fetch("queue", lambda: ['old'])
+
+    clock.now += 50
+    refreshed = threading.Event()
+
+    def refresh():
+        refreshed.set()
+        return ['new']
+
+    assert cache.get_or_fetch("queue", refresh) == ['old']
+    assert refreshed.wait(timeout=2)
+    for _ in range(100):
+        if cache.get_or_fetch("queue", lambda: ['unused']) == ['new']:
+            break
+        time.sleep(0.01)
+    assert cache.get_or_fetch("queue", lambda: ['unused']) == ['new']
+
+    clock.now += 1000
+    assert cache.get_or_fetch("queue", lambda: ['fresh']) == ['fresh']
+
+
+def test_batch_fetches_only_missing_topics():
+    """get_many_or_fetch makes one fetch for all uncached topics"""
+    cache = VideoCache()
+    cache.get_or_fetch("arrays", lambda: ['cached'])
+    batches = []
+
+    def fetch_many(topics):
+        batches.append(list(topics))
+        return {topic: [topic.upper()] for topic in topics}
+
+    results = cache.get_many_or_fetch(["Arrays", "stack", "queue", "Stack"], fetch_many)
+    assert batches == [["stack", "queue"]]
+    assert results == {"Arrays": ['cached'], "stack": ['STACK'], "queue": ['QUEUE'], "Stack": ['STACK']}
+
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_hit_and_disk_tier(Path(tmp))
+    test_empty_results_are_not_cached()
+    test_concurrent_misses_share_one_fetch()
+    test_stale_entry_served_while_revalidating()
+    test_batch_fetches_only_missing_topics()
+    print("✅ Video cache tests passed")
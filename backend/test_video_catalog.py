@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test the precomputed video catalog for graph nodes
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "dynamic"))
+
+from video_catalog import VideoCatalog
+
+VIDEO = {'title': 'Stacks explained', 'url': 'https://www.youtube.com/watch?v=1', 'channel_name': 'CS Dojo',
+         'view_count': '1.0K views', 'duration': '10m', 'description': 'Video tutorial on Stack'}
+
+
+def test_lookup_by_node_name(tmp_path):
+    path = tmp_path / "catalog.sqlite3"
+    catalog = VideoCatalog(path)
+    assert catalog.get_videos("Stack") is None
+    # Reading a missing catalog does not create the file
+    assert not path.exists()
+
+    catalog.upsert("t1", "Stack", [VIDEO])
+    assert catalog.get_videos("  stack ") == [VIDEO]
+
+    # Callers get copies, not the catalog's own entries
+    catalog.get_videos("Stack")[0]['title'] = "changed"
+    assert catalog.get_videos("Stack")[0]['title'] == 'Stacks explained'
+
+
+def test_incremental_refresh_selects_missing_and_old_nodes(tmp_path):
+    catalog = VideoCatalog(tmp_path / "catalog.sqlite3")
+    catalog.upsert("t1", "Stack", [VIDEO])
+    catalog.upsert("t2", "Queue", [VIDEO], fetched_at=time.time() - 30 * 86400)
+    nodes = [{'id': 't1', 'name': 'Stack'}, {'id': 't2', 'name': 'Queue'}, {'id': 't3', 'name': 'Heap'}]
+    assert [node['id'] for node in catalog.stale_nodes(nodes, max_age=7 * 86400)] == ['t2', 't3']
+
+
+def test_reloads_when_build_job_updates_file(tmp_path):
+    """A running server picks up a catalog refreshed by another process"""
+    path = tmp_path / "catalog.sqlite3"
+    serving = VideoCatalog(path, check_interval=0)
+    VideoCatalog(path).upsert("t1", "Graph", [VIDEO])
+    assert serving.get_videos("graph") == [VIDEO]
+
+
+if __name__ == "__main__":
+    import tempfile
+    for test in (test_lookup_by_node_name,
+                 test_incremental_refresh_selects_missing_and_old_nodes,
+                 test_reloads_when_build_job_updates_file):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Video catalog tests passed")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test batched YouTube lookups in YouTubeResourceFinder (no network calls)
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "dynamic"))
+
+# groq_dsa_yt validates its API keys at import time
+for key in ("SERP_API_KEY", "YOUTUBE_API_KEY", "GROQ_API_KEY"):
+    os.environ.setdefault(key, "test-key")
+os.environ["YOUTUBE_CACHE_DB"] = ""
+
+import requests
+
+import groq_dsa_yt
+from groq_dsa_yt import YouTubeResourceFinder
+
+
+def video_item(video_id, views):
+    return {
+        'id': video_id,
+        'snippet': {'title': f"Video {video_id}", 'channelId': 'x', 'channelTitle': 'Channel'},
+        'statistics': {'viewCount': str(views)},
+        'contentDetails': {'duration': 'PT10M'}
+    }
+
+
+def test_searches_merge_into_one_details_call():
+    """Overlapping search results are deduped into a single videos.list call"""
+    finder = YouTubeResourceFinder()
+    searches = {'stack': ['a', 'b', 'c'], 'queue': ['c', 'd']}
+    detail_calls = []
+
+    finder._search_video_ids = lambda topic: searches[topic]
+
+    def fetch_details(video_ids):
+        detail_calls.append(list(video_ids))
+        return {video_id: video_item(video_id, 100) for video_id in video_ids}
+
+    finder._fetch_video_details = fetch_details
+
+    videos = finder.get_videos_for_topics(['stack', 'queue'])
+    assert detail_calls == [['a', 'b', 'c', 'd']]
+    assert [v.url[-1] for v in videos['stack']] == ['a', 'b', 'c']
+    assert [v.url[-1] for v in videos['queue']] == ['c', 'd']
+
+    # Served from the cache the second time
+    assert finder.get_videos('queue')[0].title == "Video c"
+    assert len(detail_calls) == 1
+
+
+def test_details_are_fetched_in_chunks_of_50():
+    """More than 50 merged IDs are split across videos.list calls instead of dropped"""
+    finder = YouTubeResourceFinder()
+    searches = {f"topic{t}": [f"v{t}-{i}" for i in range(10)] for t in range(7)}
+    detail_calls = []
+
+    finder._search_video_ids = lambda topic: searches[topic]
+
+    def fetch_details(video_ids):
+        detail_calls.append(len(video_ids))
+        return {video_id: video_item(video_id, 100) for video_id in video_ids}
+
+    finder._fetch_video_details = fetch_details
+
+    videos = finder.get_videos_for_topics(list(searches))
+    assert detail_calls == [50, 20]
+    # The last topics still get their (top 5) videos
+    assert all(len(videos[topic]) == 5 for topic in searches)
+
+
+def test_failed_details_chunk_keeps_other_chunks():
+    """A network error on one videos.list chunk does not drop the other topics"""
+    finder = YouTubeResourceFinder()
+    searches = {f"topic{t}": [f"v{t}-{i}" for i in range(10)] for t in range(7)}
+    finder._search_video_ids = lambda topic: searches[topic]
+    finder.quota.try_spend = lambda operation, paced=False: True
+
+    class FlakySession:
+        calls = 0
+
+        def get(self, url, params=None):
+            FlakySession.calls += 1
+            if FlakySession.calls == 1:
+                raise requests.exceptions.ConnectionError("connection reset")
+            response = requests.Response()
+            response.status_code = 200
+            items = [video_item(video_id, 100) for video_id in params['id'].split(',')]
+            response._content = json.dumps({'items': items}).encode()
+            return response
+
+    original_get_session = groq_dsa_yt.get_session
+    groq_dsa_yt.get_session = lambda service: FlakySession()
+    try:
+        videos = finder.get_videos_for_topics(list(searches))
+    finally:
+        groq_dsa_yt.get_session = original_get_session
+
+    assert FlakySession.calls == 2
+    # The first 50 IDs (topics 0-4) lost their details; topics 5 and 6 still get videos
+    assert [len(videos[f"topic{t}"]) for t in range(7)] == [0, 0, 0, 0, 0, 5, 5]
+
+
+if __name__ == "__main__":
+    test_searches_merge_into_one_details_call()
+    test_details_are_fetched_in_chunks_of_50()
+    test_failed_details_chunk_keeps_other_chunks()
+    print("✅ YouTube finder tests passed")
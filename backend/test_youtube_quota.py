@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the YouTube Data API quota budget
+"""
+
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "queryHandling" / "dynamic"))
+
+from video_cache import VideoCache
+from youtube_quota import QuotaBudget
+
+
+class FakeNow:
+    def __init__(self, hour):
+        self.value = datetime(2026, 1, 1, hour, 0, 0)
+
+    def __call__(self):
+        return self.value
+
+
+def test_spending_is_paced_through_the_day():
+    """Early in the day only the pro-rata share plus a burst can be spent"""
+    now = FakeNow(hour=0)
+    budget = QuotaBudget(daily_limit=1000, burst_fraction=0.2, now=now)
+    assert budget.try_spend('search')
+    assert budget.try_spend('search')
+    assert not budget.try_spend('search')  # 300 > 200 allowed at midnight
+    assert budget.try_spend('search', paced=False)
+    assert budget.used_by('search') == 300
+
+    now.value = now.value.replace(hour=12)  # half the day: 500 + 200 allowed
+    assert budget.try_spend('search')
+    assert budget.try_spend('videos')
+    assert budget.remaining == 599
+
+
+def test_hard_limit_and_refund():
+    budget = QuotaBudget(daily_limit=150, now=FakeNow(hour=23))
+    assert budget.try_spend('search')
+    assert not budget.try_spend('search')
+    budget.refund('search')
+    assert budget.try_spend('search')
+
+
+def test_usage_persists_and_resets_next_day(tmp_path):
+    now = FakeNow(hour=20)
+    state = tmp_path / "quota.json"
+    QuotaBudget(state_path=state, now=now).try_spend('search')
+
+    restarted = QuotaBudget(state_path=state, now=now)
+    assert restarted.used == 100
+
+    now.value += timedelta(days=1)
+    assert restarted.used == 0
+
+
+def test_budgets_sharing_a_state_file_do_not_lose_spend(tmp_path):
+    """Concurrent spends from separate budgets (like separate workers) all land in the file"""
+    now = FakeNow(hour=20)
+    state = tmp_path / "quota.json"
+    budgets = [QuotaBudget(state_path=state, now=now), QuotaBudget(state_path=state, now=now)]
+
+    def spend(budget):
+        for _ in range(25):
+            assert budget.try_spend('videos')
+
+    threads = [threading.Thread(target=spend, args=(budgets[i % 2],)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert QuotaBudget(state_path=state, now=now).used == 200
+
+
+def test_cache_falls_back_to_expired_entry_when_quota_is_spent():
+    """When live search returns nothing, an expired cached result is served"""
+    clock = [0.0]
+    cache = VideoCache(ttl=10, stale_ttl=10, clock=lambda: clock[0])
+    cache.get_or_fetch("heap", lambda: ['old'])
+    clock[0] = 1000
+    assert cache.get_or_fetch("heap", lambda: []) == ['old']
+
+
+if __name__ == "__main__":
+    import tempfile
+    test_spending_is_paced_through_the_day()
+    test_hard_limit_and_refund()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_usage_persists_and_resets_next_day(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_budgets_sharing_a_state_file_do_not_lose_spend(Path(tmp))
+    test_cache_falls_back_to_expired_entry_when_quota_is_spent()
+    print("✅ YouTube quota tests passed")
@@ -0,0 +1,322 @@
+"""
+Durable in-process background queue for post-response writes
+
+Work that is not needed to render a chat reply (saving the chat turn, user
+statistics, unknown-query logging) is enqueued here and executed after the
+response has been sent. Every job is first appended to a small local spool
+file (JSON lines), so anything still pending when the process dies is replayed on the next start. Failed jobs are retried with
+exponential backoff and dropped to a dead-letter record after max_attempts.
+Jobs enqueued with the same ordering key (e.g. a user ID) run strictly in
+order: while one waits to retry, later jobs with that key wait behind it.
+
+Each spool file belongs to one process, which holds an exclusive lock on it
+for as long as the queue is open. When several workers share a spool path,
+the first one takes it and the others fall back to a per-process spool next
+to it (<stem>.<pid><suffix>); on start, a queue also adopts the jobs of any
+sibling spool whose owner has exited.
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, every process gets its own spool
+    fcntl = None
+
+from monitoring.metrics import Counter, Gauge
+
+QUEUE_DEPTH = Gauge(
+    "background_queue_depth",
+    "Jobs waiting in the background work queue",
+    ["queue"]
+)
+QUEUE_JOBS = Counter(
+    "background_jobs_total",
+    "Background jobs processed by task and outcome (success, retry, dead)",
+    ["queue", "task", "outcome"]
+)
+
+
+@dataclass
+class _Job:
+    id: str
+    task: str
+    kwargs: Dict[str, Any]
+    attempts: int = 0
+    next_attempt: float = field(default=0.0)
+    key: Optional[str] = None
+
+
+class PersistenceQueue:
+    """Spool-backed FIFO of named tasks with retry."""
+
+    def __init__(self, spool_path, name: str = "persistence", max_attempts: int = 5,
+                 retry_base_delay: float = 1.0, fsync: bool = True):
+        self.name = name
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.fsync = fsync
+
+        self._handlers: Dict[str, Callable[..., Any]] = {}
+        self._pending: "OrderedDict[str, _Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+        base_path = self._base_path = Path(spool_path)
+        self.spool_path, self._spool_lock = self._claim_spool(base_path)
+        self._recover()
+        self._adopt_orphans(base_path)
+        QUEUE_DEPTH.set_function(self.depth, queue=name)
+
+    def register(self, task: str, handler: Callable[..., Any]):
+        """Register the callable that executes a task. It should raise on failure."""
+        self._handlers[task] = handler
+
+    def enqueue(self, task: str, ordering_key: Optional[str] = None, **kwargs) -> str:
+        """Persist a job to the spool and queue it. Returns the job ID.
+
+        Jobs sharing an ordering_key run in enqueue order, retries included.
+        """
+        if task not in self._handlers:
+            raise ValueError(f"Unknown background task: {task}")
+
+        job = _Job(id=uuid.uuid4().hex, task=task, kwargs=kwargs, key=ordering_key)
+        with self._lock:
+            self._append_record(self._enqueue_record(job))
+            self._pending[job.id] = job
+        return job.id
+
+    def depth(self) -> int:
+        """Number of jobs not yet completed (including ones waiting to retry)."""
+        return len(self._pending)
+
+    def drain(self) -> int:
+        """Run every job that is due. Safe to call from several threads.
+
+        Returns the number of jobs attempted by this call.
+        """
+        processed = 0
+        while self._drain_lock.acquire(blocking=False):
+            try:
+                while True:
+                    job = self._next_ready_job()
+                    if job is None:
+                        break
+                    self._run(job)
+                    processed += 1
+            finally:
+                self._drain_lock.release()
+
+            # A job enqueued while we were releasing the lock would otherwise wait
+            # for the next trigger
+            if self._next_ready_job() is None:
+                break
+        return processed
+
+    def start(self, interval: float = 2.0):
+        """Start a daemon thread that drains the queue and retries failures."""
+        if self._worker and self._worker.is_alive():
+            return
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._worker_loop, args=(interval,),
+                                        name=f"{self.name}-queue", daemon=True)
+        self._worker.start()
+
+    def stop(self, drain: bool = True):
+        """Stop the worker thread, optionally running due jobs first."""
+        self._stop_event.set()
+        if self._worker:
+            self._worker.join(timeout=5)
+        if drain:
+            self.drain()
+
+    def close(self):
+        """Release the spool so another process can adopt what is still pending."""
+        self.stop(drain=False)
+        if self._spool_lock is not None:
+            # A per-process spool with nothing pending is not worth keeping around
+            if not self._pending and self.spool_path != self._base_path:
+                self.spool_path.unlink(missing_ok=True)
+                self.spool_path.with_name(self.spool_path.name + ".lock").unlink(missing_ok=True)
+            self._spool_lock.close()
+            self._spool_lock = None
+
+    def _worker_loop(self, interval: float):
+        while not self._stop_event.is_set():
+            try:
+                self.drain()
+            except Exception as e:
+                print(f"❌ Background queue worker error: {e}")
+            self._stop_event.wait(interval)
+
+    def _next_ready_job(self) -> Optional[_Job]:
+        """Oldest due job whose ordering key has no earlier job still waiting to retry."""
+        now = time.monotonic()
+        blocked = set()
+        with self._lock:
+            for job in self._pending.values():
+                if job.key is not None and job.key in blocked:
+                    continue
+                if job.next_attempt <= now:
+                    return job
+                if job.key is not None:
+                    blocked.add(job.key)
+        return None
+
+    def _run(self, job: _Job):
+        handler = self._handlers.get(job.task)
+        try:
+            if handler is None:
+                raise RuntimeError(f"No handler registered for task {job.task}")
+            handler(**job.kwargs)
+        except Exception as e:
+            job.attempts += 1
+            if job.attempts >= self.max_attempts:
+                print(f"❌ Background job {job.task} failed permanently after {job.attempts} attempts: {e}")
+                QUEUE_JOBS.inc(queue=self.name, task=job.task, outcome='dead')
+                self._finish(job, 'dead')
+            else:
+                delay = self.retry_base_delay * (2 ** (job.attempts - 1))
+                job.next_attempt = time.monotonic() + delay
+                print(f"⚠️ Background job {job.task} failed (attempt {job.attempts}), retrying in {delay:.1f}s: {e}")
+                QUEUE_JOBS.inc(queue=self.name, task=job.task, outcome='retry')
+            return
+
+        QUEUE_JOBS.inc(queue=self.name, task=job.task, outcome='success')
+        self._finish(job, 'done')
+
+    def _finish(self, job: _Job, op: str):
+        with self._lock:
+            self._pending.pop(job.id, None)
+            if self._pending:
+                self._append_record({'op': op, 'id': job.id})
+            else:
+                # Nothing outstanding: compact the spool back to empty
+                self._rewrite_spool()
+
+    def _append_record(self, record: Dict):
+        self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.spool_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def _rewrite_spool(self):
+        """Rewrite the spool so it only contains the pending jobs."""
+        tmp_path = self.spool_path.with_suffix(self.spool_path.suffix + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for job in self._pending.values():
+                record = self._enqueue_record(job)
+                f.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.spool_path)
+
+    @staticmethod
+    def _enqueue_record(job: _Job) -> Dict:
+        record = {'op': 'enqueue', 'id': job.id, 'task': job.task, 'kwargs': job.kwargs}
+        if job.key is not None:
+            record['key'] = job.key
+        return record
+
+    @staticmethod
+    def _try_lock(path: Path):
+        """Exclusive lock on path's .lock file, or None if another open queue holds it."""
+        if fcntl is None:
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(path.with_name(path.name + ".lock"), 'a')
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return None
+        return handle
+
+    def _claim_spool(self, base_path: Path):
+        """(spool path, lock handle): base_path if free, else a per-process spool beside it."""
+        if fcntl is None:
+            return base_path.with_name(f"{base_path.stem}.{os.getpid()}{base_path.suffix}"), None
+        lock = self._try_lock(base_path)
+        if lock is not None:
+            return base_path, lock
+        # Several queues in one process get numbered spools
+        for n in itertools.count():
+            tag = f"{os.getpid()}-{n}" if n else str(os.getpid())
+            own_path = base_path.with_name(f"{base_path.stem}.{tag}{base_path.suffix}")
+            lock = self._try_lock(own_path)
+            if lock is not None:
+                return own_path, lock
+
+    @staticmethod
+    def _read_spool(path: Path) -> "OrderedDict[str, _Job]":
+        """Jobs still pending according to a spool file."""
+        pending: "OrderedDict[str, _Job]" = OrderedDict()
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-write
+                    continue
+                if record.get('op') == 'enqueue':
+                    pending[record['id']] = _Job(record['id'], record['task'], record.get('kwargs', {}),
+                                                 key=record.get('key'))
+                else:
+                    pending.pop(record.get('id'), None)
+        return pending
+
+    def _recover(self):
+        """Reload jobs left pending by a previous process."""
+        if not self.spool_path.exists():
+            return
+
+        try:
+            self._pending.update(self._read_spool(self.spool_path))
+            self._rewrite_spool()
+            if self._pending:
+                print(f"🔄 Recovered {len(self._pending)} pending background jobs from {self.spool_path.name}")
+        except Exception as e:
+            print(f"❌ Error recovering background queue spool: {e}")
+
+    def _adopt_orphans(self, base_path: Path):
+        """Take over the jobs of sibling spools whose owning process has exited."""
+        if fcntl is None:
+            return
+        siblings = [base_path] + sorted(base_path.parent.glob(f"{base_path.stem}.*{base_path.suffix}"))
+        for path in siblings:
+            if path == self.spool_path or not path.exists():
+                continue
+            lock = self._try_lock(path)
+            if lock is None:
+                continue
+            try:
+                adopted = self._read_spool(path)
+                with self._lock:
+                    self._pending.update(adopted)
+                    self._rewrite_spool()
+                path.unlink()
+                if path != base_path:
+                    path.with_name(path.name + ".lock").unlink(missing_ok=True)
+                if adopted:
+                    print(f"🔄 Adopted {len(adopted)} pending background jobs from {path.name}")
+            except Exception as e:
+                print(f"❌ Error adopting background queue spool {path.name}: {e}")
+            finally:
+                lock.close()